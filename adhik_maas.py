@@ -12,67 +12,86 @@ User-facing
 Admin
   GET  /adhik-maas/submissions                 all submissions with full user info
   PUT  /adhik-maas/submissions/<id>            update any submission
+  PUT  /adhik-maas/submissions/batch           shortlist / finalize / schedule many at once
+  POST /adhik-maas/schedule/propose            proposed route dates for shortlisted users
+  POST /adhik-maas/schedule/apply              write a proposed plan in one statement
+  GET  /adhik-maas/routes/<no>/order?date=     visiting order for a route day
   GET  /adhik-maas/summary                     aggregated stats + permutation combinations
+  GET  /adhik-maas/summary/combination         page through the users of one combination
   PUT  /adhik-maas/submissions/<id>/shortlist  shortlist or un-shortlist a user
   GET  /adhik-maas/shortlisted                 list shortlisted users
   PUT  /adhik-maas/submissions/<id>/finalize   finalize or un-finalize a user
   GET  /adhik-maas/finalized                   list finalized users
   GET  /adhik-maas/map-data                    map: id, name, seva_type, lat, lon
+
+CLI
+  flask adhik_maas geocode-backfill            geocode users missing coordinates
+  flask adhik_maas seed-pincode-centroids      approximate positions per pincode
+  flask adhik_maas reconcile-stats             recompute the summary counters
 """
 
-import os
+import json
+import base64
+import hashlib
 import logging
 from collections import defaultdict
 from datetime import datetime
-from flask import Blueprint, request, jsonify
 
-router = Blueprint("adhik_maas", __name__)
+import click
+from flask import Blueprint, Response, current_app, request, jsonify
+
+import geocoding
+from admin_auth import require_admin
+from export_writers import XLSX_MIMETYPE, csv_stream, write_xlsx
+from area_index import AreaIndex
+from cache import VersionedCache, data_version
+from map_clusters import CLUSTER_MAX_ZOOM, MapIndex, parse_bbox, precision_for_zoom
 
-SUPER_ADMIN_MOBILE = os.getenv("SUPER_ADMIN_MOBILE", "1234567890")
+router = Blueprint("adhik_maas", __name__)
 
 # Kept as a last-resort fallback only; the real source of truth is the DB.
 _FALLBACK_AREAS: list[str] = []
 
 
+# Areas change rarely; every process keeps one AreaIndex per
+# 'adhik_maas_areas' version and re-checks the stamp at most every few seconds.
+_area_cache = VersionedCache()
+AREAS_MAX_AGE = 5
+
+
+def _area_index():
+    """The current AreaIndex, plus the pre-serialised unfiltered /areas body."""
+    from model import AdhikMaasArea
+    version = data_version("adhik_maas_areas", max_age=AREAS_MAX_AGE)
+    cached  = _area_cache.get("index", version)
+    if cached is None:
+        rows  = (
+            AdhikMaasArea.query.filter_by(is_active=True)
+            .order_by(AdhikMaasArea.route_number, AdhikMaasArea.sort_order)
+            .all()
+        )
+        index = AreaIndex(rows)
+        body  = current_app.json.dumps(index.response(index.all_positions))
+        cached = _area_cache.put(
+            "index", version, (index, body, hashlib.sha1(body.encode()).hexdigest())
+        )
+    return cached
+
+
 def _get_area_lookup() -> dict[str, dict]:
     """
     Return {area_name_lower: {area_name, route_number, route_name, pin_code}}
-    from the DB.  Used to validate areas and enrich submissions.
+    from the in-memory AreaIndex (rebuilt when 'adhik_maas_areas' changes, so
+    normally no query).  Used to validate areas and enrich submissions.
     """
-    from model import AdhikMaasArea
-    rows = AdhikMaasArea.query.filter_by(is_active=True).all()
-    return {
-        r.area_name.lower(): {
-            "area_name":    r.area_name,
-            "route_number": r.route_number,
-            "route_name":   r.route_name,
-            "pin_code":     r.pin_code,
-        }
-        for r in rows
-    }
+    return _area_index()[0].by_name
 
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 def _require_admin():
     """Return (error_response, status_code) if not admin, else (None, None)."""
-    from model import User
-    data = request.get_json(silent=True) or {}
-    admin_user_id = request.args.get("admin_user_id") or data.get("admin_user_id")
-    admin_mobile  = request.args.get("admin_mobile")  or data.get("admin_mobile")
-
-    if admin_mobile and str(admin_mobile).strip() == SUPER_ADMIN_MOBILE:
-        return None, None
-    if not admin_user_id:
-        return jsonify({"error": "admin_user_id or admin_mobile required"}), 401
-    try:
-        admin_user_id = int(admin_user_id)
-    except (TypeError, ValueError):
-        return jsonify({"error": "Invalid admin_user_id"}), 401
-    user = User.query.get(admin_user_id)
-    if not user or not getattr(user, "isadmin", False):
-        return jsonify({"error": "Admin access required"}), 403
-    return None, None
+    return require_admin()
 
 
 def _parse_seva_flags(seva_preference: str) -> dict:
@@ -146,6 +165,157 @@ def _submission_dict(s, u=None):
     }
 
 
+def _user_columns():
+    """The User columns the Adhik Maas serialisers read, as one bundle."""
+    from model import User
+    from sqlalchemy.orm import Bundle
+    return Bundle(
+        "user",
+        User.id, User.first_name, User.middle_name, User.last_name,
+        User.mobile_number, User.zone_code, User.area, User.flat_no,
+        User.full_address, User.landmark, User.city, User.state, User.pincode,
+        User.latitude, User.longitude,
+    )
+
+
+def _load_submissions(*criteria, order_by=(), inner=False, limit=None):
+    """
+    Fetch submissions joined to the needed User columns in one query.
+
+    Returns [(submission, user_row)]; user_row exposes the User attribute
+    names used by _submission_dict and is None when the user no longer
+    exists (unless inner=True, which drops those submissions).
+    """
+    query = _submissions_query(*criteria, order_by=order_by, inner=inner)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+    return [(s, u if u.id is not None else None) for s, u in rows]
+
+
+def _submissions_query(*criteria, order_by=(), inner=False):
+    """The (submission, user bundle) query behind _load_submissions."""
+    from model import db, AdhikMaasSubmission, User
+    query = db.session.query(AdhikMaasSubmission, _user_columns())
+    join_on = AdhikMaasSubmission.user_id == User.id
+    query = query.join(User, join_on) if inner else query.outerjoin(User, join_on)
+    return query.filter(*criteria).order_by(*order_by)
+
+
+def _encode_cursor(*values) -> str:
+    """Opaque keyset cursor for the last row of a page."""
+    raw = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    """Inverse of _encode_cursor; None if the cursor is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _parse_bool_arg(name: str):
+    """Parse a true/false query parameter; None if missing or not a boolean."""
+    raw = (request.args.get(name) or "").strip().lower()
+    if raw in ("true", "1", "yes"):
+        return True
+    if raw in ("false", "0", "no"):
+        return False
+    return None
+
+
+# Must stay identical to the expression of ix_users_full_name_trgm
+# (migration 0024) for the planner to use that index.  Every part is
+# coalesced: one NULL name part would make the whole name NULL.
+_FULL_NAME_SQL = (
+    "(coalesce(users.first_name, '') || ' ' || coalesce(users.middle_name || ' ', '')"
+    " || coalesce(users.last_name, ''))"
+)
+
+
+# Keyset sort key for the admin list.  submitted_at is nullable and NULLs
+# sort first under DESC, so they are folded to -infinity (the last page);
+# must match the expression of the 0023 keyset indexes.
+_SUBMITTED_KEY_SQL = "coalesce(adhik_maas_submissions.submitted_at, '-infinity'::timestamp)"
+
+
+def _ilike_pattern(search: str) -> str:
+    """'%search%' with LIKE wildcards in the search text escaped."""
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# ─── Stats counters ───────────────────────────────────────────────────────────
+#
+# adhik_maas_stats holds one submission count per (route, area, flag
+# combination, shortlist / finalize status).  Every write to
+# adhik_maas_submissions reads the affected rows' old keys under FOR UPDATE,
+# writes, and moves the counters by (new - old) before the same commit, so
+# /adhik-maas/summary scans a few hundred counter rows instead of every
+# submission.  `flask adhik_maas reconcile-stats` recomputes the table.
+
+STATS_KEY_COLUMNS = (
+    "route_number", "route_name", "area",
+    "has_padyapuja", "has_seva_mahaprasad", "seva_time", "has_shejarti",
+    "is_shortlisted", "is_finalized",
+)
+
+
+def _stats_key(s) -> tuple:
+    """Counter key of a submission (ORM object or result row); '' for NULL."""
+    return (
+        s.route_number or "",
+        s.route_name or "",
+        s.area or "",
+        bool(s.has_padyapuja),
+        bool(s.has_seva_mahaprasad),
+        s.seva_time or "",
+        bool(s.has_shejarti),
+        bool(s.is_shortlisted),
+        bool(s.is_finalized),
+    )
+
+
+def _apply_stats_deltas(old_keys, new_keys):
+    """Move adhik_maas_stats by -1 per old key and +1 per new key."""
+    from collections import Counter
+    from model import db, AdhikMaasStat
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    deltas = Counter(new_keys)
+    deltas.subtract(old_keys)
+    now  = datetime.utcnow()
+    rows = [
+        {**dict(zip(STATS_KEY_COLUMNS, key)), "submission_count": delta, "updated_at": now}
+        # Sorted so concurrent writers lock the shared counter rows in one order
+        for key, delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt  = pg_insert(AdhikMaasStat).values(rows)
+    table = AdhikMaasStat.__table__
+    stmt  = stmt.on_conflict_do_update(
+        index_elements=[table.c[name] for name in STATS_KEY_COLUMNS],
+        set_={
+            "submission_count": table.c.submission_count + stmt.excluded.submission_count,
+            "updated_at":       stmt.excluded.updated_at,
+        },
+    )
+    db.session.execute(stmt)
+
+
+def _locked_submission(**filters):
+    """Load one submission FOR UPDATE, so its old stats key cannot go stale."""
+    from model import AdhikMaasSubmission
+    return AdhikMaasSubmission.query.filter_by(**filters).with_for_update().first()
+
+
 # ─── Public endpoints ─────────────────────────────────────────────────────────
 
 @router.route("/adhik-maas/areas", methods=["GET"])
@@ -169,33 +339,24 @@ def get_areas():
       ],
       "flat": ["Vishrantwadi", ...]   ← all area names, for simple text search
     }
-    """
-    from model import AdhikMaasArea
-    from collections import OrderedDict
 
+    Served from the in-memory AreaIndex with an ETag (If-None-Match -> 304).
+    """
     pin_filter = (request.args.get("pin_code") or "").strip()
     q_filter   = (request.args.get("q") or "").strip().lower()
 
     try:
-        query = AdhikMaasArea.query.filter_by(is_active=True)
-        if pin_filter:
-            query = query.filter(AdhikMaasArea.pin_code == pin_filter)
-        rows = query.order_by(AdhikMaasArea.route_number, AdhikMaasArea.sort_order).all()
-
-        if q_filter:
-            rows = [r for r in rows if q_filter in r.area_name.lower() or q_filter in r.pin_code]
-
-        route_map: OrderedDict = OrderedDict()
-        for r in rows:
-            key = r.route_number
-            if key not in route_map:
-                route_map[key] = {"route_number": r.route_number, "route_name": r.route_name, "areas": []}
-            route_map[key]["areas"].append({"area_name": r.area_name, "pin_code": r.pin_code})
-
-        return jsonify({
-            "routes": list(route_map.values()),
-            "flat":   [r.area_name for r in rows],
-        }), 200
+        index, body, etag = _area_index()
+        if pin_filter or q_filter:
+            positions = index.by_pin.get(pin_filter, []) if pin_filter else None
+            if q_filter:
+                positions = index.search(q_filter, positions)
+            body = current_app.json.dumps(index.response(positions))
+            etag = hashlib.sha1(body.encode()).hexdigest()
+
+        response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         logging.exception("get_areas error: %s", e)
         return jsonify({"error": "Failed to fetch areas"}), 500
@@ -262,14 +423,9 @@ def submit_adhik_maas():
         return jsonify({"error": "area must be one of the allowed areas"}), 400
 
     try:
-        existing = AdhikMaasSubmission.query.filter_by(user_id=int(user_id)).first()
-        if existing:
-            return jsonify({
-                "error": "You have already submitted. Only one submission per user is allowed.",
-                "already_submitted": True,
-            }), 409
-    except Exception:
-        pass
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return jsonify({"error": "user_id must be an integer"}), 400
 
     submitted_at = data.get("submitted_at")
     try:
@@ -278,20 +434,40 @@ def submit_adhik_maas():
         submitted_at = datetime.utcnow()
 
     try:
-        entry = AdhikMaasSubmission(
-            user_id         = int(user_id),
-            seva_preference = seva_preference,
-            seva_label      = data.get("seva_label", "") or "",
-            area            = area_info["area_name"],
-            route_number    = area_info["route_number"],
-            route_name      = area_info["route_name"],
-            pin_code        = area_info["pin_code"],
-            submitted_at    = submitted_at,
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        # One statement: uq_adhik_maas_submissions_user_id turns a second
+        # submission (e.g. a double tap) into "no row returned".
+        stmt = (
+            pg_insert(AdhikMaasSubmission)
+            .values(
+                user_id         = user_id,
+                seva_preference = seva_preference,
+                seva_label      = data.get("seva_label", "") or "",
+                area            = area_info["area_name"],
+                route_number    = area_info["route_number"],
+                route_name      = area_info["route_name"],
+                pin_code        = area_info["pin_code"],
+                submitted_at    = submitted_at,
+                **_parse_seva_flags(seva_preference),
+            )
+            .on_conflict_do_nothing(index_elements=[AdhikMaasSubmission.user_id])
+            .returning(
+                AdhikMaasSubmission.id,
+                *(getattr(AdhikMaasSubmission, name) for name in STATS_KEY_COLUMNS),
+            )
         )
-        _apply_flags(entry, seva_preference)
-        db.session.add(entry)
+        inserted = db.session.execute(stmt).first()
+        if inserted is not None:
+            _apply_stats_deltas([], [_stats_key(inserted)])
         db.session.commit()
-        return jsonify({"message": "Submission saved", "id": entry.id}), 201
+        if inserted is None:
+            return jsonify({
+                "error": "You have already submitted. Only one submission per user is allowed.",
+                "already_submitted": True,
+            }), 409
+        geocoding.worker.wake(current_app._get_current_object())
+        return jsonify({"message": "Submission saved", "id": inserted.id}), 201
     except Exception as e:
         db.session.rollback()
         logging.exception("adhik_maas submit error: %s", e)
@@ -300,7 +476,7 @@ def submit_adhik_maas():
 
 @router.route("/adhik-maas/my-submission", methods=["PUT"])
 def update_my_submission():
-    from model import db, AdhikMaasSubmission, FeatureToggle
+    from model import db, FeatureToggle
 
     toggle = FeatureToggle.query.filter_by(toggle_name="allow_adhik_maas_edit").first()
     if not toggle or not toggle.toggle_enabled:
@@ -328,10 +504,11 @@ def update_my_submission():
         return jsonify({"error": "area must be one of the allowed areas"}), 400
 
     try:
-        submission = AdhikMaasSubmission.query.filter_by(user_id=int(user_id)).first()
+        submission = _locked_submission(user_id=int(user_id))
         if not submission:
             return jsonify({"error": "No existing submission found for this user."}), 404
 
+        old_key = _stats_key(submission)
         submission.seva_preference = seva_preference
         submission.seva_label      = data.get("seva_label", "") or ""
         submission.area            = area_info["area_name"]
@@ -339,7 +516,10 @@ def update_my_submission():
         submission.route_name      = area_info["route_name"]
         submission.pin_code        = area_info["pin_code"]
         _apply_flags(submission, seva_preference)
+        _apply_stats_deltas([old_key], [_stats_key(submission)])
         db.session.commit()
+        if submission.is_finalized:
+            _republish_finalized()
         return jsonify({"message": "Submission updated", **_submission_dict(submission)}), 200
     except Exception as e:
         db.session.rollback()
@@ -351,15 +531,110 @@ def update_my_submission():
 
 @router.route("/adhik-maas/submissions", methods=["GET"])
 def list_submissions_admin():
-    """[Admin] All submissions with full user info and workflow status."""
+    """
+    [Admin] Submissions with full user info and workflow status, newest first.
+
+    Optional filters (all applied in SQL):
+      status        all | shortlisted | finalized
+      route_number, area
+      has_padyapuja, has_seva_mahaprasad, has_shejarti   true | false
+      seva_time     afternoon | evening | any | none
+      route_date    YYYY-MM-DD, or 'none' for unscheduled
+      q             name / mobile substring (trigram-indexed)
+
+    Paging: pass limit (1-200) and then the returned next_cursor as cursor;
+    pages are keyset-ordered on (submitted_at, id), unset submitted_at last.
+    Without limit the whole filtered list is returned, as before.
+    """
     err, status = _require_admin()
     if err is not None:
         return err, status
+    from datetime import date as date_type
+    from model import AdhikMaasSubmission, User
+    from sqlalchemy import literal_column, or_, tuple_
+
+    args     = request.args
+    criteria = []
+
+    status_filter = (args.get("status") or "all").lower()
+    if status_filter == "shortlisted":
+        criteria.append(AdhikMaasSubmission.is_shortlisted == True)
+    elif status_filter == "finalized":
+        criteria.append(AdhikMaasSubmission.is_finalized == True)
+    elif status_filter != "all":
+        return jsonify({"error": "status must be all, shortlisted or finalized"}), 400
+
+    if args.get("route_number"):
+        criteria.append(AdhikMaasSubmission.route_number == args["route_number"])
+    if args.get("area"):
+        criteria.append(AdhikMaasSubmission.area == args["area"])
+    for name in ("has_padyapuja", "has_seva_mahaprasad", "has_shejarti"):
+        if args.get(name) is not None:
+            value = _parse_bool_arg(name)
+            if value is None:
+                return jsonify({"error": f"{name} must be true or false"}), 400
+            criteria.append(getattr(AdhikMaasSubmission, name) == value)
+    if args.get("seva_time"):
+        seva_time = args["seva_time"].lower()
+        if seva_time not in ("afternoon", "evening", "any", "none"):
+            return jsonify({"error": "seva_time must be afternoon, evening, any or none"}), 400
+        criteria.append(
+            AdhikMaasSubmission.seva_time.is_(None) if seva_time == "none"
+            else AdhikMaasSubmission.seva_time == seva_time
+        )
+    if args.get("route_date"):
+        if args["route_date"].lower() == "none":
+            criteria.append(AdhikMaasSubmission.route_date.is_(None))
+        else:
+            try:
+                criteria.append(AdhikMaasSubmission.route_date == date_type.fromisoformat(args["route_date"]))
+            except ValueError:
+                return jsonify({"error": "route_date must be YYYY-MM-DD or none"}), 400
+    q = (args.get("q") or "").strip()
+    if q:
+        pattern = _ilike_pattern(q)
+        criteria.append(or_(
+            literal_column(_FULL_NAME_SQL).ilike(pattern),
+            User.mobile_number.ilike(pattern),
+        ))
+
+    limit = None
+    if args.get("limit") or args.get("cursor"):
+        try:
+            limit = max(1, min(int(args.get("limit", 50)), 200))
+        except (TypeError, ValueError):
+            return jsonify({"error": "limit must be an integer"}), 400
+    if args.get("cursor"):
+        after = _decode_cursor(args["cursor"])
+        try:
+            # A null timestamp in the cursor means the page ended on the
+            # NULL (-infinity) submitted_at rows.
+            after_ts = (
+                literal_column("'-infinity'::timestamp") if after[0] is None
+                else datetime.fromisoformat(after[0])
+            )
+            after_id = int(after[1])
+        except (TypeError, ValueError, IndexError):
+            return jsonify({"error": "Invalid cursor"}), 400
+        criteria.append(
+            tuple_(literal_column(_SUBMITTED_KEY_SQL), AdhikMaasSubmission.id) < tuple_(after_ts, after_id)
+        )
+
     try:
-        from model import AdhikMaasSubmission, User
-        submissions = AdhikMaasSubmission.query.order_by(AdhikMaasSubmission.submitted_at.desc()).all()
-        out = [_submission_dict(s, User.query.get(s.user_id)) for s in submissions]
-        return jsonify({"submissions": out, "total": len(out)}), 200
+        rows = _load_submissions(
+            *criteria,
+            order_by=(literal_column(_SUBMITTED_KEY_SQL).desc(), AdhikMaasSubmission.id.desc()),
+            limit=limit + 1 if limit else None,
+        )
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][0]
+            next_cursor = _encode_cursor(
+                last.submitted_at.isoformat() if last.submitted_at else None, last.id
+            )
+        out = [_submission_dict(s, u) for s, u in rows]
+        return jsonify({"submissions": out, "total": len(out), "next_cursor": next_cursor}), 200
     except Exception as e:
         logging.exception("list_submissions_admin error: %s", e)
         return jsonify({"error": "Failed to fetch submissions"}), 500
@@ -371,7 +646,7 @@ def update_submission_admin(submission_id):
     err, status = _require_admin()
     if err is not None:
         return err, status
-    from model import db, AdhikMaasSubmission
+    from model import db
 
     data            = request.get_json(force=True, silent=True) or {}
     seva_preference = data.get("seva_preference")
@@ -381,10 +656,11 @@ def update_submission_admin(submission_id):
     route_date_str  = data.get("route_date")      # "YYYY-MM-DD" or None
     final_seva      = data.get("final_seva")       # confirmed seva label
 
-    submission = AdhikMaasSubmission.query.get(submission_id)
+    submission = _locked_submission(id=submission_id)
     if not submission:
         return jsonify({"error": "Submission not found"}), 404
 
+    old_key = _stats_key(submission)
     if seva_preference is not None:
         submission.seva_preference = seva_preference
         _apply_flags(submission, seva_preference)
@@ -411,7 +687,10 @@ def update_submission_admin(submission_id):
         submission.final_seva = final_seva if final_seva else None
 
     try:
+        _apply_stats_deltas([old_key], [_stats_key(submission)])
         db.session.commit()
+        if submission.is_finalized:
+            _republish_finalized()
         return jsonify({"message": "Submission updated", **_submission_dict(submission)}), 200
     except Exception as e:
         db.session.rollback()
@@ -419,6 +698,382 @@ def update_submission_admin(submission_id):
         return jsonify({"error": "Failed to update submission"}), 500
 
 
+BATCH_MAX_IDS = 500
+
+
+@router.route("/adhik-maas/submissions/batch", methods=["PUT"])
+def update_submissions_batch():
+    """
+    [Admin] Apply one change to many submissions in a single UPDATE.
+
+    Body:
+    {
+      "ids":          [1, 2, ...],             (required, at most 500)
+      "shortlisted":  true | false,            (optional)
+      "finalized":    true | false,            (optional)
+      "route_date":   "YYYY-MM-DD" | null,     (optional)
+      "final_seva":   "..." | null,            (optional)
+      "admin_notes":  "..."                    (optional)
+    }
+    At least one change is required; the *_at timestamps follow the same
+    rules as the single-submission shortlist / finalize endpoints.
+
+    Response: { "updated": N, "results": [ { "id", "status": "updated", ... }
+                                           | { "id", "status": "not_found" } ] }
+    """
+    err, status = _require_admin()
+    if err is not None:
+        return err, status
+    from model import db
+    from sqlalchemy import text
+
+    data = request.get_json(force=True, silent=True) or {}
+    ids  = data.get("ids")
+    if not isinstance(ids, list) or not ids:
+        return jsonify({"error": "ids must be a non-empty list"}), 400
+    try:
+        ids = list(dict.fromkeys(int(i) for i in ids))
+    except (TypeError, ValueError):
+        return jsonify({"error": "ids must be integers"}), 400
+    if len(ids) > BATCH_MAX_IDS:
+        return jsonify({"error": f"at most {BATCH_MAX_IDS} ids per batch"}), 400
+
+    now     = datetime.utcnow()
+    sets    = []
+    params  = {"ids": ids, "now": now}
+    if "shortlisted" in data:
+        if not isinstance(data["shortlisted"], bool):
+            return jsonify({"error": "shortlisted must be true or false"}), 400
+        params["shortlisted"] = data["shortlisted"]
+        sets += ["is_shortlisted = :shortlisted",
+                 "shortlisted_at = CASE WHEN :shortlisted THEN :now END"]
+    if "finalized" in data:
+        if not isinstance(data["finalized"], bool):
+            return jsonify({"error": "finalized must be true or false"}), 400
+        params["finalized"] = data["finalized"]
+        sets += ["is_finalized = :finalized",
+                 "finalized_at = CASE WHEN :finalized THEN :now END"]
+    if "route_date" in data:
+        from datetime import date as date_type
+        try:
+            params["route_date"] = date_type.fromisoformat(data["route_date"]) if data["route_date"] else None
+        except (TypeError, ValueError):
+            return jsonify({"error": "route_date must be YYYY-MM-DD"}), 400
+        sets.append("route_date = :route_date")
+    if "final_seva" in data:
+        params["final_seva"] = data["final_seva"] or None
+        sets.append("final_seva = :final_seva")
+    if "admin_notes" in data:
+        params["admin_notes"] = data["admin_notes"]
+        sets.append("admin_notes = :admin_notes")
+    if not sets:
+        return jsonify({"error": "nothing to update"}), 400
+
+    key_columns = ", ".join(STATS_KEY_COLUMNS)
+    # The key columns the RETURNING list below does not already carry
+    key_extra   = ", ".join(c for c in STATS_KEY_COLUMNS if c not in ("is_shortlisted", "is_finalized"))
+    try:
+        # Status changes move the stats counters; lock the rows first so the
+        # old keys read here are exactly what the UPDATE replaces.
+        old_rows = []
+        if "shortlisted" in data or "finalized" in data:
+            old_rows = db.session.execute(
+                text(f"""
+                    SELECT {key_columns} FROM adhik_maas_submissions
+                     WHERE id = ANY(:ids)
+                     ORDER BY id
+                       FOR UPDATE
+                """),
+                {"ids": ids},
+            ).all()
+        rows = db.session.execute(
+            text(f"""
+                UPDATE adhik_maas_submissions
+                   SET {", ".join(sets)}
+                 WHERE id = ANY(:ids)
+                RETURNING id, is_shortlisted, shortlisted_at, is_finalized, finalized_at,
+                          route_date, final_seva, admin_notes, {key_extra}
+            """),
+            params,
+        ).all()
+        if old_rows:
+            _apply_stats_deltas(map(_stats_key, old_rows), map(_stats_key, rows))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logging.exception("adhik_maas batch update error: %s", e)
+        return jsonify({"error": "Failed to update submissions"}), 500
+
+    if "finalized" in data or any(r.is_finalized for r in rows):
+        _republish_finalized()
+
+    by_id = {r.id: r for r in rows}
+    results = []
+    for submission_id in ids:
+        r = by_id.get(submission_id)
+        if r is None:
+            results.append({"id": submission_id, "status": "not_found"})
+            continue
+        results.append({
+            "id":             r.id,
+            "status":         "updated",
+            "is_shortlisted": r.is_shortlisted,
+            "shortlisted_at": r.shortlisted_at.isoformat() if r.shortlisted_at else None,
+            "is_finalized":   r.is_finalized,
+            "finalized_at":   r.finalized_at.isoformat() if r.finalized_at else None,
+            "route_date":     r.route_date.isoformat() if r.route_date else None,
+            "final_seva":     r.final_seva,
+            "admin_notes":    r.admin_notes,
+        })
+    return jsonify({"updated": len(rows), "results": results}), 200
+
+
+# ─── Admin: route-date scheduling ─────────────────────────────────────────────
+
+SCHEDULE_MAX_DAYS = 120
+
+
+@router.route("/adhik-maas/schedule/propose", methods=["POST"])
+def propose_route_schedule():
+    """
+    [Admin] Propose route dates for shortlisted submissions.
+
+    Body:
+    {
+      "from": "YYYY-MM-DD", "to": "YYYY-MM-DD",
+      "capacities": { "padyapuja": N, "abhishek_afternoon": N,
+                      "abhishek_evening": N, "shejarti": N, "mahaprasad": N },
+                      (per day; a missing key means unlimited)
+      "include_scheduled": false   (true also re-plans already dated ones)
+    }
+
+    Households already dated inside the range (other than the ones being
+    re-planned) keep their dates; those dates stay with their routes and
+    their sevas count against the day's capacity.
+
+    Nothing is written; POST the returned assignments to
+    /adhik-maas/schedule/apply.  See adhik_maas_scheduler for the rules.
+    """
+    err, status = _require_admin()
+    if err is not None:
+        return err, status
+    from datetime import date as date_type, timedelta
+    from model import db, AdhikMaasSubmission
+    from sqlalchemy import text
+    from adhik_maas_scheduler import SEVAS, propose_schedule
+
+    data = request.get_json(force=True, silent=True) or {}
+    try:
+        start = date_type.fromisoformat(str(data.get("from", "")))
+        end   = date_type.fromisoformat(str(data.get("to", "")))
+    except ValueError:
+        return jsonify({"error": "from and to are required, use YYYY-MM-DD"}), 400
+    if end < start or (end - start).days >= SCHEDULE_MAX_DAYS:
+        return jsonify({"error": f"to must be on or after from, at most {SCHEDULE_MAX_DAYS} days"}), 400
+
+    raw_caps   = data.get("capacities") or {}
+    capacities = {}
+    for seva in SEVAS:
+        value = raw_caps.get(seva)
+        if value is None:
+            continue
+        try:
+            capacities[seva] = int(value)
+        except (TypeError, ValueError):
+            return jsonify({"error": f"capacities.{seva} must be an integer"}), 400
+        if capacities[seva] < 0:
+            return jsonify({"error": f"capacities.{seva} must not be negative"}), 400
+
+    try:
+        query = db.session.query(
+            AdhikMaasSubmission.id,
+            AdhikMaasSubmission.route_number,
+            AdhikMaasSubmission.route_name,
+            AdhikMaasSubmission.has_padyapuja,
+            AdhikMaasSubmission.has_seva_mahaprasad,
+            AdhikMaasSubmission.seva_time,
+            AdhikMaasSubmission.has_shejarti,
+        ).filter(AdhikMaasSubmission.is_shortlisted == True)
+        if not data.get("include_scheduled"):
+            query = query.filter(AdhikMaasSubmission.route_date.is_(None))
+        subs = [
+            r._asdict()
+            for r in query.order_by(AdhikMaasSubmission.submitted_at, AdhikMaasSubmission.id)
+        ]
+
+        # Per-date load of households that keep their date, in the
+        # scheduler's demand terms (seva_time counts only with mahaprasad).
+        replanned = "AND NOT is_shortlisted" if data.get("include_scheduled") else ""
+        booked_rows = db.session.execute(text(f"""
+            SELECT route_date,
+                   array_agg(DISTINCT coalesce(route_number, ''))                          AS routes,
+                   count(*)                                                                 AS households,
+                   count(*) FILTER (WHERE has_padyapuja)                                    AS padyapuja,
+                   count(*) FILTER (WHERE has_seva_mahaprasad AND seva_time = 'afternoon')  AS abhishek_afternoon,
+                   count(*) FILTER (WHERE has_seva_mahaprasad AND seva_time = 'evening')    AS abhishek_evening,
+                   count(*) FILTER (WHERE has_shejarti)                                     AS shejarti,
+                   count(*) FILTER (WHERE has_seva_mahaprasad)                              AS mahaprasad,
+                   count(*) FILTER (WHERE has_seva_mahaprasad AND seva_time = 'any')        AS abhishek_any
+            FROM adhik_maas_submissions
+            WHERE route_date >= :start AND route_date <= :end {replanned}
+            GROUP BY route_date
+        """), {"start": start, "end": end}).mappings().all()
+        booked = {r["route_date"]: dict(r) for r in booked_rows}
+
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        plan  = propose_schedule(subs, dates, capacities, booked)
+        return jsonify({"from": start.isoformat(), "to": end.isoformat(), **plan}), 200
+    except Exception as e:
+        logging.exception("propose_route_schedule error: %s", e)
+        return jsonify({"error": "Failed to propose schedule"}), 500
+
+
+@router.route("/adhik-maas/schedule/apply", methods=["POST"])
+def apply_route_schedule():
+    """
+    [Admin] Write route dates in one statement.
+
+    Body: { "assignments": [ { "id": N, "route_date": "YYYY-MM-DD" }, ... ] }
+    (the "assignments" of /adhik-maas/schedule/propose; extra keys ignored)
+
+    Response: { "updated": N, "not_found": [ids] }
+    """
+    err, status = _require_admin()
+    if err is not None:
+        return err, status
+    from datetime import date as date_type
+    from model import db
+    from sqlalchemy import text
+
+    data = request.get_json(force=True, silent=True) or {}
+    assignments = data.get("assignments")
+    if not isinstance(assignments, list) or not assignments:
+        return jsonify({"error": "assignments must be a non-empty list"}), 400
+
+    by_id = {}
+    try:
+        for a in assignments:
+            by_id[int(a["id"])] = date_type.fromisoformat(str(a["route_date"]))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "each assignment needs an integer id and a YYYY-MM-DD route_date"}), 400
+
+    try:
+        updated = db.session.execute(
+            text("""
+                UPDATE adhik_maas_submissions s
+                   SET route_date = v.route_date
+                  FROM unnest(CAST(:ids AS integer[]), CAST(:dates AS date[])) AS v(id, route_date)
+                 WHERE s.id = v.id
+                RETURNING s.id, s.is_finalized
+            """),
+            {"ids": list(by_id), "dates": list(by_id.values())},
+        ).all()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logging.exception("apply_route_schedule error: %s", e)
+        return jsonify({"error": "Failed to apply schedule"}), 500
+
+    if any(r.is_finalized for r in updated):
+        _republish_finalized()
+    found = {r.id for r in updated}
+    return jsonify({
+        "updated":   len(updated),
+        "not_found": [i for i in by_id if i not in found],
+    }), 200
+
+
+# ─── Admin: route visiting order ──────────────────────────────────────────────
+
+# (route_number, date, start) -> stops, keyed on a fingerprint of the
+# households and their coordinates so any change to the set re-plans.
+_route_order_cache = VersionedCache(max_entries=256)
+
+
+@router.route("/adhik-maas/routes/<route_number>/order", methods=["GET"])
+def get_route_order(route_number):
+    """
+    [Admin] Near-optimal visiting order for the finalized households of a
+    route on one date.
+
+    Query params:
+      date                  YYYY-MM-DD (required)
+      start_lat, start_lon  optional starting point (e.g. the mandir)
+
+    Response:
+    {
+      "route_number", "date", "total_km",
+      "stops": [ { "stop", "id", "user_id", "name", "address", "mobile",
+                   "latitude", "longitude", "leg_km" } ],
+      "unlocated": [ ...households without coordinates, not in the order ]
+    }
+    """
+    err, status = _require_admin()
+    if err is not None:
+        return err, status
+    from datetime import date as date_type
+    from model import AdhikMaasSubmission
+    from route_planner import plan_order
+
+    try:
+        day = date_type.fromisoformat(request.args.get("date", "").strip())
+    except ValueError:
+        return jsonify({"error": "date is required, use YYYY-MM-DD"}), 400
+    start = None
+    if request.args.get("start_lat") or request.args.get("start_lon"):
+        try:
+            start = (float(request.args["start_lat"]), float(request.args["start_lon"]))
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": "start_lat and start_lon must both be numbers"}), 400
+
+    try:
+        rows = _load_submissions(
+            AdhikMaasSubmission.is_finalized == True,
+            AdhikMaasSubmission.route_number == route_number,
+            AdhikMaasSubmission.route_date == day,
+            order_by=(AdhikMaasSubmission.id,),
+            inner=True,
+        )
+
+        def _stop(s, u):
+            return {
+                "id":        s.id,
+                "user_id":   s.user_id,
+                "name":      " ".join(filter(None, [u.first_name, u.middle_name, u.last_name])),
+                "address":   ", ".join(filter(None, [u.flat_no, u.full_address, u.landmark])),
+                "mobile":    u.mobile_number,
+                "latitude":  float(u.latitude)  if u.latitude  is not None else None,
+                "longitude": float(u.longitude) if u.longitude is not None else None,
+            }
+
+        stops     = [_stop(s, u) for s, u in rows]
+        located   = [h for h in stops if h["latitude"] is not None and h["longitude"] is not None]
+        unlocated = [h for h in stops if h not in located]
+
+        fingerprint = hashlib.sha1(json.dumps(
+            [(h["id"], h["latitude"], h["longitude"]) for h in located]
+        ).encode()).hexdigest()
+        key    = (route_number, day, start)
+        cached = _route_order_cache.get(key, fingerprint)
+        if cached is None:
+            order, legs = plan_order([(h["latitude"], h["longitude"]) for h in located], start=start)
+            cached = _route_order_cache.put(key, fingerprint, [
+                {"stop": n + 1, **located[i], "leg_km": round(leg, 3)}
+                for n, (i, leg) in enumerate(zip(order, legs))
+            ])
+
+        return jsonify({
+            "route_number": route_number,
+            "date":         day.isoformat(),
+            "total_km":     round(sum(stop["leg_km"] for stop in cached), 3),
+            "stops":        cached,
+            "unlocated":    unlocated,
+        }), 200
+    except Exception as e:
+        logging.exception("get_route_order error: %s", e)
+        return jsonify({"error": "Failed to plan route order"}), 500
+
+
 # ─── Admin: summary / permutation combinations ────────────────────────────────
 
 @router.route("/adhik-maas/summary", methods=["GET"])
@@ -426,7 +1081,8 @@ def get_summary_admin():
     """
     [Admin] Aggregated statistics and every permutation combination that
     actually exists in the data, so the admin can see which preference
-    bundles are popular and plan assignments accordingly.
+    bundles are popular and plan assignments accordingly.  The users of a
+    combination are paged separately via /adhik-maas/summary/combination.
 
     Response shape:
     {
@@ -446,8 +1102,7 @@ def get_summary_admin():
           "has_seva_mahaprasad": true,
           "seva_time": "afternoon",
           "has_shejarti": false,
-          "count": N,
-          "users": [ { "id", "user_id", "user_name", "area", ... } ]
+          "count": N
         },
         ...
       ]
@@ -458,68 +1113,72 @@ def get_summary_admin():
         return err, status
 
     try:
-        from model import AdhikMaasSubmission, User
-
-        all_subs = AdhikMaasSubmission.query.order_by(AdhikMaasSubmission.area).all()
-
-        # ── totals
-        total       = len(all_subs)
-        shortlisted = sum(1 for s in all_subs if s.is_shortlisted)
-        finalized   = sum(1 for s in all_subs if s.is_finalized)
-
-        # Re-derive flags from seva_preference for every submission so that old
-        # records with NULL boolean columns are counted correctly.
-        def _flags(s):
-            return _parse_seva_flags(s.seva_preference)
-
-        # ── seva breakdown
-        seva_counts = {
-            "padyapuja":       sum(1 for s in all_subs if _flags(s)["has_padyapuja"]),
-            "seva_mahaprasad": sum(1 for s in all_subs if _flags(s)["has_seva_mahaprasad"]),
-            "shejarti":        sum(1 for s in all_subs if _flags(s)["has_shejarti"]),
-        }
-
-        # ── time breakdown
-        time_counts = defaultdict(int)
-        for s in all_subs:
-            key = _flags(s)["seva_time"] or "none"
-            time_counts[key] += 1
-
-        # ── area breakdown
-        area_counts = defaultdict(int)
-        for s in all_subs:
-            area_counts[s.area or "Unknown"] += 1
+        from model import db
+        from sqlalchemy import text
+
+        # One pass over the adhik_maas_stats counters (a few hundred rows,
+        # however many submissions exist).  The GROUPING() bitmask (area,
+        # route_number, seva_time, has_padyapuja) tells the sets apart:
+        #   15 = grand total, 7 = per area, 11 = per route, 13 = per time,
+        #   12 = per flag combination.
+        # '' in the counter keys stands for NULL and maps to Unknown / none.
+        grouped = db.session.execute(text("""
+            SELECT GROUPING(area, route_number, seva_time, has_padyapuja) AS g,
+                   area, route_number, max(route_name) AS route_name,
+                   seva_time, has_padyapuja, has_seva_mahaprasad, has_shejarti,
+                   coalesce(sum(submission_count), 0)                                    AS total,
+                   coalesce(sum(submission_count) FILTER (WHERE is_shortlisted), 0)      AS shortlisted,
+                   coalesce(sum(submission_count) FILTER (WHERE is_finalized), 0)        AS finalized,
+                   coalesce(sum(submission_count) FILTER (WHERE has_padyapuja), 0)       AS padyapuja,
+                   coalesce(sum(submission_count) FILTER (WHERE has_seva_mahaprasad), 0) AS seva_mahaprasad,
+                   coalesce(sum(submission_count) FILTER (WHERE has_shejarti), 0)        AS shejarti
+            FROM adhik_maas_stats
+            WHERE submission_count > 0
+            GROUP BY GROUPING SETS (
+                (),
+                (area),
+                (route_number),
+                (seva_time),
+                (has_padyapuja, has_seva_mahaprasad, seva_time, has_shejarti)
+            )
+        """)).all()
 
-        # ── route breakdown
+        total = shortlisted = finalized = 0
+        seva_counts  = {"padyapuja": 0, "seva_mahaprasad": 0, "shejarti": 0}
+        time_counts  = defaultdict(int)
+        area_counts  = defaultdict(int)
         route_counts: dict = {}
-        for s in all_subs:
-            key = s.route_number or "Unknown"
-            if key not in route_counts:
-                route_counts[key] = {"route_number": key, "route_name": s.route_name or "", "count": 0}
-            route_counts[key]["count"] += 1
-
-        # ── permutation combinations (also re-derived so badges are correct)
-        combo_map = defaultdict(list)
-        for s in all_subs:
-            u    = User.query.get(s.user_id)
-            f    = _flags(s)
-            key  = (
-                f["has_padyapuja"],
-                f["has_seva_mahaprasad"],
-                f["seva_time"] or "none",
-                f["has_shejarti"],
-            )
-            combo_map[key].append(_submission_dict(s, u))
+        combo_counts = {}
+        for r in grouped:
+            if r.g == 15:
+                total, shortlisted, finalized = r.total, r.shortlisted, r.finalized
+                seva_counts = {
+                    "padyapuja":       r.padyapuja,
+                    "seva_mahaprasad": r.seva_mahaprasad,
+                    "shejarti":        r.shejarti,
+                }
+            elif r.g == 7:
+                area_counts[r.area or "Unknown"] += r.total
+            elif r.g == 11:
+                key = r.route_number or "Unknown"
+                if key not in route_counts:
+                    route_counts[key] = {"route_number": key, "route_name": "", "count": 0}
+                route_counts[key]["route_name"] = route_counts[key]["route_name"] or r.route_name or ""
+                route_counts[key]["count"] += r.total
+            elif r.g == 13:
+                time_counts[r.seva_time or "none"] += r.total
+            elif r.g == 12:
+                key = (r.has_padyapuja, r.has_seva_mahaprasad, r.seva_time or "none", r.has_shejarti)
+                combo_counts[key] = r.total
 
         combinations = []
-        for (padya, seva_mp, time, shejarti), users in sorted(combo_map.items(), key=lambda x: -len(x[1])):
+        for (padya, seva_mp, time, shejarti), count in sorted(combo_counts.items(), key=lambda x: -x[1]):
             combinations.append({
                 "has_padyapuja":       padya,
                 "has_seva_mahaprasad": seva_mp,
                 "seva_time":           time if time != "none" else None,
                 "has_shejarti":        shejarti,
-                "count":               len(users),
-                "users":               users,
+                "count":               count,
             })
 
         return jsonify({
@@ -537,6 +1196,92 @@ def get_summary_admin():
         return jsonify({"error": "Failed to build summary"}), 500
 
 
+@router.route("/adhik-maas/summary/combination", methods=["GET"])
+def get_summary_combination():
+    """
+    [Admin] Page through the users of one flag combination from the summary.
+
+    Query params:
+      has_padyapuja, has_seva_mahaprasad, has_shejarti   true | false  (required)
+      seva_time    afternoon | evening | any | none                    (required)
+      limit        page size, 1-200 (default 50)
+      cursor       next_cursor from the previous page
+
+    Ordered by (area, id) with keyset pagination, so every page costs the
+    same regardless of how deep the admin scrolls.
+
+    Response: { "users": [ ...submission dicts ], "next_cursor": str | null }
+    """
+    err, status = _require_admin()
+    if err is not None:
+        return err, status
+
+    flags = {
+        name: _parse_bool_arg(name)
+        for name in ("has_padyapuja", "has_seva_mahaprasad", "has_shejarti")
+    }
+    missing = [name for name, value in flags.items() if value is None]
+    if missing:
+        return jsonify({"error": f"{', '.join(missing)} must be true or false"}), 400
+
+    seva_time = (request.args.get("seva_time") or "").strip().lower()
+    if seva_time not in ("afternoon", "evening", "any", "none"):
+        return jsonify({"error": "seva_time must be afternoon, evening, any or none"}), 400
+
+    try:
+        limit = int(request.args.get("limit", 50))
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, 200))
+
+    after = None
+    if request.args.get("cursor"):
+        after = _decode_cursor(request.args["cursor"])
+        # (area, id) go straight into the keyset comparison; a tampered
+        # cursor must not turn into a database error.
+        if (
+            not after or len(after) != 2
+            or not isinstance(after[0], str)
+            or not isinstance(after[1], int) or isinstance(after[1], bool)
+        ):
+            return jsonify({"error": "Invalid cursor"}), 400
+
+    try:
+        from model import AdhikMaasSubmission
+        from sqlalchemy import tuple_
+
+        criteria = [
+            AdhikMaasSubmission.has_padyapuja       == flags["has_padyapuja"],
+            AdhikMaasSubmission.has_seva_mahaprasad == flags["has_seva_mahaprasad"],
+            AdhikMaasSubmission.has_shejarti        == flags["has_shejarti"],
+            AdhikMaasSubmission.seva_time.is_(None) if seva_time == "none"
+            else AdhikMaasSubmission.seva_time == seva_time,
+        ]
+        if after:
+            criteria.append(
+                tuple_(AdhikMaasSubmission.area, AdhikMaasSubmission.id) > tuple_(after[0], after[1])
+            )
+
+        rows = _load_submissions(
+            *criteria,
+            order_by=(AdhikMaasSubmission.area, AdhikMaasSubmission.id),
+            limit=limit + 1,
+        )
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1][0]
+            next_cursor = _encode_cursor(last.area, last.id)
+
+        return jsonify({
+            "users":       [_submission_dict(s, u) for s, u in page],
+            "next_cursor": next_cursor,
+        }), 200
+    except Exception as e:
+        logging.exception("get_summary_combination error: %s", e)
+        return jsonify({"error": "Failed to load combination"}), 500
+
+
 # ─── Admin: shortlist workflow ─────────────────────────────────────────────────
 
 @router.route("/adhik-maas/submissions/<int:submission_id>/shortlist", methods=["PUT"])
@@ -548,21 +1293,23 @@ def toggle_shortlist(submission_id):
     err, status = _require_admin()
     if err is not None:
         return err, status
-    from model import db, AdhikMaasSubmission
+    from model import db
 
     data       = request.get_json(force=True, silent=True) or {}
     shortlisted = data.get("shortlisted", True)
 
-    submission = AdhikMaasSubmission.query.get(submission_id)
+    submission = _locked_submission(id=submission_id)
     if not submission:
         return jsonify({"error": "Submission not found"}), 404
 
+    old_key = _stats_key(submission)
     submission.is_shortlisted  = bool(shortlisted)
     submission.shortlisted_at  = datetime.utcnow() if shortlisted else None
     if "admin_notes" in data:
         submission.admin_notes = data["admin_notes"]
 
     try:
+        _apply_stats_deltas([old_key], [_stats_key(submission)])
         db.session.commit()
         return jsonify({
             "message":         "Shortlist updated",
@@ -583,9 +1330,12 @@ def list_shortlisted():
     if err is not None:
         return err, status
     try:
-        from model import AdhikMaasSubmission, User
-        subs = AdhikMaasSubmission.query.filter_by(is_shortlisted=True).order_by(AdhikMaasSubmission.area).all()
-        out  = [_submission_dict(s, User.query.get(s.user_id)) for s in subs]
+        from model import AdhikMaasSubmission
+        rows = _load_submissions(
+            AdhikMaasSubmission.is_shortlisted == True,
+            order_by=(AdhikMaasSubmission.area,),
+        )
+        out  = [_submission_dict(s, u) for s, u in rows]
         return jsonify({"shortlisted": out, "total": len(out)}), 200
     except Exception as e:
         logging.exception("list_shortlisted error: %s", e)
@@ -603,22 +1353,25 @@ def toggle_finalize(submission_id):
     err, status = _require_admin()
     if err is not None:
         return err, status
-    from model import db, AdhikMaasSubmission
+    from model import db
 
     data      = request.get_json(force=True, silent=True) or {}
     finalized = data.get("finalized", True)
 
-    submission = AdhikMaasSubmission.query.get(submission_id)
+    submission = _locked_submission(id=submission_id)
     if not submission:
         return jsonify({"error": "Submission not found"}), 404
 
+    old_key = _stats_key(submission)
     submission.is_finalized = bool(finalized)
     submission.finalized_at = datetime.utcnow() if finalized else None
     if "admin_notes" in data:
         submission.admin_notes = data["admin_notes"]
 
     try:
+        _apply_stats_deltas([old_key], [_stats_key(submission)])
         db.session.commit()
+        _republish_finalized()
         return jsonify({
             "message":       "Finalize status updated",
             "id":            submission.id,
@@ -638,57 +1391,173 @@ def list_finalized():
     if err is not None:
         return err, status
     try:
-        from model import AdhikMaasSubmission, User
-        subs = AdhikMaasSubmission.query.filter_by(is_finalized=True).order_by(AdhikMaasSubmission.area).all()
-        out  = [_submission_dict(s, User.query.get(s.user_id)) for s in subs]
+        from model import AdhikMaasSubmission
+        rows = _load_submissions(
+            AdhikMaasSubmission.is_finalized == True,
+            order_by=(AdhikMaasSubmission.area,),
+        )
+        out  = [_submission_dict(s, u) for s, u in rows]
         return jsonify({"finalized": out, "total": len(out)}), 200
     except Exception as e:
         logging.exception("list_finalized error: %s", e)
         return jsonify({"error": "Failed to fetch finalized submissions"}), 500
 
 
+# ─── Public finalized list snapshot ───────────────────────────────────────────
+#
+# The public list is materialised into published_snapshots (JSON body +
+# ETag) whenever an admin finalizes / un-finalizes, edits a finalized
+# submission or flips the adhik_maas_2026_list_finalized toggle.  Each
+# process keeps the parsed snapshot in memory under the
+# 'published_snapshots' version stamp, so serving it costs no query.
+
+PUBLIC_FINALIZED_SNAPSHOT = "adhik_maas_public_finalized"
+PUBLIC_FINALIZED_TOGGLE   = "adhik_maas_2026_list_finalized"
+PUBLIC_SNAPSHOT_MAX_AGE   = 5
+_public_snapshot_cache = VersionedCache()
+
+
+def _public_dict(s, u) -> dict:
+    return {
+        "id":           s.id,
+        "user_name":    f"{u.first_name} {u.last_name}".strip() if u else "",
+        "flat_no":      getattr(u, "flat_no", None)       if u else None,
+        "full_address": getattr(u, "full_address", None)  if u else None,
+        "landmark":     getattr(u, "landmark", None)      if u else None,
+        "city":         getattr(u, "city", None)          if u else None,
+        "state":        getattr(u, "state", None)         if u else None,
+        "area":         s.area,
+        "route_number": getattr(s, "route_number", None),
+        "route_name":   getattr(s, "route_name", None),
+        "route_date":   getattr(s, "route_date").isoformat() if getattr(s, "route_date", None) else None,
+        "final_seva":   getattr(s, "final_seva", None),
+        "seva_label":   getattr(s, "seva_label", None),
+        "finalized_at": s.finalized_at.isoformat() if s.finalized_at else None,
+    }
+
+
+def publish_finalized_snapshot():
+    """Rebuild and store the public finalized-list snapshot (commits)."""
+    from model import db, AdhikMaasSubmission, FeatureToggle, PublishedSnapshot
+    from sqlalchemy import text
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    # Serialise publishers so the last snapshot written is built from the
+    # latest committed state.
+    db.session.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:name))"),
+        {"name": PUBLIC_FINALIZED_SNAPSHOT},
+    )
+    toggle = FeatureToggle.query.filter_by(toggle_name=PUBLIC_FINALIZED_TOGGLE).first()
+    published = bool(toggle and toggle.toggle_enabled)
+    rows = _load_submissions(
+        AdhikMaasSubmission.is_finalized == True,
+        order_by=(AdhikMaasSubmission.route_date, AdhikMaasSubmission.area),
+    )
+    out  = [_public_dict(s, u) for s, u in rows]
+    body = current_app.json.dumps({"finalized": out, "total": len(out)})
+    etag = hashlib.sha1(body.encode()).hexdigest()
+
+    values = {
+        "name":      PUBLIC_FINALIZED_SNAPSHOT,
+        "published": published,
+        "body":      body,
+        "etag":      etag,
+        "built_at":  datetime.utcnow(),
+    }
+    stmt = pg_insert(PublishedSnapshot).values(**values)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[PublishedSnapshot.name],
+        set_={k: stmt.excluded[k] for k in ("published", "body", "etag", "built_at")},
+    ))
+    db.session.commit()
+
+
+def _republish_finalized():
+    """publish_finalized_snapshot() for write paths; never fails the request."""
+    from model import db
+    try:
+        publish_finalized_snapshot()
+    except Exception as e:
+        db.session.rollback()
+        logging.exception("publishing the finalized list failed: %s", e)
+
+
+class _PublicFinalizedIndex:
+    """Parsed snapshot with route_number / route_date lookups."""
+
+    def __init__(self, row):
+        self.published = row.published
+        self.body      = row.body
+        self.etag      = row.etag
+        self.items     = json.loads(row.body)["finalized"]
+        self.by_route  = defaultdict(list)
+        self.by_date   = defaultdict(list)
+        for item in self.items:
+            self.by_route[item["route_number"]].append(item)
+            self.by_date[item["route_date"]].append(item)
+        self._filtered = {}
+
+    def filtered(self, route_number, route_date):
+        """(body, etag) for a filtered view, serialised once per filter."""
+        key = (route_number, route_date)
+        hit = self._filtered.get(key)
+        if hit is None:
+            if route_number is not None:
+                items = self.by_route.get(route_number, [])
+                if route_date is not None:
+                    items = [i for i in items if i["route_date"] == route_date]
+            else:
+                items = self.by_date.get(route_date, [])
+            body = current_app.json.dumps({"finalized": items, "total": len(items)})
+            hit = (body, hashlib.sha1(body.encode()).hexdigest())
+            # Only filters that match something are kept, so arbitrary
+            # query strings cannot grow the cache.
+            if items:
+                self._filtered[key] = hit
+        return hit
+
+
+def _public_finalized_index() -> _PublicFinalizedIndex:
+    from model import PublishedSnapshot
+    version = data_version("published_snapshots", max_age=PUBLIC_SNAPSHOT_MAX_AGE)
+    index   = _public_snapshot_cache.get(PUBLIC_FINALIZED_SNAPSHOT, version)
+    if index is None:
+        row = PublishedSnapshot.query.get(PUBLIC_FINALIZED_SNAPSHOT)
+        if row is None:
+            publish_finalized_snapshot()
+            row = PublishedSnapshot.query.get(PUBLIC_FINALIZED_SNAPSHOT)
+        index = _public_snapshot_cache.put(
+            PUBLIC_FINALIZED_SNAPSHOT, version, _PublicFinalizedIndex(row)
+        )
+    return index
+
+
 @router.route("/adhik-maas/public-finalized", methods=["GET"])
 def public_list_finalized():
     """
     [Public] Return finalized submissions visible to all users.
     Only accessible when the feature-toggle 'adhik_maas_2026_list_finalized' is TRUE.
     Returns a trimmed payload (no admin workflow fields).
+
+    Served from the published snapshot with an ETag (If-None-Match -> 304).
+    Optional filters: route_number, route_date (YYYY-MM-DD).
     """
     try:
-        from model import AdhikMaasSubmission, User, FeatureToggle
-
-        toggle = FeatureToggle.query.filter_by(toggle_name="adhik_maas_2026_list_finalized").first()
-        if not toggle or not toggle.toggle_enabled:
+        index = _public_finalized_index()
+        if not index.published:
             return jsonify({"error": "List not yet published"}), 403
 
-        subs = (
-            AdhikMaasSubmission.query
-            .filter_by(is_finalized=True)
-            .order_by(AdhikMaasSubmission.route_date, AdhikMaasSubmission.area)
-            .all()
-        )
-
-        def _public_dict(s):
-            u = User.query.get(s.user_id)
-            return {
-                "id":           s.id,
-                "user_name":    f"{u.first_name} {u.last_name}".strip() if u else "",
-                "flat_no":      getattr(u, "flat_no", None)       if u else None,
-                "full_address": getattr(u, "full_address", None)  if u else None,
-                "landmark":     getattr(u, "landmark", None)      if u else None,
-                "city":         getattr(u, "city", None)          if u else None,
-                "state":        getattr(u, "state", None)         if u else None,
-                "area":         s.area,
-                "route_number": getattr(s, "route_number", None),
-                "route_name":   getattr(s, "route_name", None),
-                "route_date":   getattr(s, "route_date").isoformat() if getattr(s, "route_date", None) else None,
-                "final_seva":   getattr(s, "final_seva", None),
-                "seva_label":   getattr(s, "seva_label", None),
-                "finalized_at": s.finalized_at.isoformat() if s.finalized_at else None,
-            }
+        route_number = request.args.get("route_number") or None
+        route_date   = request.args.get("route_date") or None
+        if route_number is None and route_date is None:
+            body, etag = index.body, index.etag
+        else:
+            body, etag = index.filtered(route_number, route_date)
 
-        out = [_public_dict(s) for s in subs]
-        return jsonify({"finalized": out, "total": len(out)}), 200
+        response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         logging.exception("public_list_finalized error: %s", e)
         return jsonify({"error": "Failed to fetch finalized list"}), 500
@@ -781,81 +1650,179 @@ def update_seva_options():
 
 # ─── Admin: map data ──────────────────────────────────────────────────────────
 
-def _geocode_address(address):
-    if not address or not str(address).strip():
-        return None, None
-    try:
-        from geopy.geocoders import Nominatim
-        from geopy.extra.rate_limiter import RateLimiter
-        geolocator  = Nominatim(user_agent="upasana-adhik-maas")
-        rate_limited = RateLimiter(geolocator.geocode, min_delay_seconds=1.1)
-        location    = rate_limited(str(address).strip())
-        if location and location.latitude is not None:
-            return float(location.latitude), float(location.longitude)
-    except Exception as e:
-        logging.warning("Geocode failed for %s: %s", (address or "")[:50], e)
-    return None, None
+# Last resort for a user with neither coordinates nor a known pincode.
+_PUNE_CENTRE = (18.5204, 73.8567)
+
+
+_map_cache = VersionedCache()
+
+
+def _build_map_index() -> MapIndex:
+    """Every submission as a map point, bucketed for clustering."""
+    from model import AdhikMaasSubmission
+
+    rows = _load_submissions(
+        order_by=(AdhikMaasSubmission.submitted_at.desc(),), inner=True
+    )
+    missing = [
+        geocoding.normalise_address(u.full_address)
+        for _, u in rows
+        if u.latitude is None or u.longitude is None
+    ]
+    cached    = geocoding.cached_statuses(missing)
+    centroids = geocoding.centroid_index() if missing else None
+
+    out = []
+    pending = unresolved = 0
+    for s, u in rows:
+        name      = f"{u.first_name} {u.last_name}".strip() or f"User #{s.user_id}"
+        seva_type = s.seva_label or s.seva_preference or ""
+        geocode_pending = approximate = False
+        if u.latitude is not None and u.longitude is not None:
+            lat, lon = float(u.latitude), float(u.longitude)
+        else:
+            approximate = True
+            lat, lon = centroids.lookup(u.pincode, s.pin_code) or _PUNE_CENTRE
+            if geocoding.is_unresolved(geocoding.normalise_address(u.full_address), cached):
+                unresolved += 1
+            else:
+                pending += 1
+                geocode_pending = True
+        out.append({
+            "id":               s.id,
+            "user_id":          s.user_id,
+            "name":             name,
+            "seva_type":        seva_type,
+            "seva_preference":  s.seva_preference,
+            "has_padyapuja":    bool(s.has_padyapuja),
+            "has_seva_mahaprasad": bool(s.has_seva_mahaprasad),
+            "seva_time":        s.seva_time,
+            "has_shejarti":     bool(s.has_shejarti),
+            "is_shortlisted":   bool(s.is_shortlisted),
+            "is_finalized":     bool(s.is_finalized),
+            "latitude":         round(lat, 6),
+            "longitude":        round(lon, 6),
+            "approximate":      approximate,
+            "geocode_pending":  geocode_pending,
+        })
+    return MapIndex(out, pending=pending, unresolved=unresolved)
 
 
 @router.route("/adhik-maas/map-data", methods=["GET"])
 def get_map_data():
-    """[Admin] Submissions with coordinates for map view."""
+    """
+    [Admin] Submissions with coordinates for map view.
+
+    Only stored coordinates are returned; users still waiting for the
+    background geocoder are flagged "geocode_pending": true and counted in
+    the X-Geocode-Pending header (X-Geocode-Unresolved counts addresses the
+    geocoder could not find).  Until a user is geocoded they are placed at
+    the centroid of their pincode (or their area's pincode) and flagged
+    "approximate": true.
+
+    Without query params the response is the full list of points.  With
+    zoom (and optionally bbox=west,south,east,north) it is
+      { "type": "clusters", "zoom", "total", "clusters": [
+            { "geohash", "latitude", "longitude", "count", "approximate",
+              "seva_mix": { "has_padyapuja": N, ... } } ] }
+    below zoom 15, or { "type": "points", "zoom", "total", "points": [...] }
+    from zoom 15 on.  The point list and its clusters are rebuilt only when
+    the 'adhik_maas_map' version stamp moves.
+    """
     err, status = _require_admin()
     if err is not None:
         return err, status
 
+    zoom = bbox = None
+    if request.args.get("zoom") is not None:
+        try:
+            zoom = int(request.args["zoom"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "zoom must be an integer"}), 400
+    if request.args.get("bbox"):
+        bbox = parse_bbox(request.args["bbox"])
+        if bbox is None:
+            return jsonify({"error": "bbox must be west,south,east,north"}), 400
+
     try:
-        from model import db, AdhikMaasSubmission, User
-
-        submissions = AdhikMaasSubmission.query.order_by(AdhikMaasSubmission.submitted_at.desc()).all()
-        out = []
-        for s in submissions:
-            u = User.query.get(s.user_id)
-            if not u:
-                continue
-            name      = f"{u.first_name} {u.last_name}".strip() or f"User #{s.user_id}"
-            seva_type = s.seva_label or s.seva_preference or ""
-            address   = getattr(u, "full_address", None)
-            lat = lon = None
-            if getattr(u, "latitude", None) is not None and getattr(u, "longitude", None) is not None:
-                try:
-                    lat, lon = float(u.latitude), float(u.longitude)
-                except (TypeError, ValueError):
-                    pass
-            if (lat is None or lon is None) and address:
-                lat, lon = _geocode_address(address)
-                if lat is not None:
-                    try:
-                        u.latitude  = lat
-                        u.longitude = lon
-                        db.session.add(u)
-                        db.session.commit()
-                    except Exception as e:
-                        logging.warning("Failed to save lat/lng for user %s: %s", s.user_id, e)
-                        db.session.rollback()
-            if lat is None or lon is None:
-                lat, lon = 18.5204, 73.8567
-            out.append({
-                "id":               s.id,
-                "user_id":          s.user_id,
-                "name":             name,
-                "seva_type":        seva_type,
-                "seva_preference":  s.seva_preference,
-                "has_padyapuja":    bool(s.has_padyapuja),
-                "has_seva_mahaprasad": bool(s.has_seva_mahaprasad),
-                "seva_time":        s.seva_time,
-                "has_shejarti":     bool(s.has_shejarti),
-                "is_shortlisted":   bool(s.is_shortlisted),
-                "is_finalized":     bool(s.is_finalized),
-                "latitude":         round(lat, 6),
-                "longitude":        round(lon, 6),
-            })
-        return jsonify(out), 200
+        version = data_version("adhik_maas_map")
+        index   = _map_cache.get("index", version)
+        if index is None:
+            index = _map_cache.put("index", version, _build_map_index())
+
+        if index.pending:
+            geocoding.worker.wake(current_app._get_current_object())
+
+        if zoom is None and bbox is None:
+            response = jsonify(index.points)
+        else:
+            precision = precision_for_zoom(zoom if zoom is not None else CLUSTER_MAX_ZOOM)
+            if precision is None:
+                points = index.points_in(bbox)
+                response = jsonify({"type": "points", "zoom": zoom, "total": len(points), "points": points})
+            else:
+                clusters = index.clusters(precision, bbox)
+                response = jsonify({
+                    "type":     "clusters",
+                    "zoom":     zoom,
+                    "total":    sum(c["count"] for c in clusters),
+                    "clusters": clusters,
+                })
+        response.headers["X-Geocode-Pending"]    = str(index.pending)
+        response.headers["X-Geocode-Unresolved"] = str(index.unresolved)
+        return response, 200
     except Exception as e:
         logging.exception("get_map_data error: %s", e)
         return jsonify({"error": "Failed to build map data"}), 500
 
 
+@router.cli.command("geocode-backfill")
+@click.option("--limit", type=int, default=None, help="Stop after this many users.")
+def geocode_backfill(limit):
+    """Geocode users with a submission but no coordinates, via geocode_cache."""
+    stats = geocoding.run_backfill(limit=limit)
+    click.echo(f"Resolved {stats['resolved']} user(s); {stats['unresolved']} unresolved.")
+
+
+@router.cli.command("seed-pincode-centroids")
+def seed_pincode_centroids():
+    """Fill pincode_centroids for every Adhik Maas area and zone pincode."""
+    stats = geocoding.seed_centroids()
+    click.echo(
+        f"{stats['existing']} pincode(s) already known, {stats['geocoded']} geocoded, "
+        f"{stats['missing']} still missing."
+    )
+
+
+@router.cli.command("reconcile-stats")
+def reconcile_stats():
+    """Recompute adhik_maas_stats from adhik_maas_submissions."""
+    from model import db
+    from sqlalchemy import text
+    try:
+        # EXCLUSIVE blocks concurrent delta writers until the recompute commits;
+        # writes that are still in flight apply their delta on top afterwards.
+        db.session.execute(text("LOCK TABLE adhik_maas_stats IN EXCLUSIVE MODE"))
+        db.session.execute(text("DELETE FROM adhik_maas_stats"))
+        result = db.session.execute(text("""
+            INSERT INTO adhik_maas_stats (
+                route_number, route_name, area,
+                has_padyapuja, has_seva_mahaprasad, seva_time, has_shejarti,
+                is_shortlisted, is_finalized, submission_count, updated_at
+            )
+            SELECT coalesce(route_number, ''), coalesce(route_name, ''), coalesce(area, ''),
+                   has_padyapuja, has_seva_mahaprasad, coalesce(seva_time, ''), has_shejarti,
+                   is_shortlisted, is_finalized, count(*), now()
+            FROM adhik_maas_submissions
+            GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9
+        """))
+        db.session.commit()
+        click.echo(f"Recomputed {result.rowcount} Adhik Maas stats row(s).")
+    except Exception:
+        db.session.rollback()
+        raise
+
+
 # ─── Export endpoint ──────────────────────────────────────────────────────────
 
 _TIME_LABELS = {
@@ -865,6 +1832,83 @@ _TIME_LABELS = {
 }
 
 
+EXPORT_COLUMNS = [
+    "Name", "Mobile", "Zone", "Reg. Area", "Address",
+    "Route No.", "Route Name", "Submission Area", "PIN Code",
+    "Padyapuja", "Seva + Mahaprasad", "Time Preference", "Shejarti & Kaakad",
+    "Seva Label", "Route Date", "Final Seva",
+    "Shortlisted", "Finalized", "Finalized At", "Admin Notes", "Submitted At",
+]
+
+
+def _export_criteria(status_filter: str, search: str) -> list:
+    """SQL filters for the export: workflow status + substring search."""
+    from model import AdhikMaasSubmission, User
+    from sqlalchemy import literal_column, or_
+
+    criteria = []
+    if status_filter == "shortlisted":
+        criteria.append(AdhikMaasSubmission.is_shortlisted == True)
+    elif status_filter == "finalized":
+        criteria.append(AdhikMaasSubmission.is_finalized == True)
+
+    if search:
+        pattern   = _ilike_pattern(search)
+        full_name = literal_column(_FULL_NAME_SQL)
+        criteria.append(or_(
+            full_name.ilike(pattern),
+            User.mobile_number.ilike(pattern),
+            AdhikMaasSubmission.area.ilike(pattern),
+            AdhikMaasSubmission.route_name.ilike(pattern),
+            AdhikMaasSubmission.route_number.ilike(pattern),
+        ))
+    return criteria
+
+
+def _export_row(s, u) -> list:
+    """One export row, in EXPORT_COLUMNS order."""
+    name = " ".join(filter(None, [u.first_name, u.middle_name, u.last_name]))
+    address = ", ".join(filter(None, [
+        u.flat_no, u.full_address, u.landmark,
+        u.area, u.city, u.state, u.pincode,
+    ]))
+    return [
+        name,
+        u.mobile_number     or "",
+        u.zone_code         or "",
+        u.area              or "",
+        address,
+        s.route_number      or "",
+        s.route_name        or "",
+        s.area              or "",
+        s.pin_code          or "",
+        "Yes" if s.has_padyapuja        else "No",
+        "Yes" if s.has_seva_mahaprasad  else "No",
+        _TIME_LABELS.get(s.seva_time, s.seva_time or "—"),
+        "Yes" if s.has_shejarti         else "No",
+        s.seva_label        or "",
+        s.route_date.strftime("%d %b %Y") if s.route_date else "",
+        s.final_seva        or "",
+        "Yes" if s.is_shortlisted  else "No",
+        "Yes" if s.is_finalized    else "No",
+        s.finalized_at.strftime("%d %b %Y %H:%M") if s.finalized_at else "",
+        s.admin_notes       or "",
+        s.submitted_at.strftime("%d %b %Y %H:%M") if s.submitted_at else "",
+    ]
+
+
+def export_rows(status_filter: str, search: str):
+    """Export rows streamed from a server-side cursor, 500 at a time."""
+    from model import AdhikMaasSubmission
+    query = _submissions_query(
+        *_export_criteria(status_filter, search),
+        order_by=(AdhikMaasSubmission.route_number, AdhikMaasSubmission.area),
+        inner=True,
+    ).yield_per(500)
+    for s, u in query:
+        yield _export_row(s, u)
+
+
 @router.route("/adhik-maas/export", methods=["GET"])
 def export_submissions():
     """
@@ -873,113 +1917,48 @@ def export_submissions():
     Query params:
       format   – 'csv' (default) or 'xlsx'
       status   – 'all' (default) | 'shortlisted' | 'finalized'
-      search   – optional name / mobile / area substring filter
+      search   – optional name / mobile / area / route substring filter
       admin_user_id or admin_mobile – auth (same as all admin endpoints)
+
+    Rows are filtered in SQL and streamed from a server-side cursor; CSV is
+    sent row by row, XLSX is written in openpyxl write-only mode to a
+    temporary file.
     """
     err, status_code = _require_admin()
     if err is not None:
         return err, status_code
 
     try:
-        import io
-        import pandas as pd
-        from flask import send_file, Response
-        from model import AdhikMaasSubmission, User
+        import itertools
+        import tempfile
+        from flask import send_file, Response, stream_with_context
 
         fmt           = request.args.get("format", "csv").lower()
         status_filter = request.args.get("status", "all").lower()
-        search        = request.args.get("search", "").strip().lower()
-
-        query = AdhikMaasSubmission.query.join(User, AdhikMaasSubmission.user_id == User.id)
-        if status_filter == "shortlisted":
-            query = query.filter(AdhikMaasSubmission.is_shortlisted == True)
-        elif status_filter == "finalized":
-            query = query.filter(AdhikMaasSubmission.is_finalized == True)
-
-        submissions = query.order_by(
-            AdhikMaasSubmission.route_number,
-            AdhikMaasSubmission.area,
-        ).all()
-
-        rows = []
-        for s in submissions:
-            u = User.query.get(s.user_id)
-            if not u:
-                continue
-
-            name = " ".join(filter(None, [u.first_name, u.middle_name, u.last_name]))
-
-            if search and not any(
-                search in str(v).lower()
-                for v in [name, u.mobile_number, s.area, s.route_name, s.route_number]
-                if v
-            ):
-                continue
-
-            address = ", ".join(filter(None, [
-                u.flat_no, u.full_address, u.landmark,
-                u.area, u.city, u.state, u.pincode,
-            ]))
-
-            rows.append({
-                "Name":               name,
-                "Mobile":             u.mobile_number     or "",
-                "Zone":               u.zone_code         or "",
-                "Reg. Area":          u.area              or "",
-                "Address":            address,
-                "Route No.":          s.route_number      or "",
-                "Route Name":         s.route_name        or "",
-                "Submission Area":    s.area              or "",
-                "PIN Code":           s.pin_code          or "",
-                "Padyapuja":          "Yes" if s.has_padyapuja        else "No",
-                "Seva + Mahaprasad":  "Yes" if s.has_seva_mahaprasad  else "No",
-                "Time Preference":    _TIME_LABELS.get(s.seva_time, s.seva_time or "—"),
-                "Shejarti & Kaakad":  "Yes" if s.has_shejarti         else "No",
-                "Seva Label":         s.seva_label        or "",
-                "Route Date":         s.route_date.strftime("%d %b %Y") if s.route_date else "",
-                "Final Seva":         s.final_seva        or "",
-                "Shortlisted":        "Yes" if s.is_shortlisted  else "No",
-                "Finalized":          "Yes" if s.is_finalized    else "No",
-                "Finalized At":       s.finalized_at.strftime("%d %b %Y %H:%M") if s.finalized_at else "",
-                "Admin Notes":        s.admin_notes       or "",
-                "Submitted At":       s.submitted_at.strftime("%d %b %Y %H:%M") if s.submitted_at else "",
-            })
+        search        = request.args.get("search", "").strip()
 
-        if not rows:
+        rows  = export_rows(status_filter, search)
+        first = next(rows, None)
+        if first is None:
             return jsonify({"error": "No data to export for the selected filter"}), 404
+        rows = itertools.chain([first], rows)
 
-        df = pd.DataFrame(rows)
         date_str     = datetime.utcnow().strftime("%Y-%m-%d")
         status_label = status_filter.capitalize()
 
         if fmt == "xlsx":
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                sheet_name = status_label[:31]
-                df.to_excel(writer, index=False, sheet_name=sheet_name)
-                ws = writer.sheets[sheet_name]
-                from openpyxl.styles import Font, PatternFill, Alignment
-                header_fill = PatternFill("solid", fgColor="F15700")
-                for cell in ws[1]:
-                    cell.font      = Font(bold=True, color="FFFFFF")
-                    cell.fill      = header_fill
-                    cell.alignment = Alignment(horizontal="center")
-                for col in ws.columns:
-                    width = max((len(str(cell.value or "")) for cell in col), default=8)
-                    ws.column_dimensions[col[0].column_letter].width = min(width + 4, 55)
+            output = tempfile.TemporaryFile()
+            write_xlsx(output, status_label, EXPORT_COLUMNS, rows)
             output.seek(0)
             return send_file(
                 output,
-                mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                mimetype=XLSX_MIMETYPE,
                 as_attachment=True,
                 download_name=f"Adhik_Maas_{status_label}_{date_str}.xlsx",
             )
         else:
-            output = io.StringIO()
-            output.write("\ufeff")          # UTF-8 BOM so Excel opens it cleanly
-            df.to_csv(output, index=False)
             return Response(
-                output.getvalue(),
+                stream_with_context(csv_stream(EXPORT_COLUMNS, rows)),
                 mimetype="text/csv; charset=utf-8",
                 headers={
                     "Content-Disposition":
@@ -993,6 +1972,86 @@ def export_submissions():
 
 # ─── Day Summary (public) ─────────────────────────────────────────────────────
 
+# Per-date / per-range summaries, keyed on the 'adhik_maas_schedule' stamp
+# (bumped only when finalization, route dates or seva flags change).  The
+# stamp itself is re-read at most every DAY_SUMMARY_MAX_AGE seconds, so the
+# HomeScreen card normally costs no query at all.
+_day_summary_cache = VersionedCache(max_entries=512)
+DAY_SUMMARY_MAX_AGE = 5
+DAY_SUMMARY_MAX_RANGE = 92
+
+
+def _empty_day_summary(day) -> dict:
+    return {
+        "date":         day.isoformat(),
+        "route_number": None,
+        "route_name":   None,
+        "total":        0,
+        "sevas": {
+            "padyapuja":          0,
+            "abhishek_afternoon": 0,
+            "abhishek_evening":   0,
+            "shejarti":           0,
+            "mahaprasad":         0,
+        },
+    }
+
+
+def _day_summaries(start, end) -> list:
+    """Summaries of finalized visits for every date in [start, end], one query."""
+    from datetime import timedelta
+    from model import db
+    from sqlalchemy import text
+
+    rows = db.session.execute(text("""
+        SELECT route_date,
+               (array_agg(route_number ORDER BY id))[1]                      AS route_number,
+               (array_agg(route_name   ORDER BY id))[1]                      AS route_name,
+               count(*)                                                      AS total,
+               count(*) FILTER (WHERE has_padyapuja)                         AS padyapuja,
+               count(*) FILTER (WHERE seva_time = 'afternoon')               AS abhishek_afternoon,
+               count(*) FILTER (WHERE seva_time IN ('evening', 'any'))       AS abhishek_evening,
+               count(*) FILTER (WHERE has_shejarti)                          AS shejarti,
+               count(*) FILTER (WHERE has_seva_mahaprasad)                   AS mahaprasad
+        FROM adhik_maas_submissions
+        WHERE is_finalized = TRUE
+          AND route_date >= :start AND route_date <= :end
+        GROUP BY route_date
+    """), {"start": start, "end": end}).all()
+    by_date = {r.route_date: r for r in rows}
+
+    out = []
+    day = start
+    while day <= end:
+        r = by_date.get(day)
+        if r is None:
+            out.append(_empty_day_summary(day))
+        else:
+            out.append({
+                "date":         day.isoformat(),
+                "route_number": r.route_number,
+                "route_name":   r.route_name,
+                "total":        r.total,
+                "sevas": {
+                    "padyapuja":          r.padyapuja,
+                    "abhishek_afternoon": r.abhishek_afternoon,
+                    "abhishek_evening":   r.abhishek_evening,
+                    "shejarti":           r.shejarti,
+                    "mahaprasad":         r.mahaprasad,
+                },
+            })
+        day += timedelta(days=1)
+    return out
+
+
+def _cached_day_summaries(start, end) -> list:
+    version = data_version("adhik_maas_schedule", max_age=DAY_SUMMARY_MAX_AGE)
+    cached  = _day_summary_cache.get((start, end), version)
+    if cached is None:
+        cached = _day_summary_cache.put((start, end), version, _day_summaries(start, end))
+    return cached
+
+
 @router.route("/adhik-maas/day-summary", methods=["GET"])
 def adhik_maas_day_summary():
     """
@@ -1004,7 +2063,6 @@ def adhik_maas_day_summary():
     Returns totals + per-seva counts for all *finalized* submissions
     whose route_date matches the given date.
     """
-    from model import AdhikMaasSubmission
     from datetime import date as date_type
 
     date_str = request.args.get("date", "").strip()
@@ -1017,52 +2075,40 @@ def adhik_maas_day_summary():
         return jsonify({"error": "invalid date format, use YYYY-MM-DD"}), 400
 
     try:
-        subs = (
-            AdhikMaasSubmission.query
-            .filter(
-                AdhikMaasSubmission.route_date == date_obj,
-                AdhikMaasSubmission.is_finalized == True,
-            )
-            .all()
-        )
+        return jsonify(_cached_day_summaries(date_obj, date_obj)[0]), 200
+    except Exception as e:
+        logging.exception("adhik_maas_day_summary error: %s", e)
+        return jsonify({"error": "Failed to fetch day summary"}), 500
 
-        if not subs:
-            return jsonify({
-                "date":         date_str,
-                "route_number": None,
-                "route_name":   None,
-                "total":        0,
-                "sevas": {
-                    "padyapuja":          0,
-                    "abhishek_afternoon": 0,
-                    "abhishek_evening":   0,
-                    "shejarti":           0,
-                    "mahaprasad":         0,
-                },
-            }), 200
 
-        route_number = subs[0].route_number
-        route_name   = subs[0].route_name
+@router.route("/adhik-maas/day-summary/range", methods=["GET"])
+def adhik_maas_day_summary_range():
+    """
+    Public: day summaries for every date from..to (inclusive), in one call.
+
+    Query params:
+      from, to  – YYYY-MM-DD (required, at most 92 days apart)
 
-        padyapuja          = sum(1 for s in subs if s.has_padyapuja)
-        abhishek_afternoon = sum(1 for s in subs if s.seva_time in ("afternoon",))
-        abhishek_evening   = sum(1 for s in subs if s.seva_time in ("evening", "any"))
-        shejarti           = sum(1 for s in subs if s.has_shejarti)
-        mahaprasad         = sum(1 for s in subs if s.has_seva_mahaprasad)
+    Response: { "from", "to", "days": [ <day-summary>, ... ] }
+    """
+    from datetime import date as date_type
+
+    try:
+        start = date_type.fromisoformat(request.args.get("from", "").strip())
+        end   = date_type.fromisoformat(request.args.get("to", "").strip())
+    except ValueError:
+        return jsonify({"error": "from and to are required, use YYYY-MM-DD"}), 400
+    if end < start:
+        return jsonify({"error": "to must not be before from"}), 400
+    if (end - start).days >= DAY_SUMMARY_MAX_RANGE:
+        return jsonify({"error": f"range must be at most {DAY_SUMMARY_MAX_RANGE} days"}), 400
 
+    try:
         return jsonify({
-            "date":         date_str,
-            "route_number": route_number,
-            "route_name":   route_name,
-            "total":        len(subs),
-            "sevas": {
-                "padyapuja":          padyapuja,
-                "abhishek_afternoon": abhishek_afternoon,
-                "abhishek_evening":   abhishek_evening,
-                "shejarti":           shejarti,
-                "mahaprasad":         mahaprasad,
-            },
+            "from": start.isoformat(),
+            "to":   end.isoformat(),
+            "days": _cached_day_summaries(start, end),
         }), 200
     except Exception as e:
-        logging.exception("adhik_maas_day_summary error: %s", e)
-        return jsonify({"error": "Failed to fetch day summary"}), 500
+        logging.exception("adhik_maas_day_summary_range error: %s", e)
+        return jsonify({"error": "Failed to fetch day summaries"}), 500
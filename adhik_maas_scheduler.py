@@ -0,0 +1,182 @@
+"""
+Route-date scheduling for Adhik Maas Daura.
+
+propose_schedule() assigns shortlisted submissions to visit dates:
+
+  * one route per day — a route's households are visited together, and a
+    route that does not fit in one day continues on the next date;
+  * routes are taken in route_number order, households within a route in
+    submission order (first come, first served);
+  * each day has a capacity per seva; a household fits on a day only if
+    every seva it asked for still has room.  seva_time 'afternoon' /
+    'evening' use that abhishek slot, 'any' uses whichever has room;
+  * households already dated inside the range stay put: their date belongs
+    to their route (no other route is put on it) and their sevas count
+    against that day's capacity.
+
+Per day the work is vectorised: the households' demands form an n x 6
+matrix, its running sum is compared with the capacities in one go, and
+the leading run of rows that fits is the day's batch.  Thousands of
+submissions schedule in a few milliseconds.
+"""
+
+import numpy as np
+
+# Capacity keys, in demand-matrix column order.
+SEVAS = ("padyapuja", "abhishek_afternoon", "abhishek_evening", "shejarti", "mahaprasad")
+_ANY = len(SEVAS)             # extra column: 'any'-time abhishek, either slot
+
+UNLIMITED = np.iinfo(np.int64).max // 4
+
+
+def _demands(subs) -> np.ndarray:
+    """
+    n x 6 int matrix: one column per seva plus the flexible 'any' column.
+    seva_time only counts for households that asked for abhishek mahaprasad.
+    """
+    d = np.zeros((len(subs), len(SEVAS) + 1), dtype=np.int64)
+    for i, s in enumerate(subs):
+        abhishek = bool(s["has_seva_mahaprasad"])
+        d[i, 0] = bool(s["has_padyapuja"])
+        d[i, 1] = abhishek and s["seva_time"] == "afternoon"
+        d[i, 2] = abhishek and s["seva_time"] == "evening"
+        d[i, 3] = bool(s["has_shejarti"])
+        d[i, 4] = abhishek
+        d[i, _ANY] = abhishek and s["seva_time"] == "any"
+    return d
+
+
+def _fits_prefix(demand: np.ndarray, cap: np.ndarray, base: np.ndarray) -> int:
+    """Length of the longest leading run of rows that fits within cap on top of base."""
+    if not len(demand):
+        return 0
+    cum = demand.cumsum(axis=0) + base
+    ok = np.all(cum[:, :_ANY] <= cap, axis=1)
+    # 'any' households may use whatever afternoon + evening room is left.
+    spare = (cap[1] - cum[:, 1]) + (cap[2] - cum[:, 2])
+    ok &= cum[:, _ANY] <= spare
+    return len(ok) if ok.all() else int(np.argmin(ok))
+
+
+def _fits_alone(demand: np.ndarray, cap: np.ndarray) -> np.ndarray:
+    """Per row: does this household fit within one empty day?"""
+    ok = np.all(demand[:, :_ANY] <= cap, axis=1)
+    ok &= demand[:, _ANY] <= cap[1] + cap[2]
+    return ok
+
+
+def propose_schedule(submissions, dates, capacities, booked=None) -> dict:
+    """
+    submissions: dicts with id, route_number, route_name, has_padyapuja,
+                 has_seva_mahaprasad, seva_time, has_shejarti (already in
+                 submission order)
+    dates:       visit dates, in order
+    capacities:  {seva: max per day or None}, keys from SEVAS
+    booked:      {date: {"routes": [route_number, ...], "households": N,
+                         <seva>: N for each of SEVAS, "abhishek_any": N}}
+                 for households already dated in the range
+
+    Returns { "days": [...], "assignments": [...], "unassigned": [ids] }.
+    """
+    cap = np.array(
+        [UNLIMITED if capacities.get(k) is None else int(capacities[k]) for k in SEVAS],
+        dtype=np.int64,
+    )
+    booked = booked or {}
+
+    base_demand = {
+        day: np.array([b.get(k, 0) for k in SEVAS] + [b.get("abhishek_any", 0)], dtype=np.int64)
+        for day, b in booked.items()
+    }
+    no_demand = np.zeros(len(SEVAS) + 1, dtype=np.int64)
+    own_dates: dict = {}
+    for day in dates:
+        for number in (booked.get(day) or {}).get("routes", ()):
+            own_dates.setdefault(number or "", []).append(day)
+    free = [day for day in dates if day not in booked]
+    next_free = 0
+
+    def _route_days(number):
+        """The route's own booked dates merged with the free dates, in order."""
+        nonlocal next_free
+        own = own_dates.get(number, [])
+        i = 0
+        while True:
+            day_own  = own[i] if i < len(own) else None
+            day_free = free[next_free] if next_free < len(free) else None
+            if day_own is None and day_free is None:
+                return
+            if day_free is None or (day_own is not None and day_own < day_free):
+                i += 1
+                yield day_own
+            else:
+                # Taken once yielded: every household fits alone on a free day.
+                next_free += 1
+                yield day_free
+
+    routes: dict = {}
+    for s in submissions:
+        routes.setdefault(s["route_number"] or "", []).append(s)
+
+    def _route_key(number):
+        return (0, int(number), "") if number.isdigit() else (1, 0, number)
+
+    days, assignments, unassigned = [], [], []
+    for number in sorted(routes, key=_route_key):
+        pending = routes[number]
+        demand  = _demands(pending)
+        # A household needing more than a whole day's capacity can never be
+        # placed; set it aside before it takes up a date.
+        fits = _fits_alone(demand, cap)
+        if not fits.all():
+            unassigned.extend(s["id"] for s, ok in zip(pending, fits) if not ok)
+            pending = [s for s, ok in zip(pending, fits) if ok]
+            demand  = demand[fits]
+        route_days = _route_days(number)
+        while pending:
+            day = next(route_days, None)
+            if day is None:
+                # Out of dates for this route.
+                unassigned.extend(s["id"] for s in pending)
+                break
+            base = base_demand.get(day, no_demand)
+            k = _fits_prefix(demand, cap, base)
+            if k == 0:
+                # An own booked date that is already full.
+                continue
+            batch  = demand[:k]
+            totals = batch.sum(axis=0)
+            # Already booked 'any' households are assumed to hold afternoon
+            # places; the feasibility check guarantees the rest fit in the evening.
+            afternoon_room = cap[1] - base[1] - totals[1] - base[_ANY]
+            any_afternoon = int(min(totals[_ANY], max(afternoon_room, 0)))
+            any_left = any_afternoon
+            for s, row in zip(pending[:k], batch):
+                slot = None
+                if row[1]:
+                    slot = "afternoon"
+                elif row[2]:
+                    slot = "evening"
+                elif row[_ANY]:
+                    slot = "afternoon" if any_left > 0 else "evening"
+                    any_left -= slot == "afternoon"
+                assignments.append({
+                    "id":           s["id"],
+                    "route_number": s["route_number"],
+                    "route_date":   day.isoformat(),
+                    "slot":         slot,
+                })
+            counts = {seva: int(totals[i]) for i, seva in enumerate(SEVAS)}
+            counts["abhishek_afternoon"] += any_afternoon
+            counts["abhishek_evening"]   += int(totals[_ANY]) - any_afternoon
+            days.append({
+                "date":           day.isoformat(),
+                "route_number":   number or None,
+                "route_name":     pending[0]["route_name"],
+                "households":     k,
+                "already_booked": int((booked.get(day) or {}).get("households", 0)),
+                "sevas":          counts,
+            })
+            pending, demand = pending[k:], demand[k:]
+
+    return {"days": days, "assignments": assignments, "unassigned": unassigned}
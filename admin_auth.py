@@ -0,0 +1,141 @@
+"""
+Admin identity for the admin endpoints.
+
+An admin request is accepted on any of:
+
+  admin_token    signed at /login for users with isadmin and sent back as
+                 "Authorization: Bearer <token>" or an admin_token parameter;
+                 verified in-process with itsdangerous, no query at all
+  admin_user_id  legacy clients; isadmin is read with a one-column query and
+                 cached for ADMIN_CACHE_MAX_AGE seconds
+  admin_mobile   the super-admin mobile number
+
+Tokens live for ADMIN_TOKEN_MAX_AGE seconds, so revoking isadmin takes
+effect for token holders at their next login at the latest.  Without
+Config.SECRET_KEY no tokens are issued and only the legacy paths work.
+"""
+
+import os
+import threading
+import time
+
+from flask import jsonify, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from config import Config
+
+SUPER_ADMIN_MOBILE = os.getenv("SUPER_ADMIN_MOBILE", "1234567890")
+
+ADMIN_TOKEN_MAX_AGE = int(os.getenv("ADMIN_TOKEN_MAX_AGE", str(12 * 3600)))
+ADMIN_CACHE_MAX_AGE = 30
+
+_TOKEN_SALT = "admin-token"
+
+ADMIN_CACHE_MAX_ENTRIES = 1024
+
+# user_id -> (monotonic time read, isadmin).  users has no version trigger
+# (it is too write-heavy for a shared stamp row), so entries simply expire.
+_admin_cache: dict = {}
+_admin_cache_lock = threading.Lock()
+
+
+def _serializer():
+    if not Config.SECRET_KEY:
+        return None
+    return URLSafeTimedSerializer(Config.SECRET_KEY, salt=_TOKEN_SALT)
+
+
+def issue_admin_token(user_id: int):
+    """Signed admin token for user_id, or None when SECRET_KEY is not set."""
+    serializer = _serializer()
+    if serializer is None:
+        return None
+    return serializer.dumps({"uid": int(user_id)})
+
+
+def verify_admin_token(token: str):
+    """user_id of a valid, unexpired admin token, else None."""
+    serializer = _serializer()
+    if serializer is None or not token:
+        return None
+    try:
+        payload = serializer.loads(token, max_age=ADMIN_TOKEN_MAX_AGE)
+    except BadSignature:        # includes SignatureExpired
+        return None
+    uid = payload.get("uid") if isinstance(payload, dict) else None
+    return uid if isinstance(uid, int) else None
+
+
+def is_admin_user(user_id: int) -> bool:
+    """users.isadmin for user_id, cached for ADMIN_CACHE_MAX_AGE seconds."""
+    from model import db, User
+    from sqlalchemy import select
+
+    with _admin_cache_lock:
+        hit = _admin_cache.get(user_id)
+    if hit is not None and time.monotonic() - hit[0] < ADMIN_CACHE_MAX_AGE:
+        return hit[1]
+    isadmin = bool(db.session.execute(
+        select(User.isadmin).where(User.id == user_id)
+    ).scalar())
+    with _admin_cache_lock:
+        _admin_cache.pop(user_id, None)
+        _admin_cache[user_id] = (time.monotonic(), isadmin)
+        # Oldest first: dicts keep insertion order.
+        while len(_admin_cache) > ADMIN_CACHE_MAX_ENTRIES:
+            _admin_cache.pop(next(iter(_admin_cache)))
+    return isadmin
+
+
+def _request_data() -> dict:
+    data = request.get_json(silent=True) or {}
+    return data if isinstance(data, dict) else {}
+
+
+def _request_token(data: dict):
+    auth = request.headers.get("Authorization", "")
+    if auth[:7].lower() == "bearer ":
+        return auth[7:].strip()
+    return request.args.get("admin_token") or data.get("admin_token")
+
+
+def request_admin_id():
+    """The acting admin's verified user id, or None.
+
+    Taken from a valid token, else from an admin_user_id that is an admin.
+    require_admin also accepts admin_mobile, and then admin_user_id is
+    unchecked, so it is never trusted as is.
+    """
+    data = _request_data()
+    uid  = verify_admin_token(_request_token(data))
+    if uid is not None:
+        return uid
+    raw = request.args.get("admin_user_id") or data.get("admin_user_id")
+    if not str(raw or "").isdigit():
+        return None
+    return int(raw) if is_admin_user(int(raw)) else None
+
+
+def require_admin():
+    """Return (error_response, status_code) if not admin, else (None, None)."""
+    data  = _request_data()
+    token = _request_token(data)
+    if token and verify_admin_token(token) is not None:
+        return None, None
+
+    admin_mobile  = request.args.get("admin_mobile")  or data.get("admin_mobile")
+    admin_user_id = request.args.get("admin_user_id") or data.get("admin_user_id")
+
+    if admin_mobile and str(admin_mobile).strip() == SUPER_ADMIN_MOBILE:
+        return None, None
+    if not admin_user_id:
+        if token:
+            return jsonify({"error": "Admin token is invalid or has expired, please log in again"}), 401
+        return jsonify({"error": "admin_token, admin_user_id or admin_mobile required"}), 401
+    try:
+        admin_user_id = int(admin_user_id)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid admin_user_id"}), 401
+    if not is_admin_user(admin_user_id):
+        return jsonify({"error": "Admin access required"}), 403
+    return None, None
@@ -2,7 +2,7 @@ from flask import Flask, request, jsonify
 import psycopg2
 from model import db,Booking,User,FeatureToggle,ReferenceData,BookingLock,AdhikMaasSubmission,AdhikMaasArea
 from Booking import create_booking
-from datetime import datetime
+from datetime import datetime, date
 from config import get_db_connection, release_db_connection,Config
 from werkzeug.security import generate_password_hash, check_password_hash
 import re
@@ -10,7 +10,11 @@ from flask_cors import CORS
 import logging
 from janmotsav import router as janmotsav_bp
 from sunday_booking import create_sunday_booking
-from adhik_maas import router as adhik_maas_bp
+from adhik_maas import router as adhik_maas_bp, _republish_finalized
+from exports import router as exports_bp
+from cache import VersionedCache, row_fingerprint
+from migrate import db_cli
+from admin_auth import issue_admin_token, require_admin
 
 # Set up basic logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -22,13 +26,22 @@ app.config.from_object(Config)
 app.register_blueprint(janmotsav_bp)
 # Register Adhik Maas Daura Seva (local JSON until DB)
 app.register_blueprint(adhik_maas_bp)
+# Background admin exports (POST /exports, GET /exports/<id>)
+app.register_blueprint(exports_bp)
 # Initialize SQLAlchemy with app
 db.init_app(app)
+# Schema migrations: `flask --app app db upgrade` / `db check-indexes`
+app.cli.add_command(db_cli)
 # Configure logging to ensure all logs are captured
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Allow browser (Chrome) and other clients: any origin for local/dev
-CORS(app, origins="*", allow_headers=["Content-Type", "Authorization"])
+CORS(
+    app,
+    origins="*",
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-Geocode-Pending", "X-Geocode-Unresolved"],
+)
 
 def validate_email(email):
     pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
@@ -160,6 +173,8 @@ def update_adhik_maas_settings():
             return jsonify({'error': f'Provide at least one of: {sorted(_ADHIK_MAAS_TOGGLES)}'}), 400
 
         db.session.commit()
+        if 'adhik_maas_2026_list_finalized' in updated:
+            _republish_finalized()
         return jsonify(updated), 200
     except Exception as e:
         db.session.rollback()
@@ -353,7 +368,7 @@ def admin_quick_register():
     Admin: create a minimal user record (quick registration).
 
     Body (JSON):
-      admin_mobile | admin_user_id  – auth
+      admin_mobile | admin_user_id  – auth (or an admin token, see admin_auth.py)
       first_name, last_name         – required
       mobile_number                 – required, 10 digits
       pincode                       – required, 6 digits (used to look up zone_code)
@@ -361,25 +376,12 @@ def admin_quick_register():
     Hardcoded: password = "123456", full_address = "Pune", city = "Pune",
                state = "Maharashtra", is_quick_registered = TRUE
     """
-    import os
-    SUPER_ADMIN_MOBILE = os.getenv("SUPER_ADMIN_MOBILE", "1234567890")
     data = request.get_json(silent=True) or {}
 
     # ── Auth ──────────────────────────────────────────────────────────────────
-    admin_mobile  = str(data.get("admin_mobile") or "").strip()
-    admin_user_id = data.get("admin_user_id")
-
-    if admin_mobile == SUPER_ADMIN_MOBILE:
-        pass
-    elif admin_user_id:
-        try:
-            admin = User.query.get(int(admin_user_id))
-        except (TypeError, ValueError):
-            return jsonify({"error": "Invalid admin_user_id"}), 401
-        if not admin or not getattr(admin, "isadmin", False):
-            return jsonify({"error": "Admin access required"}), 403
-    else:
-        return jsonify({"error": "admin_mobile or admin_user_id required"}), 401
+    err, status = require_admin()
+    if err is not None:
+        return err, status
 
     # ── Validate inputs ────────────────────────────────────────────────────────
     first_name    = str(data.get("first_name")    or "").strip()
@@ -560,30 +562,16 @@ def admin_reset_password():
     Admin: reset any user's password to a given value (default 123456).
 
     Body (JSON):
-      admin_mobile  | admin_user_id  – auth
+      admin_mobile  | admin_user_id  – auth (or an admin token, see admin_auth.py)
       mobile_number | user_id        – target user
       new_password                   – optional, defaults to "123456"
     """
-    import os
-    SUPER_ADMIN_MOBILE = os.getenv("SUPER_ADMIN_MOBILE", "1234567890")
-
     data = request.get_json(silent=True) or {}
 
     # ── Auth ──────────────────────────────────────────────────────────────────
-    admin_mobile  = str(data.get("admin_mobile") or "").strip()
-    admin_user_id = data.get("admin_user_id")
-
-    if admin_mobile == SUPER_ADMIN_MOBILE:
-        pass  # super-admin always allowed
-    elif admin_user_id:
-        try:
-            admin = User.query.get(int(admin_user_id))
-        except (TypeError, ValueError):
-            return jsonify({"error": "Invalid admin_user_id"}), 401
-        if not admin or not getattr(admin, "isadmin", False):
-            return jsonify({"error": "Admin access required"}), 403
-    else:
-        return jsonify({"error": "admin_mobile or admin_user_id required"}), 401
+    err, status = require_admin()
+    if err is not None:
+        return err, status
 
     # ── Resolve target user ────────────────────────────────────────────────────
     mobile_number = str(data.get("mobile_number") or "").strip()
@@ -903,6 +891,32 @@ def get_all_booking_users():
             release_db_connection(conn)
 
 
+# Per-year /bookings/users/by-year results (the serialised users list, or
+# None when there are none), valid while the year's fingerprint is
+# unchanged.  The bound keeps arbitrary years from growing the cache.
+_bookings_by_year_cache = VersionedCache(max_entries=32)
+
+# Changes whenever a booking of the year, or the profile of one of its
+# users, is written: inserts and deletes move count / max(id), every update
+# sets bookings.updated_date, and users.updated_at is kept by a row trigger
+# (migration 0020).  Reads only the year's rows via ix_bookings_booking_date.
+_BOOKINGS_YEAR_FINGERPRINT = """
+    SELECT count(*), max(b.id), max(b.updated_date), max(u.updated_at)
+    FROM bookings b
+    JOIN users u ON u.id = b.user_id
+    WHERE b.booking_date >= :start AND b.booking_date < :end
+"""
+
+
+def _bookings_by_year_response(year, users_json):
+    """Build the response around a cached users list; echoes year as sent."""
+    if users_json is None:
+        body = app.json.dumps({"message": f"No bookings found for year {year}"})
+        return app.response_class(body, status=404, mimetype="application/json")
+    body = '{"users": ' + users_json + ', "year": ' + app.json.dumps(year) + '}'
+    return app.response_class(body, status=200, mimetype="application/json")
+
+
 @app.route('/bookings/users/by-year', methods=['POST'])
 def get_booking_users_by_year():
     conn = None
@@ -917,16 +931,26 @@ def get_booking_users_by_year():
         year = data.get('year') if data else None
         logging.info(f"📅 Filter year received: {year}")
 
-        if not year or not str(year).isdigit():
+        if not year or not str(year).isdigit() or not 1 <= int(year) < 9999:
             logging.warning("⚠️ Invalid or missing 'year' parameter.")
             return jsonify({"error": "Valid 'year' parameter is required"}), 400
 
+        year_int = int(year)
+        version = row_fingerprint(
+            _BOOKINGS_YEAR_FINGERPRINT,
+            {"start": date(year_int, 1, 1), "end": date(year_int + 1, 1, 1)},
+        )
+        cached = _bookings_by_year_cache.get(year_int, version)
+        if cached is not None:
+            logging.info(f"✅ Serving bookings for year {year} from cache")
+            return _bookings_by_year_response(year, cached[0])
+
         # Database connection
         conn = get_db_connection()
         cursor = conn.cursor()
         logging.info("✅ Database connection established successfully.")
 
-        # SQL Query
+        # SQL Query — half-open date range so ix_bookings_booking_date is used
         query = """
             SELECT 
                 users.id, users.first_name, users.middle_name, users.last_name, 
@@ -940,18 +964,20 @@ def get_booking_users_by_year():
                 users.zone_code
             FROM users
             INNER JOIN bookings ON users.id = bookings.user_id
-            WHERE EXTRACT(YEAR FROM bookings.booking_date) = %s
+            WHERE bookings.booking_date >= %s AND bookings.booking_date < %s
             ORDER BY bookings.booking_date ASC
         """
+        params = (date(year_int, 1, 1), date(year_int + 1, 1, 1))
 
-        logging.debug(f"🧾 SQL Query: {query.strip()} | Params: {year}")
-        cursor.execute(query, (year,))
+        logging.debug(f"🧾 SQL Query: {query.strip()} | Params: {params}")
+        cursor.execute(query, params)
         result = cursor.fetchall()
         logging.info(f"✅ Query executed successfully. Rows fetched: {len(result)}")
 
         if not result:
             logging.info(f"ℹ️ No bookings found for year {year}")
-            return jsonify({"message": f"No bookings found for year {year}"}), 404
+            _bookings_by_year_cache.put(year_int, version, (None,))
+            return _bookings_by_year_response(year, None)
 
         # Process results
         users_with_bookings = {}
@@ -992,9 +1018,10 @@ def get_booking_users_by_year():
                 'user_id': user_id
             })
 
-        response_data = {'year': year, 'users': list(users_with_bookings.values())}
+        users_json = app.json.dumps(list(users_with_bookings.values()))
+        _bookings_by_year_cache.put(year_int, version, (users_json,))
         logging.info(f"✅ Returning {len(users_with_bookings)} users for year {year}")
-        return jsonify(response_data), 200
+        return _bookings_by_year_response(year, users_json)
 
     except psycopg2.DatabaseError as db_err:
         logging.exception(f"❌ Database error: {str(db_err)}")
@@ -1453,26 +1480,31 @@ def login():
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Query the user by mobile_number — also fetch zone_code, force_password_change, is_quick_registered
+        # Query the user by mobile_number — also fetch zone_code, force_password_change, is_quick_registered, isadmin
         cursor.execute(
-            "SELECT id, password, zone_code, force_password_change, is_quick_registered FROM users WHERE mobile_number = %s",
+            "SELECT id, password, zone_code, force_password_change, is_quick_registered, isadmin FROM users WHERE mobile_number = %s",
             (mobile_number,)
         )
         user = cursor.fetchone()
 
         if user:
-            user_id, stored_password, zone_code, force_pwd_change, is_quick_reg = user
+            user_id, stored_password, zone_code, force_pwd_change, is_quick_reg, isadmin = user
 
             # Verify the password
             if stored_password == password:
-                return jsonify({
+                response = {
                     "message": "Login successful",
                     "user_id": user_id,
                     "zone_code": zone_code or "",
                     "force_password_change": bool(force_pwd_change),
                     # NULL for legacy users → treat as False
                     "is_quick_registered": bool(is_quick_reg) if is_quick_reg is not None else False,
-                }), 200
+                }
+                # Admins send this back as "Authorization: Bearer <token>"
+                admin_token = issue_admin_token(user_id) if isadmin else None
+                if admin_token:
+                    response["admin_token"] = admin_token
+                return jsonify(response), 200
             else:
                 return jsonify({"error": "Invalid password"}), 401
         else:
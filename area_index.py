@@ -0,0 +1,82 @@
+"""
+Immutable in-memory index of the active Adhik Maas areas.
+
+Built once per 'adhik_maas_areas' version stamp from the whole
+adhik_maas_areas table (a few hundred rows) and then only read, so request
+threads share it without locking:
+
+  by_name    lower-cased area name -> area info (validation / enrichment)
+  by_pin     pin code -> row positions
+  search()   substring match on name or pin through an n-gram index of
+             every 1-, 2- and 3-character gram, verified on the few
+             candidates the index returns
+  routes()   the /adhik-maas/areas "routes" grouping for any subset
+"""
+
+from collections import OrderedDict
+
+_MAX_GRAM = 3
+
+
+def _grams(text: str, n: int):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class AreaIndex:
+
+    def __init__(self, rows):
+        # rows come ordered by (route_number, sort_order)
+        self.areas = [
+            {
+                "area_name":    r.area_name,
+                "route_number": r.route_number,
+                "route_name":   r.route_name,
+                "pin_code":     r.pin_code,
+            }
+            for r in rows
+        ]
+        self.by_name = {a["area_name"].lower(): a for a in self.areas}
+        self.by_pin: dict = {}
+        self._grams: dict = {}
+        self._haystack = []
+        for pos, a in enumerate(self.areas):
+            self.by_pin.setdefault(a["pin_code"], []).append(pos)
+            hay = (a["area_name"].lower(), a["pin_code"] or "")
+            self._haystack.append(hay)
+            for field in hay:
+                for n in range(1, _MAX_GRAM + 1):
+                    for g in _grams(field, n):
+                        self._grams.setdefault(g, set()).add(pos)
+        self.all_positions = list(range(len(self.areas)))
+
+    def search(self, q: str, positions=None) -> list:
+        """Positions whose name or pin contains q (case-insensitive), in order."""
+        q = q.lower()
+        if len(q) <= _MAX_GRAM:
+            candidates = self._grams.get(q, set())
+        else:
+            grams = [self._grams.get(g, set()) for g in _grams(q, _MAX_GRAM)]
+            candidates = set.intersection(*grams) if grams else set()
+        if positions is not None:
+            candidates = candidates.intersection(positions)
+        return sorted(
+            p for p in candidates
+            if q in self._haystack[p][0] or q in self._haystack[p][1]
+        )
+
+    def routes(self, positions) -> list:
+        route_map: OrderedDict = OrderedDict()
+        for p in positions:
+            a = self.areas[p]
+            key = a["route_number"]
+            if key not in route_map:
+                route_map[key] = {"route_number": a["route_number"], "route_name": a["route_name"], "areas": []}
+            route_map[key]["areas"].append({"area_name": a["area_name"], "pin_code": a["pin_code"]})
+        return list(route_map.values())
+
+    def response(self, positions) -> dict:
+        """The /adhik-maas/areas payload for the given positions."""
+        return {
+            "routes": self.routes(positions),
+            "flat":   [self.areas[p]["area_name"] for p in positions],
+        }
@@ -0,0 +1,89 @@
+"""
+In-process caches keyed on data version stamps.
+
+Every table whose derived results we cache has a row in ``data_versions``
+that a statement-level trigger bumps on INSERT / UPDATE / DELETE (see
+migrations/0001_bookings_year_indexes.sql).  A cached value stays valid for
+as long as the version it was built from is still current, so the gunicorn
+workers never serve each other stale data and a cache hit costs one
+primary-key read instead of the full query.
+"""
+
+import threading
+import time
+
+from sqlalchemy import text
+
+from model import db
+
+_memo: dict = {}
+_memo_lock = threading.Lock()
+
+
+def data_version(name: str, max_age: float = 0) -> int:
+    """
+    Return the current version stamp for ``name`` (0 if never bumped).
+
+    With ``max_age`` the stamp read by this process is reused for that many
+    seconds, so a hot public endpoint costs no query at all and may serve
+    data up to ``max_age`` seconds stale.
+    """
+    if max_age:
+        with _memo_lock:
+            hit = _memo.get(name)
+        if hit is not None and time.monotonic() - hit[0] < max_age:
+            return hit[1]
+    row = db.session.execute(
+        text("SELECT version FROM data_versions WHERE name = :name"),
+        {"name": name},
+    ).first()
+    version = row[0] if row else 0
+    with _memo_lock:
+        _memo[name] = (time.monotonic(), version)
+    return version
+
+
+def row_fingerprint(sql: str, params=None) -> list:
+    """
+    Version stamp computed from the rows themselves (e.g. count(*) plus
+    max(updated_at)), for tables too write-heavy for a data_versions
+    trigger: a shared stamp row would serialise every write to them.
+    """
+    row = db.session.execute(text(sql), params or {}).first()
+    return [str(v) for v in row]
+
+
+class VersionedCache:
+    """
+    Thread-safe ``key -> (version, value)`` map.
+
+    ``get`` returns ``None`` unless the entry was stored under ``version``.
+    Entries stored with ``version=None`` are frozen: they describe data that
+    can no longer change (e.g. a past year) and are returned for any version.
+    With ``max_entries`` the least recently stored entries are dropped first,
+    for caches whose keys come from request parameters.
+    """
+
+    def __init__(self, max_entries: int = 0):
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_version, value = entry
+        if stored_version is None or stored_version == version:
+            return value
+        return None
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (version, value)
+            # Oldest first: dicts keep insertion order.
+            while self._max_entries and len(self._entries) > self._max_entries:
+                self._entries.pop(next(iter(self._entries)))
+        return value
@@ -0,0 +1,73 @@
+"""
+Streaming CSV / XLSX writers for admin exports.
+
+Both writers take an iterable of row lists, so callers can feed them
+straight from a server-side cursor and memory stays bounded by one row
+(CSV) or by openpyxl's write-only buffer (XLSX) instead of by the size of
+the export.
+"""
+
+import csv
+import io
+import itertools
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Column widths are estimated from this many leading rows, not the whole file.
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 55
+
+
+def csv_stream(columns, rows):
+    """Yield a UTF-8 CSV (with BOM, so Excel opens it cleanly) line by line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def _line(values):
+        writer.writerow(values)
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    yield "\ufeff" + _line(columns)
+    for row in rows:
+        yield _line(row)
+
+
+def write_xlsx(fileobj, sheet_name, columns, rows):
+    """
+    Write rows to fileobj as a single-sheet XLSX using openpyxl write-only mode.
+
+    Write-only sheets cannot be resized after rows are appended, so widths
+    are estimated from the first WIDTH_SAMPLE_ROWS rows before writing.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    rows = iter(rows)
+    sample = list(itertools.islice(rows, WIDTH_SAMPLE_ROWS))
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name[:31])
+    for i, title in enumerate(columns):
+        width = max(
+            [len(str(title))] + [len(str(r[i] if r[i] is not None else "")) for r in sample]
+        )
+        ws.column_dimensions[get_column_letter(i + 1)].width = min(width + 4, MAX_COLUMN_WIDTH)
+
+    header_font  = Font(bold=True, color="FFFFFF")
+    header_fill  = PatternFill("solid", fgColor="F15700")
+    header_align = Alignment(horizontal="center")
+    header = []
+    for title in columns:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font, cell.fill, cell.alignment = header_font, header_fill, header_align
+        header.append(cell)
+    ws.append(header)
+
+    for row in itertools.chain(sample, rows):
+        ws.append(row)
+    wb.save(fileobj)
@@ -0,0 +1,419 @@
+"""
+Background admin exports.
+
+Endpoints
+─────────
+  POST /exports          create (or reuse) an export job
+  GET  /exports/<id>     job status while rendering, then the file itself
+
+Rendering happens on a small thread pool in the process that accepted the
+job, into Config.EXPORT_DIR on local disk, so a large export never holds a
+request thread for longer than it takes to insert one row.  Job state
+lives in export_jobs, so any worker on the host can answer the status poll.
+
+A rendering job touches its updated_at every HEARTBEAT_SECONDS.  A queued
+or running job untouched for Config.EXPORT_STALE_SECONDS belonged to a
+worker that restarted or died; it is marked failed instead of being reused.
+
+A job's cache_key hashes its type, its parameters and a stamp of every
+table it reads.  An identical request within Config.EXPORT_TTL_SECONDS
+reuses the existing artefact as long as none of those tables has been
+written since.  Low-write tables use their data_versions stamp; the
+high-write bookings, users and janmotsav_attendance tables carry no
+version trigger (a shared stamp row would serialise every write to them),
+so they are fingerprinted from their own rows instead.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from flask import Blueprint, current_app, jsonify, request, send_file
+from sqlalchemy import text
+
+from adhik_maas import EXPORT_COLUMNS, _require_admin, export_rows
+from admin_auth import request_admin_id
+from cache import data_version, row_fingerprint
+from config import Config
+from export_writers import XLSX_MIMETYPE, csv_stream, write_xlsx
+from model import db, ExportJob
+
+router = Blueprint("exports", __name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export")
+
+HEARTBEAT_SECONDS = 30
+
+
+# ─── Export types ─────────────────────────────────────────────────────────────
+#
+# Each renderer takes the validated params and returns (columns, rows,
+# filename stem).  rows is an iterator, fed straight from a server-side cursor.
+
+def _stream(sql, params):
+    return db.session.execute(text(sql), params, execution_options={"yield_per": 500})
+
+
+def _adhik_maas_submissions(params):
+    status = params.get("status", "all")
+    rows = export_rows(status, params.get("search", ""))
+    return EXPORT_COLUMNS, rows, f"adhik_maas_{status}"
+
+
+_BOOKING_COLUMNS = [
+    "Booking ID", "Booking Date", "Mahaprasad", "Active", "Created At",
+    "Name", "Mobile", "Alternate Mobile", "Email", "Zone", "Address",
+    "Area", "City", "Pincode", "Family Code",
+]
+
+
+def _bookings_by_year(params):
+    year = params["year"]
+    result = _stream("""
+        SELECT b.id, b.booking_date, b.mahaprasad, b.is_active, b.created_at,
+               concat_ws(' ', u.first_name, u.middle_name, u.last_name),
+               u.mobile_number, u.alternate_mobile_number, u.email, u.zone_code,
+               concat_ws(', ', u.flat_no, u.full_address, u.landmark),
+               u.area, u.city, u.pincode, u.unique_family_code
+        FROM bookings b
+        JOIN users u ON u.id = b.user_id
+        WHERE b.booking_date >= :start AND b.booking_date < :end
+        ORDER BY b.booking_date, b.id
+    """, {"start": date(year, 1, 1), "end": date(year + 1, 1, 1)})
+    rows = (
+        [r[0], r[1].isoformat() if r[1] else "", "Yes" if r[2] else "No",
+         "Yes" if r[3] else "No", r[4].strftime("%d %b %Y %H:%M") if r[4] else "",
+         *r[5:]]
+        for r in result
+    )
+    return _BOOKING_COLUMNS, rows, f"bookings_{year}"
+
+
+_USER_COLUMNS = [
+    "ID", "Name", "Mobile", "Alternate Mobile", "Email", "Gender", "Anugrahit",
+    "Zone", "Address", "Area", "City", "State", "Pincode", "Family Code", "Admin",
+]
+
+
+def _users(params):
+    result = _stream("""
+        SELECT id, concat_ws(' ', first_name, middle_name, last_name),
+               mobile_number, alternate_mobile_number, email, gender, anugrahit,
+               zone_code, concat_ws(', ', flat_no, full_address, landmark),
+               area, city, state, pincode, unique_family_code, isadmin
+        FROM users
+        ORDER BY id
+    """, {})
+    rows = ([*r[:-1], "Yes" if r[-1] else "No"] for r in result)
+    return _USER_COLUMNS, rows, "users"
+
+
+_ATTENDANCE_COLUMNS = [
+    "Date", "Name", "Mobile", "Zone", "Breakfast", "Lunch", "Evening Snacks", "Dinner",
+]
+
+
+def _janmotsav_attendance(params):
+    year_id = params["year_id"]
+    result = _stream("""
+        SELECT d.event_date, concat_ws(' ', u.first_name, u.middle_name, u.last_name),
+               u.mobile_number, u.zone_code,
+               a.breakfast_count, a.lunch_count, a.evesnacks_count, a.dinner_count
+        FROM janmotsav_attendance a
+        JOIN janmotsav_days d ON d.id = a.day_id
+        JOIN users u ON u.id = a.user_id
+        WHERE a.year_id = :year_id AND a.is_deleted = FALSE
+        ORDER BY d.event_date, u.first_name, u.last_name, a.id
+    """, {"year_id": year_id})
+    rows = ([r[0].isoformat() if r[0] else "", *r[1:]] for r in result)
+    return _ATTENDANCE_COLUMNS, rows, f"janmotsav_attendance_{year_id}"
+
+
+# Tables without a data_versions trigger: name -> fingerprint query.
+# janmotsav_attendance is only ever soft-deleted and every save sets
+# updated_at; users.updated_at is set per row by a trigger (migration 0020).
+# max(updated_at) is an index read; count(*) catches deletes.
+# bookings is scoped to the exported year (every update sets updated_date).
+_FINGERPRINTS = {
+    "janmotsav_attendance": "SELECT count(*), max(updated_at) FROM janmotsav_attendance",
+    "users":                "SELECT count(*), max(updated_at) FROM users",
+    "bookings":             "SELECT count(*), max(id), max(updated_date) FROM bookings "
+                            "WHERE booking_date >= :start AND booking_date < :end",
+}
+
+
+def _table_stamp(name, params):
+    """Changes whenever the rows of table name an export reads are written."""
+    sql = _FINGERPRINTS.get(name)
+    if sql is None:
+        return data_version(name)
+    if name == "bookings":
+        year = params["year"]
+        return row_fingerprint(sql, {"start": date(year, 1, 1), "end": date(year + 1, 1, 1)})
+    return row_fingerprint(sql)
+
+
+# type -> (renderer, tables it reads)
+EXPORT_TYPES = {
+    "adhik-maas-submissions": (_adhik_maas_submissions, ("adhik_maas_submissions", "users")),
+    "bookings-by-year":       (_bookings_by_year,       ("bookings", "users")),
+    "users":                  (_users,                  ("users",)),
+    "janmotsav-attendance":   (_janmotsav_attendance,   ("janmotsav_attendance", "janmotsav_config", "users")),
+}
+
+
+def _validate_params(export_type, raw):
+    """Return (params, error message)."""
+    raw = raw if isinstance(raw, dict) else {}
+    if export_type == "adhik-maas-submissions":
+        status = str(raw.get("status") or "all").lower()
+        if status not in ("all", "shortlisted", "finalized"):
+            return None, "status must be all, shortlisted or finalized"
+        return {"status": status, "search": str(raw.get("search") or "").strip()}, None
+    if export_type == "bookings-by-year":
+        try:
+            year = int(raw.get("year"))
+        except (TypeError, ValueError):
+            return None, "year is required"
+        if not 1 <= year < 9999:
+            return None, "year is out of range"
+        return {"year": year}, None
+    if export_type == "janmotsav-attendance":
+        try:
+            return {"year_id": int(raw.get("year_id"))}, None
+        except (TypeError, ValueError):
+            return None, "year_id is required"
+    return {}, None
+
+
+# ─── Worker ───────────────────────────────────────────────────────────────────
+
+def _heartbeat(job_id):
+    """Touch a running job's updated_at on its own connection.
+
+    The render session is mid-way through a server-side cursor, which a
+    commit on that session would close.
+    """
+    with db.engine.begin() as conn:
+        conn.execute(
+            text("UPDATE export_jobs SET updated_at = now() WHERE id = :id"),
+            {"id": job_id},
+        )
+
+
+def _render(app, job_id):
+    """Render one job to EXPORT_DIR and record the outcome."""
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if job is None or job.status != "queued":
+            # Gone, or given up on as stale while it waited in the queue
+            return
+        job.status     = "running"
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+
+        params = json.loads(job.params)
+        fmt    = params.pop("format", "csv")
+        path   = None
+        try:
+            renderer, _ = EXPORT_TYPES[job.export_type]
+            columns, rows, stem = renderer(params)
+
+            counted = [0]
+            beat    = [time.monotonic()]
+
+            def _counting(it):
+                for row in it:
+                    counted[0] += 1
+                    if time.monotonic() - beat[0] >= HEARTBEAT_SECONDS:
+                        _heartbeat(job_id)
+                        beat[0] = time.monotonic()
+                    yield row
+
+            os.makedirs(Config.EXPORT_DIR, exist_ok=True)
+            path = os.path.join(Config.EXPORT_DIR, f"{job.id}.{fmt}")
+            if fmt == "xlsx":
+                with open(path, "wb") as f:
+                    write_xlsx(f, stem, columns, _counting(rows))
+                job.mimetype = XLSX_MIMETYPE
+            else:
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    for chunk in csv_stream(columns, _counting(rows)):
+                        f.write(chunk)
+                job.mimetype = "text/csv; charset=utf-8"
+
+            job.file_path   = path
+            job.filename    = f"{stem}_{datetime.utcnow():%Y-%m-%d}.{fmt}"
+            job.row_count   = counted[0]
+            job.status      = "done"
+            job.finished_at = job.updated_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            logging.exception("export %s failed: %s", job_id, e)
+            db.session.rollback()
+            if path and os.path.exists(path):
+                os.remove(path)
+            job = db.session.get(ExportJob, job_id)
+            job.status      = "failed"
+            job.error       = str(e)[:500]
+            job.finished_at = job.updated_at = datetime.utcnow()
+            db.session.commit()
+
+
+def _purge_expired():
+    """Delete files and rows of jobs past their expiry."""
+    expired = ExportJob.query.filter(ExportJob.expires_at < datetime.utcnow()).all()
+    for job in expired:
+        if job.file_path and os.path.exists(job.file_path):
+            try:
+                os.remove(job.file_path)
+            except OSError as e:
+                logging.warning("Could not remove export file %s: %s", job.file_path, e)
+        db.session.delete(job)
+    if expired:
+        db.session.commit()
+
+
+def _fail_stale_jobs():
+    """Mark queued / running jobs without a recent heartbeat as failed."""
+    now = datetime.utcnow()
+    db.session.execute(
+        text("""
+            UPDATE export_jobs
+               SET status = 'failed',
+                   error = 'Export worker stopped before finishing',
+                   finished_at = :now, updated_at = :now
+             WHERE status IN ('queued', 'running') AND updated_at < :cutoff
+        """),
+        {"now": now, "cutoff": now - timedelta(seconds=Config.EXPORT_STALE_SECONDS)},
+    )
+    db.session.commit()
+
+
+def _job_dict(job, reused=False):
+    return {
+        "id":          job.id,
+        "type":        job.export_type,
+        "status":      job.status,
+        "row_count":   job.row_count,
+        "error":       job.error,
+        "created_at":  job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "expires_at":  job.expires_at.isoformat() if job.expires_at else None,
+        "reused":      reused,
+    }
+
+
+# ─── Endpoints ────────────────────────────────────────────────────────────────
+
+@router.route("/exports", methods=["POST"])
+def create_export():
+    """
+    [Admin] Queue an export.
+
+    Body: { "type": "adhik-maas-submissions" | "bookings-by-year" | "users"
+                    | "janmotsav-attendance",
+            "format": "csv" | "xlsx",
+            "params": { ... type-specific ... },
+            "admin_user_id" | "admin_mobile": ... }   (or an admin token)
+
+    202 with the new job, or 200 with an existing job when an identical
+    export of unchanged data is still cached.
+    """
+    err, status = _require_admin()
+    if err is not None:
+        return err, status
+
+    data = request.get_json(silent=True) or {}
+    export_type = data.get("type")
+    if export_type not in EXPORT_TYPES:
+        return jsonify({"error": f"type must be one of {', '.join(EXPORT_TYPES)}"}), 400
+    fmt = str(data.get("format") or "csv").lower()
+    if fmt not in ("csv", "xlsx"):
+        return jsonify({"error": "format must be csv or xlsx"}), 400
+    params, message = _validate_params(export_type, data.get("params"))
+    if message:
+        return jsonify({"error": message}), 400
+    params["format"] = fmt
+
+    try:
+        _purge_expired()
+        _fail_stale_jobs()
+
+        _, version_names = EXPORT_TYPES[export_type]
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        versions  = [_table_stamp(name, params) for name in version_names]
+        cache_key = hashlib.sha1(
+            json.dumps([export_type, canonical, versions]).encode()
+        ).hexdigest()
+
+        existing = (
+            ExportJob.query
+            .filter(
+                ExportJob.cache_key == cache_key,
+                ExportJob.status.in_(("queued", "running", "done")),
+                ExportJob.expires_at > datetime.utcnow(),
+            )
+            .order_by(ExportJob.created_at.desc())
+            .first()
+        )
+        if existing is not None and (
+            existing.status != "done" or (existing.file_path and os.path.exists(existing.file_path))
+        ):
+            return jsonify(_job_dict(existing, reused=True)), 200
+
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            export_type=export_type,
+            params=canonical,
+            cache_key=cache_key,
+            status="queued",
+            requested_by=request_admin_id(),
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(seconds=Config.EXPORT_TTL_SECONDS),
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        _executor.submit(_render, current_app._get_current_object(), job.id)
+        return jsonify(_job_dict(job)), 202
+    except Exception as e:
+        db.session.rollback()
+        logging.exception("create_export error: %s", e)
+        return jsonify({"error": "Failed to create export"}), 500
+
+
+@router.route("/exports/<job_id>", methods=["GET"])
+def get_export(job_id):
+    """
+    [Admin] Poll an export job.
+
+    queued / running -> 202 with the job status
+    failed           -> 500 with the error
+    done             -> the file as an attachment (410 once it has expired)
+    """
+    err, status = _require_admin()
+    if err is not None:
+        return err, status
+
+    job = db.session.get(ExportJob, job_id)
+    if job is None:
+        return jsonify({"error": "Export not found"}), 404
+    if job.status in ("queued", "running"):
+        return jsonify(_job_dict(job)), 202
+    if job.status == "failed":
+        return jsonify(_job_dict(job)), 500
+    if job.expires_at < datetime.utcnow() or not job.file_path or not os.path.exists(job.file_path):
+        return jsonify({"error": "Export has expired, please request it again"}), 410
+    return send_file(
+        job.file_path,
+        mimetype=job.mimetype,
+        as_attachment=True,
+        download_name=job.filename,
+    )
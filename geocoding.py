@@ -0,0 +1,388 @@
+"""
+Background geocoding for the Adhik Maas map.
+
+/adhik-maas/map-data never talks to the network.  Users who have a
+submission but no coordinates form the queue (it lives in the database, so
+every gunicorn worker sees the same one); a single background thread per
+process drains it, and a session-level advisory lock makes sure only one
+process across the deployment is calling the geocoder at a time, which
+keeps us inside Nominatim's one-request-per-second policy.
+
+Every lookup, hit or miss, is stored in geocode_cache under the normalised
+address, so a household that re-registers or shares an address with a
+neighbour costs no network call.  A user with no address, or whose address
+the geocoder could not find, is recorded in geocode_unresolved and leaves
+the queue until their full_address changes.
+
+Until then the map places a household at its pincode centroid (see the
+pincode_centroids section below), which never needs the network.
+
+The geocoder is pluggable via the GEOCODER environment variable:
+  nominatim (default)   geopy's Nominatim client, rate limited
+  stub                  no network; resolves nothing (tests / offline dev)
+
+  flask --app app adhik_maas geocode-backfill [--limit N]
+runs the same loop synchronously in the foreground.
+"""
+
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+
+import psycopg2
+
+from cache import VersionedCache, data_version
+
+GEOCODE_LOCK = "adhik_maas_geocode"
+BATCH_SIZE = 50
+
+
+def normalise_address(address) -> str:
+    """Case-, punctuation- and whitespace-insensitive cache key for an address."""
+    text = re.sub(r"[\s,;]+", " ", str(address or "")).strip().lower()
+    return text[:500]
+
+
+# ─── Geocoders ────────────────────────────────────────────────────────────────
+
+class NominatimGeocoder:
+    """geopy Nominatim client shared across lookups, at most one call per 1.1s."""
+
+    def __init__(self, user_agent="upasana-adhik-maas", min_delay_seconds=1.1):
+        from geopy.geocoders import Nominatim
+        from geopy.extra.rate_limiter import RateLimiter
+        self._geocode = RateLimiter(
+            Nominatim(user_agent=user_agent, timeout=10).geocode,
+            min_delay_seconds=min_delay_seconds,
+        )
+
+    def geocode(self, address):
+        """Return (lat, lon) or (None, None)."""
+        location = self._geocode(address)
+        if location and location.latitude is not None:
+            return float(location.latitude), float(location.longitude)
+        return None, None
+
+
+class StubGeocoder:
+    """Offline geocoder: answers from a fixed {normalised address: (lat, lon)} map."""
+
+    def __init__(self, known=None):
+        self._known = {normalise_address(k): v for k, v in (known or {}).items()}
+
+    def geocode(self, address):
+        return self._known.get(normalise_address(address), (None, None))
+
+
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder():
+    """The process-wide geocoder selected by GEOCODER."""
+    global _geocoder
+    with _geocoder_lock:
+        if _geocoder is None:
+            kind = os.getenv("GEOCODER", "nominatim").strip().lower()
+            _geocoder = StubGeocoder() if kind == "stub" else NominatimGeocoder()
+        return _geocoder
+
+
+def set_geocoder(geocoder):
+    """Replace the process-wide geocoder (e.g. with a StubGeocoder in tests)."""
+    global _geocoder
+    with _geocoder_lock:
+        _geocoder = geocoder
+
+
+# ─── Cache + queue ────────────────────────────────────────────────────────────
+
+def cached_statuses(keys) -> dict:
+    """Return {address_key: GeocodeCache} for the given keys in one query."""
+    from model import GeocodeCache
+    keys = list({k for k in keys if k})
+    if not keys:
+        return {}
+    rows = GeocodeCache.query.filter(GeocodeCache.address_key.in_(keys)).all()
+    return {r.address_key: r for r in rows}
+
+
+def _pending_users(after_id: int, limit: int):
+    """
+    Users with a submission and no coordinates, in id order after after_id,
+    except those recorded unresolved for their current address.
+    """
+    from model import db, User, AdhikMaasSubmission, GeocodeUnresolved
+    given_up = (
+        db.session.query(GeocodeUnresolved.user_id)
+        .filter(
+            GeocodeUnresolved.user_id == User.id,
+            GeocodeUnresolved.full_address.isnot_distinct_from(User.full_address),
+        )
+        .exists()
+    )
+    return (
+        db.session.query(User.id, User.full_address)
+        .join(AdhikMaasSubmission, AdhikMaasSubmission.user_id == User.id)
+        .filter(
+            (User.latitude.is_(None)) | (User.longitude.is_(None)),
+            User.id > after_id,
+            ~given_up,
+        )
+        .order_by(User.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def _resolve(key: str, address: str, cache: dict, geocoder):
+    """Return (lat, lon) for key from the cache or the geocoder, recording the result."""
+    from model import db, GeocodeCache
+    hit = cache.get(key)
+    if hit is not None:
+        if hit.status == "ok":
+            return float(hit.latitude), float(hit.longitude)
+        return None, None
+
+    try:
+        lat, lon = geocoder.geocode(address)
+    except Exception as e:
+        # Network trouble: leave it uncached so the next run retries.
+        logging.warning("Geocode failed for %s: %s", address[:50], e)
+        return None, None
+
+    entry = GeocodeCache(
+        address_key=key,
+        latitude=lat,
+        longitude=lon,
+        status="ok" if lat is not None else "not_found",
+        updated_at=datetime.utcnow(),
+    )
+    db.session.merge(entry)
+    cache[key] = entry
+    return lat, lon
+
+
+def _mark_unresolved(user_id: int, address, reason: str):
+    """Take user_id out of the queue until their address changes."""
+    from model import db, GeocodeUnresolved
+    db.session.merge(GeocodeUnresolved(
+        user_id=user_id,
+        full_address=address,
+        reason=reason,
+        recorded_at=datetime.utcnow(),
+    ))
+
+
+def is_unresolved(key: str, cache: dict) -> bool:
+    """True when an address key can never resolve: empty, or cached not_found."""
+    if not key:
+        return True
+    hit = cache.get(key)
+    return hit is not None and hit.status == "not_found"
+
+
+def run_backfill(limit=None, geocoder=None) -> dict:
+    """
+    Geocode every queued user once (or at most ``limit`` of them).
+
+    Must run inside an app context.  Returns counts of what happened.
+    """
+    from model import db, User
+    geocoder = geocoder or get_geocoder()
+    stats = {"resolved": 0, "unresolved": 0}
+    after_id = 0
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        batch = _pending_users(after_id, BATCH_SIZE if remaining is None else min(BATCH_SIZE, remaining))
+        if not batch:
+            break
+        keyed = [(uid, normalise_address(addr), addr) for uid, addr in batch]
+        cache = cached_statuses(k for _, k, _ in keyed)
+        for user_id, key, address in keyed:
+            after_id = user_id
+            if not key:
+                _mark_unresolved(user_id, address, "no_address")
+                stats["unresolved"] += 1
+                db.session.commit()
+                continue
+            lat, lon = _resolve(key, address, cache, geocoder)
+            if lat is None:
+                # A network error leaves no cache entry, so that user is retried.
+                if is_unresolved(key, cache):
+                    _mark_unresolved(user_id, address, "not_found")
+                stats["unresolved"] += 1
+            else:
+                User.query.filter_by(id=user_id).update({"latitude": lat, "longitude": lon})
+                stats["resolved"] += 1
+            db.session.commit()
+        if remaining is not None:
+            remaining -= len(batch)
+    return stats
+
+
+# ─── Background worker ────────────────────────────────────────────────────────
+
+class GeocodeWorker:
+    """
+    One daemon thread per process, started on demand by wake().
+
+    The thread takes a session-level advisory lock on its own connection;
+    if another process already holds it, this one simply exits and leaves
+    the queue to that process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._rerun = False
+
+    def wake(self, app):
+        with self._lock:
+            if self._thread is not None:
+                self._rerun = True
+                return
+            self._thread = threading.Thread(
+                target=self._run, args=(app,), name="adhik-maas-geocode", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, app):
+        from config import Config
+        try:
+            conn = psycopg2.connect(Config.CONNECTION_POOL_URI)
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", (GEOCODE_LOCK,))
+                    if not cursor.fetchone()[0]:
+                        return
+                while True:
+                    with self._lock:
+                        self._rerun = False
+                    with app.app_context():
+                        if run_backfill()["resolved"]:
+                            refresh_centroids_from_users()
+                    with self._lock:
+                        if not self._rerun:
+                            break
+            finally:
+                conn.close()   # releases the advisory lock
+        except Exception as e:
+            logging.warning("adhik maas geocode worker error: %s", e)
+        finally:
+            with self._lock:
+                self._thread = None
+
+
+worker = GeocodeWorker()
+
+
+# ─── Pincode centroids (offline tier) ─────────────────────────────────────────
+#
+# pincode_centroids maps every pincode we serve (AdhikMaasArea.pin_code and
+# the zone table) to an approximate centre.  It is seeded from the mean of
+# the already-geocoded users in that pincode, falling back to one geocoder
+# call per pincode, so the map can place a household immediately and let
+# the worker above refine it later.  The table is tiny, so each process
+# holds it in memory and reloads it only when its version stamp moves.
+
+def normalise_pincode(pincode) -> str:
+    return re.sub(r"\D", "", str(pincode or ""))[:10]
+
+
+def refresh_centroids_from_users():
+    """Recompute user-derived centroids from geocoded users (one statement)."""
+    from model import db
+    from sqlalchemy import text
+    db.session.execute(text("""
+        INSERT INTO pincode_centroids (pincode, latitude, longitude, source, updated_at)
+        SELECT regexp_replace(pincode, '\\D', '', 'g'), avg(latitude), avg(longitude), 'users', now()
+        FROM users
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+          AND regexp_replace(pincode, '\\D', '', 'g') <> ''
+        GROUP BY regexp_replace(pincode, '\\D', '', 'g')
+        ON CONFLICT (pincode) DO UPDATE
+            SET latitude   = EXCLUDED.latitude,
+                longitude  = EXCLUDED.longitude,
+                source     = 'users',
+                updated_at = now()
+            WHERE pincode_centroids.latitude  IS DISTINCT FROM EXCLUDED.latitude
+               OR pincode_centroids.longitude IS DISTINCT FROM EXCLUDED.longitude
+    """))
+    db.session.commit()
+
+
+def seed_centroids(geocoder=None) -> dict:
+    """
+    Make sure every AdhikMaasArea / zone pincode has a centroid.
+
+    User-derived centroids are refreshed first; pincodes still missing are
+    geocoded once by name.  Must run inside an app context.
+    """
+    from model import db, AdhikMaasArea, Zone, PincodeCentroid
+    refresh_centroids_from_users()
+
+    names = {}
+    for pin, name in db.session.query(Zone.pincode, Zone.area_name):
+        names.setdefault(normalise_pincode(pin), name)
+    for pin, name in db.session.query(AdhikMaasArea.pin_code, AdhikMaasArea.area_name):
+        names[normalise_pincode(pin)] = name
+    names.pop("", None)
+
+    known = {pin for (pin,) in db.session.query(PincodeCentroid.pincode)}
+    geocoder = geocoder or get_geocoder()
+    stats = {"existing": len(known & set(names)), "geocoded": 0, "missing": 0}
+    for pin, name in sorted(names.items()):
+        if pin in known:
+            continue
+        try:
+            lat, lon = geocoder.geocode(f"{name}, {pin}, India")
+        except Exception as e:
+            logging.warning("Centroid geocode failed for %s: %s", pin, e)
+            lat = lon = None
+        if lat is None:
+            stats["missing"] += 1
+            continue
+        db.session.merge(PincodeCentroid(
+            pincode=pin, area_name=name, latitude=lat, longitude=lon,
+            source="geocoder", updated_at=datetime.utcnow(),
+        ))
+        db.session.commit()
+        stats["geocoded"] += 1
+    return stats
+
+
+class CentroidIndex:
+    """Immutable in-memory pincode -> (lat, lon) map."""
+
+    def __init__(self, rows):
+        self._by_pin = {
+            r.pincode: (float(r.latitude), float(r.longitude))
+            for r in rows
+            if r.latitude is not None and r.longitude is not None
+        }
+
+    def lookup(self, *pincodes):
+        """(lat, lon) of the first pincode with a centroid, else None."""
+        for pin in pincodes:
+            hit = self._by_pin.get(normalise_pincode(pin))
+            if hit is not None:
+                return hit
+        return None
+
+
+_centroids = VersionedCache()
+
+
+def centroid_index() -> CentroidIndex:
+    """The current CentroidIndex, reloaded when pincode_centroids changes."""
+    from model import PincodeCentroid
+    version = data_version("pincode_centroids")
+    index = _centroids.get("index", version)
+    if index is None:
+        index = _centroids.put("index", version, CentroidIndex(PincodeCentroid.query.all()))
+    return index
@@ -1,4 +1,15 @@
 # gunicorn_config.py
+import os
+
 bind = "0.0.0.0:5000"
 workers = 4
-timeout = 120
\ No newline at end of file
+# Threaded workers so long-lived SSE streams (/janmotsav/attendance/summary/stream)
+# occupy a thread instead of a whole worker process.  Each open stream holds
+# one thread for as long as the client stays connected, so janmotsav_live
+# caps them at JANMOTSAV_MAX_STREAMS (default 8) per process; the remaining
+# threads (at least 8) always stay free for ordinary API requests.  Raise
+# both together if more live viewers are needed.  Set GUNICORN_THREADS in the
+# environment: config.py reads it too, to size the SQLAlchemy pool.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+timeout = 120
@@ -1,74 +1,290 @@
-from flask import Blueprint, request, jsonify
+import hashlib
+import json
+import queue
+from collections import namedtuple
+import click
+from flask import Blueprint, Response, current_app, request, jsonify
 from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import janmotsav_live
+from cache import VersionedCache, data_version
 from model import (
     db,
     JanmotsavYear,
     JanmotsavDay,
     JanmotsavAttendance,
+    JanmotsavMealTotal,
     SevaNidhiPayment
 )
 
 router = Blueprint("janmotsav", __name__)
 
 # ==========================================================
-# GET CURRENT CONFIG
+# CURRENT YEAR (CACHED)
 # ==========================================================
-@router.get("/janmotsav/config/current")
-def get_current_config():
+# The current year and its days change a handful of times a year but are read
+# by every user opening the Janmotsav screen, so the config is rendered once
+# per janmotsav_config version (bumped by triggers on janmotsav_years /
+# janmotsav_days) and the summaries and save paths reuse the same pointer.
+CurrentYear = namedtuple("CurrentYear", "id year event_name")
+
+_config_cache = VersionedCache()
+
+
+def _build_current_config():
     year = JanmotsavYear.query.filter_by(is_current=True, is_deleted=False).first()
 
     if not year:
-        return jsonify({"error": "No current Janmotsav year set"}), 200
+        payload = {"error": "No current Janmotsav year set"}
+        current = None
+    else:
+        days = (
+            JanmotsavDay.query
+                .filter_by(year_id=year.id, is_deleted=False)
+                .order_by(JanmotsavDay.event_date)
+                .all()
+        )
+        current = CurrentYear(year.id, year.year, year.event_name)
+        payload = {
+            "year": year.year,
+            "year_id": year.id,
+            "event_name": year.event_name,
+            "is_current": year.is_current,
+
+            # LOCATION + SOCIAL LINKS
+            "location_name": year.location_name,
+            "location_url": year.location_url,
+            "facebook_url": year.facebook_url,
+            "youtube_url": year.youtube_url,
+            "instagram_url": year.instagram_url,
+
+            # CUSTOM
+            "custom_link_1": year.custom_link_1,
+            "custom_link_2": year.custom_link_2,
+
+            "description": year.description,
+
+            # NEW EVENT FLAGS
+            "enable_payment_flag": year.enable_payment_flag,
+            "is_event_closed": year.is_event_closed,
+
+            # DAYS LIST
+            "days": [
+                {
+                    "day_id": d.id,
+                    "date": d.event_date.isoformat(),
+                    "breakfast": d.breakfast,
+                    "lunch": d.lunch,
+                    "evesnacks": d.evesnacks,
+                    "dinner": d.dinner,
+                }
+                for d in days
+            ]
+        }
+
+    body = current_app.json.dumps(payload)
+    return {
+        "current": current,
+        "body": body,
+        "etag": hashlib.sha1(body.encode("utf-8")).hexdigest(),
+    }
 
-    days = (
-        JanmotsavDay.query
-            .filter_by(year_id=year.id, is_deleted=False)
-            .order_by(JanmotsavDay.event_date)
-            .all()
+
+def _current_config():
+    version = data_version("janmotsav_config")
+    cached = _config_cache.get("current", version)
+    if cached is None:
+        cached = _config_cache.put("current", version, _build_current_config())
+    return cached
+
+
+def _current_year():
+    """CurrentYear(id, year, event_name) of the current Janmotsav, or None."""
+    return _current_config()["current"]
+
+
+# ==========================================================
+# GET CURRENT CONFIG
+# ==========================================================
+@router.get("/janmotsav/config/current")
+def get_current_config():
+    config = _current_config()
+    response = Response(config["body"], mimetype="application/json")
+    response.set_etag(config["etag"])
+    return response.make_conditional(request)
+# ==========================================================
+# SAVE HELPERS (shared by both save APIs)
+# ==========================================================
+def _save_seva_nidhi(user_id, year_id, amount, account_details):
+    """
+    Update the user's Seva Nidhi row for the year, or create it when there is
+    none, in a single statement.
+    """
+    now = datetime.utcnow()
+    db.session.execute(
+        text("""
+            WITH updated AS (
+                UPDATE seva_nidhi_payments
+                   SET seva_nidhi_amount          = :amount,
+                       seva_nidhi_account_details = :account_details,
+                       updated_at                 = :now
+                 WHERE id = (
+                     SELECT id FROM seva_nidhi_payments
+                      WHERE user_id = :user_id AND year_id = :year_id
+                      ORDER BY id
+                      LIMIT 1
+                 )
+                RETURNING id
+            )
+            INSERT INTO seva_nidhi_payments (
+                user_id, year_id, seva_nidhi_amount, seva_nidhi_account_details,
+                created_at, updated_at
+            )
+            SELECT :user_id, :year_id, :amount, :account_details, :now, :now
+            WHERE NOT EXISTS (SELECT 1 FROM updated)
+        """),
+        {
+            "user_id": user_id,
+            "year_id": year_id,
+            "amount": amount,
+            "account_details": account_details,
+            "now": now,
+        },
     )
 
-    return jsonify({
-        "year": year.year,
-        "year_id": year.id,
-        "event_name": year.event_name,
-        "is_current": year.is_current,
 
-        # LOCATION + SOCIAL LINKS
-        "location_name": year.location_name,
-        "location_url": year.location_url,
-        "facebook_url": year.facebook_url,
-        "youtube_url": year.youtube_url,
-        "instagram_url": year.instagram_url,
+_MEALS = ("breakfast", "lunch", "evesnacks", "dinner")
 
-        # CUSTOM
-        "custom_link_1": year.custom_link_1,
-        "custom_link_2": year.custom_link_2,
 
-        "description": year.description,
+def _upsert_attendance(user_id, year_id, entries_by_day):
+    """
+    Write all attendance rows ({day_id: entry}) with one
+    INSERT ... ON CONFLICT (user_id, day_id) DO UPDATE.
+    A soft-deleted row for the same day is revived.
+
+    janmotsav_meal_totals is moved by (new - old) counts in the same
+    transaction, so the kitchen summary never has to re-aggregate.
+    """
+    if not entries_by_day:
+        return
+
+    user_id = int(user_id)
+    year_id = int(year_id)
+    entries_by_day = {int(day_id): entry for day_id, entry in entries_by_day.items()}
+
+    # Serialise saves of the same user so the "old" counts read below are
+    # exactly what the upsert replaces (e.g. a double-tapped save button).
+    db.session.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext('janmotsav_attendance'), :user_id)"),
+        {"user_id": user_id},
+    )
+    old_rows = db.session.execute(
+        text("""
+            SELECT year_id, day_id, is_deleted,
+                   breakfast_count, lunch_count, evesnacks_count, dinner_count
+            FROM janmotsav_attendance
+            WHERE user_id = :user_id AND day_id = ANY(:day_ids)
+        """),
+        {"user_id": user_id, "day_ids": list(entries_by_day)},
+    ).all()
+
+    deltas = {}
+
+    def add_delta(key, counts, sign):
+        totals = deltas.setdefault(key, [0, 0, 0, 0])
+        for i, count in enumerate(counts):
+            totals[i] += sign * (count or 0)
+
+    for old in old_rows:
+        if old.is_deleted is False:
+            add_delta(
+                (old.year_id, old.day_id),
+                (old.breakfast_count, old.lunch_count, old.evesnacks_count, old.dinner_count),
+                -1,
+            )
+    for day_id, entry in entries_by_day.items():
+        add_delta((year_id, day_id), [entry.get(meal, 0) for meal in _MEALS], +1)
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": user_id,
+            "year_id": year_id,
+            "day_id": day_id,
+            "breakfast_count": entry.get("breakfast", 0),
+            "lunch_count": entry.get("lunch", 0),
+            "evesnacks_count": entry.get("evesnacks", 0),
+            "dinner_count": entry.get("dinner", 0),
+            "is_deleted": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for day_id, entry in entries_by_day.items()
+    ]
+
+    stmt = pg_insert(JanmotsavAttendance).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_janmotsav_attendance_user_day",
+        set_={
+            "year_id": stmt.excluded.year_id,
+            "breakfast_count": stmt.excluded.breakfast_count,
+            "lunch_count": stmt.excluded.lunch_count,
+            "evesnacks_count": stmt.excluded.evesnacks_count,
+            "dinner_count": stmt.excluded.dinner_count,
+            "is_deleted": False,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.session.execute(stmt)
+
+    _apply_meal_deltas(deltas, now)
+
+
+def _apply_meal_deltas(deltas, now):
+    """Add {(year_id, day_id): [b, l, e, d]} deltas to janmotsav_meal_totals."""
+    rows = [
+        {
+            "year_id": year_id,
+            "day_id": day_id,
+            "breakfast_total": d[0],
+            "lunch_total": d[1],
+            "evesnacks_total": d[2],
+            "dinner_total": d[3],
+            "updated_at": now,
+        }
+        # Sorted so concurrent saves lock the shared total rows in one order
+        for (year_id, day_id), d in sorted(deltas.items())
+        if any(d)
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(JanmotsavMealTotal).values(rows)
+    table = JanmotsavMealTotal.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.year_id, table.c.day_id],
+        set_={
+            f"{meal}_total": table.c[f"{meal}_total"] + stmt.excluded[f"{meal}_total"]
+            for meal in _MEALS
+        } | {"updated_at": stmt.excluded.updated_at},
+    )
+    db.session.execute(stmt)
+
+    # Delivered on commit to the live summary stream (janmotsav_live.py)
+    for year_id in sorted({row["year_id"] for row in rows}):
+        db.session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": janmotsav_live.CHANNEL, "payload": str(year_id)},
+        )
 
-        # NEW EVENT FLAGS
-        "enable_payment_flag": year.enable_payment_flag,
-        "is_event_closed": year.is_event_closed,
 
-        # DAYS LIST
-        "days": [
-            {
-                "day_id": d.id,
-                "date": d.event_date.isoformat(),
-                "breakfast": d.breakfast,
-                "lunch": d.lunch,
-                "evesnacks": d.evesnacks,
-                "dinner": d.dinner,
-            }
-            for d in days
-        ]
-    })
 # ==========================================================
 # SAVE ATTENDANCE + SEVA NIDHI
 # ==========================================================
 # ⚠️ LEGACY API
 # Used by old mobile app (expects day_id)
-# DO NOT MODIFY
+# DO NOT MODIFY the request / response contract
 # ==========================================================
 # SAVE ATTENDANCE + SEVA NIDHI
 # ==========================================================
@@ -88,57 +304,14 @@ def save_attendance():
         # 1️⃣ SAVE / UPDATE SEVA NIDHI PAYMENT
         # ------------------------------------------------------
         if seva_nidhi:
-            # Check if a record already exists for the same user + year
-            existing_payment = SevaNidhiPayment.query.filter_by(
-                user_id=user_id,
-                year_id=year_id
-            ).first()
-
-            if existing_payment:
-                # Update existing entry
-                existing_payment.amount = seva_nidhi_amount
-                existing_payment.account_details = seva_nidhi_account_details
-                existing_payment.updated_at = datetime.utcnow()
-            else:
-                # Create new entry
-                new_payment = SevaNidhiPayment(
-                    user_id=user_id,
-                    year_id=year_id,
-                    amount=seva_nidhi_amount,
-                    account_details=seva_nidhi_account_details,
-                )
-                db.session.add(new_payment)
+            _save_seva_nidhi(user_id, year_id, seva_nidhi_amount, seva_nidhi_account_details)
 
         # ------------------------------------------------------
-        # 2️⃣ SAVE ATTENDANCE (PER DAY)
+        # 2️⃣ SAVE ATTENDANCE (ALL DAYS, ONE UPSERT)
         # ------------------------------------------------------
-        for entry in data["attendance"]:
-            day_id = entry["day_id"]
-
-            existing = JanmotsavAttendance.query.filter_by(
-                user_id=user_id,
-                year_id=year_id,
-                day_id=day_id,
-                is_deleted=False
-            ).first()
-
-            if existing:
-                existing.breakfast_count = entry.get("breakfast", 0)
-                existing.lunch_count = entry.get("lunch", 0)
-                existing.evesnacks_count = entry.get("evesnacks", 0)
-                existing.dinner_count = entry.get("dinner", 0)
-                existing.updated_at = datetime.utcnow()
-            else:
-                rec = JanmotsavAttendance(
-                    user_id=user_id,
-                    year_id=year_id,
-                    day_id=day_id,
-                    breakfast_count=entry.get("breakfast", 0),
-                    lunch_count=entry.get("lunch", 0),
-                    evesnacks_count=entry.get("evesnacks", 0),
-                    dinner_count=entry.get("dinner", 0),
-                )
-                db.session.add(rec)
+        # Later entries for the same day win, as with the old per-row loop.
+        entries_by_day = {entry["day_id"]: entry for entry in data["attendance"]}
+        _upsert_attendance(user_id, year_id, entries_by_day)
 
         db.session.commit()
         return jsonify({"status": "success"})
@@ -160,7 +333,12 @@ def save_attendance_v1():
 
     try:
         user_id = data["user_id"]
-        year_id = data["year_id"]
+        year_id = data.get("year_id")
+        if not year_id:
+            current = _current_year()
+            if not current:
+                return jsonify({"error": "No current Janmotsav year found"}), 404
+            year_id = current.id
         print(f"👤 user_id={user_id}, 📅 year_id={year_id}")
 
         seva_nidhi = data.get("seva_nidhi", False)
@@ -178,27 +356,7 @@ def save_attendance_v1():
         # ------------------------------------------------------
         if seva_nidhi:
             print("➡️ Processing Seva Nidhi")
-
-            payment = SevaNidhiPayment.query.filter_by(
-                user_id=user_id,
-                year_id=year_id
-            ).first()
-
-            if payment:
-                print("🔁 Existing Seva Nidhi record found, updating")
-                payment.amount = seva_nidhi_amount
-                payment.account_details = seva_nidhi_account_details
-                payment.updated_at = datetime.utcnow()
-            else:
-                print("➕ Creating new Seva Nidhi record")
-                db.session.add(
-                    SevaNidhiPayment(
-                        user_id=user_id,
-                        year_id=year_id,
-                        amount=seva_nidhi_amount,
-                        account_details=seva_nidhi_account_details
-                    )
-                )
+            _save_seva_nidhi(user_id, year_id, seva_nidhi_amount, seva_nidhi_account_details)
         else:
             print("ℹ️ Seva Nidhi not provided, skipping")
 
@@ -208,59 +366,43 @@ def save_attendance_v1():
         attendance_list = data.get("attendance", [])
         print(f"📋 Attendance entries received: {len(attendance_list)}")
 
+        entries_by_date = {}
         for idx, entry in enumerate(attendance_list):
-            print(f"➡️ Processing attendance index {idx}: {entry}")
-
             if "date" not in entry:
-                print("❌ Missing 'date' in entry, skipping")
+                print(f"❌ Missing 'date' in entry {idx}, skipping")
                 continue
 
             try:
                 event_date = datetime.strptime(entry["date"], "%Y-%m-%d").date()
-                print(f"📆 Parsed event_date={event_date}")
             except Exception as e:
-                print("❌ Date parsing failed:", e)
+                print(f"❌ Date parsing failed for entry {idx}:", e)
                 continue
 
-            day = JanmotsavDay.query.filter_by(
-                year_id=year_id,
-                event_date=event_date,
-                is_deleted=False
-            ).first()
+            entries_by_date[event_date] = entry
+
+        # Resolve every date to its day_id in one query
+        day_ids = {}
+        if entries_by_date:
+            day_ids = dict(
+                db.session.query(JanmotsavDay.event_date, JanmotsavDay.id)
+                .filter(
+                    JanmotsavDay.year_id == year_id,
+                    JanmotsavDay.event_date.in_(list(entries_by_date)),
+                    JanmotsavDay.is_deleted == False,
+                )
+                .all()
+            )
 
-            if not day:
+        entries_by_day = {}
+        for event_date, entry in entries_by_date.items():
+            day_id = day_ids.get(event_date)
+            if not day_id:
                 print(f"⚠️ No JanmotsavDay found for date {event_date}, skipping")
                 continue
+            entries_by_day[day_id] = entry
 
-            print(f"✅ Resolved day_id={day.id}")
-
-            existing = JanmotsavAttendance.query.filter_by(
-                user_id=user_id,
-                year_id=year_id,
-                day_id=day.id,
-                is_deleted=False
-            ).first()
-
-            if existing:
-                print("🔁 Existing attendance found, updating")
-                existing.breakfast_count = entry.get("breakfast", 0)
-                existing.lunch_count = entry.get("lunch", 0)
-                existing.evesnacks_count = entry.get("evesnacks", 0)
-                existing.dinner_count = entry.get("dinner", 0)
-                existing.updated_at = datetime.utcnow()
-            else:
-                print("➕ Creating new attendance record")
-                db.session.add(
-                    JanmotsavAttendance(
-                        user_id=user_id,
-                        year_id=year_id,
-                        day_id=day.id,
-                        breakfast_count=entry.get("breakfast", 0),
-                        lunch_count=entry.get("lunch", 0),
-                        evesnacks_count=entry.get("evesnacks", 0),
-                        dinner_count=entry.get("dinner", 0),
-                    )
-                )
+        print(f"✅ Resolved {len(entries_by_day)} day(s), upserting attendance")
+        _upsert_attendance(user_id, year_id, entries_by_day)
 
         print("💾 Committing DB transaction")
         db.session.commit()
@@ -384,20 +526,104 @@ def add_days_old():
         print("Error adding days:", e)
         return jsonify({"error": "Failed to add days"}), 500
 
+# ==========================================================
+# ATTENDANCE TOTALS PER DAY
+# ==========================================================
+def _attendance_by_day(year_id, user_id=None):
+    """
+    One row per live day of the year (ordered by date) with the summed meal
+    counts, optionally for a single user.  Days nobody registered for come
+    back with zero counts.
+    """
+    join_on = db.and_(
+        JanmotsavAttendance.day_id == JanmotsavDay.id,
+        JanmotsavAttendance.is_deleted == False,
+    )
+    if user_id is not None:
+        join_on = db.and_(join_on, JanmotsavAttendance.user_id == user_id)
+
+    def total(column):
+        return db.func.coalesce(db.func.sum(column), 0)
+
+    return (
+        db.session.query(
+            JanmotsavDay.id,
+            JanmotsavDay.event_date,
+            total(JanmotsavAttendance.breakfast_count).label("breakfast"),
+            total(JanmotsavAttendance.lunch_count).label("lunch"),
+            total(JanmotsavAttendance.evesnacks_count).label("evesnacks"),
+            total(JanmotsavAttendance.dinner_count).label("dinner"),
+        )
+        .outerjoin(JanmotsavAttendance, join_on)
+        .filter(JanmotsavDay.year_id == year_id, JanmotsavDay.is_deleted == False)
+        .group_by(JanmotsavDay.id, JanmotsavDay.event_date)
+        .order_by(JanmotsavDay.event_date)
+        .all()
+    )
+
+
+def _meal_totals_by_day(year_id):
+    """
+    Same row shape as _attendance_by_day(year_id) but read from the
+    janmotsav_meal_totals counters: O(days), however many families register.
+    """
+    def total(column):
+        return db.func.coalesce(column, 0)
+
+    return (
+        db.session.query(
+            JanmotsavDay.id,
+            JanmotsavDay.event_date,
+            total(JanmotsavMealTotal.breakfast_total).label("breakfast"),
+            total(JanmotsavMealTotal.lunch_total).label("lunch"),
+            total(JanmotsavMealTotal.evesnacks_total).label("evesnacks"),
+            total(JanmotsavMealTotal.dinner_total).label("dinner"),
+        )
+        .outerjoin(
+            JanmotsavMealTotal,
+            db.and_(
+                JanmotsavMealTotal.day_id == JanmotsavDay.id,
+                JanmotsavMealTotal.year_id == JanmotsavDay.year_id,
+            ),
+        )
+        .filter(JanmotsavDay.year_id == year_id, JanmotsavDay.is_deleted == False)
+        .order_by(JanmotsavDay.event_date)
+        .all()
+    )
+
+
+def _meal_totals_days(year_id):
+    """Per-day meal totals in the admin summary / live stream shape."""
+    return [
+        {
+            "date": day.event_date.strftime("%Y-%m-%d"),
+            "dateFormatted": day.event_date.strftime("%d %b"),
+            "breakfast_total": day.breakfast,
+            "lunch_total": day.lunch,
+            "evesnacks_total": day.evesnacks,
+            "dinner_total": day.dinner,
+        }
+        for day in _meal_totals_by_day(year_id)
+    ]
+
+
+def _meal_totals_snapshot(year_id):
+    return {"year_id": year_id, "days": _meal_totals_days(year_id)}
+
+
+_live_totals = janmotsav_live.MealTotalsBroadcaster(_meal_totals_snapshot)
+
+
 # ==========================================================
 # USER ATTENDANCE SUMMARY
 # ==========================================================
 @router.get("/janmotsav/attendance/summary/<int:user_id>")
 def attendance_summary_user(user_id):
-    year = JanmotsavYear.query.filter_by(is_current=True, is_deleted=False).first()
+    year = _current_year()
 
     if not year:
         return jsonify({"error": "No Janmotsav year found"}), 404
 
-    days = JanmotsavDay.query.filter_by(
-        year_id=year.id, is_deleted=False
-    ).order_by(JanmotsavDay.event_date).all()
-
     response = {
         "year": year.year,
         "event_name": year.event_name,
@@ -407,34 +633,39 @@ def attendance_summary_user(user_id):
     # ============================================================
     # FETCH SEVA NIDHI PAYMENTS (NEW + FIXED)
     # ============================================================
-    payments = SevaNidhiPayment.query.filter_by(
-        user_id=user_id,
-        year_id=year.id
-    ).order_by(SevaNidhiPayment.created_at.asc()).all()
-
-    total_paid = sum(p.amount for p in payments)
-    last_payment = payments[-1] if payments else None
+    # Count and total in SQL; only the latest row's account details are read.
+    payment_count, total_paid = (
+        db.session.query(
+            db.func.count(SevaNidhiPayment.id),
+            db.func.coalesce(db.func.sum(SevaNidhiPayment.amount), 0),
+        )
+        .filter(SevaNidhiPayment.user_id == user_id, SevaNidhiPayment.year_id == year.id)
+        .one()
+    )
+    last_account_details = None
+    if payment_count:
+        last_account_details = (
+            db.session.query(SevaNidhiPayment.account_details)
+            .filter(SevaNidhiPayment.user_id == user_id, SevaNidhiPayment.year_id == year.id)
+            .order_by(SevaNidhiPayment.created_at.desc(), SevaNidhiPayment.id.desc())
+            .limit(1)
+            .scalar()
+        )
 
-    response["seva_nidhi_paid"] = len(payments) > 0
+    response["seva_nidhi_paid"] = payment_count > 0
     response["seva_nidhi_total_amount"] = total_paid
-    response["seva_nidhi_account_details"] = (
-        last_payment.account_details if last_payment else None
-    )
+    response["seva_nidhi_account_details"] = last_account_details
 
     # ============================================================
-    # ATTENDANCE FOR EACH DAY
+    # ATTENDANCE FOR EACH DAY (ONE GROUPED QUERY)
     # ============================================================
-    for day in days:
-        att = JanmotsavAttendance.query.filter_by(
-            user_id=user_id, day_id=day.id, is_deleted=False
-        ).first()
-
+    for day in _attendance_by_day(year.id, user_id=user_id):
         response["days"].append({
             "dateFormatted": day.event_date.strftime("%d %b"),
-            "breakfast": att.breakfast_count if att else 0,
-            "lunch": att.lunch_count if att else 0,
-            "evesnacks": att.evesnacks_count if att else 0,
-            "dinner": att.dinner_count if att else 0,
+            "breakfast": day.breakfast,
+            "lunch": day.lunch,
+            "evesnacks": day.evesnacks,
+            "dinner": day.dinner,
         })
 
     return jsonify(response)
@@ -444,46 +675,77 @@ def attendance_summary_user(user_id):
 # ==========================================================
 @router.get("/janmotsav/attendance/summary")
 def attendance_summary_all():
-    year = JanmotsavYear.query.filter_by(
-        is_current=True, is_deleted=False
-    ).first()
+    year = _current_year()
 
     if not year:
         return jsonify({"error": "No current Janmotsav year found"}), 404
 
-    days = JanmotsavDay.query.filter_by(
-        year_id=year.id, is_deleted=False
-    ).order_by(JanmotsavDay.event_date).all()
-
     response = {
         "year": year.year,
         "event_name": year.event_name,
         "days": []
     }
 
-    for day in days:
-        totals = db.session.query(
-            db.func.sum(JanmotsavAttendance.breakfast_count),
-            db.func.sum(JanmotsavAttendance.lunch_count),
-            db.func.sum(JanmotsavAttendance.evesnacks_count),
-            db.func.sum(JanmotsavAttendance.dinner_count),
-        ).filter_by(day_id=day.id, is_deleted=False).first()
-
-        response["days"].append({
-            "date": day.event_date.strftime("%Y-%m-%d"),
-            "dateFormatted": day.event_date.strftime("%d %b"),
-            "breakfast_total": totals[0] or 0,
-            "lunch_total": totals[1] or 0,
-            "evesnacks_total": totals[2] or 0,
-            "dinner_total": totals[3] or 0,
-        })
+    response["days"] = _meal_totals_days(year.id)
 
     # Add seva-nidhi totals (NEW)
-    all_payments = SevaNidhiPayment.query.filter_by(year_id=year.id).all()
-    response["seva_nidhi_total"] = sum(p.amount for p in all_payments)
+    response["seva_nidhi_total"] = (
+        db.session.query(db.func.coalesce(db.func.sum(SevaNidhiPayment.amount), 0))
+        .filter(SevaNidhiPayment.year_id == year.id)
+        .scalar()
+    )
 
     return jsonify(response)
 
+# ==========================================================
+# LIVE MEAL TOTALS (SERVER-SENT EVENTS)
+# ==========================================================
+@router.get("/janmotsav/attendance/summary/stream")
+def attendance_summary_stream():
+    """
+    Push per-day meal totals of the current year whenever a save changes
+    them (at most one event per second).  The first event is sent
+    immediately; a comment line every 15s keeps proxies from timing out.
+
+    503 when this process already serves janmotsav_live.MAX_STREAMS streams;
+    the client should poll /janmotsav/attendance/summary instead.
+    """
+    year = _current_year()
+
+    if not year:
+        return jsonify({"error": "No current Janmotsav year found"}), 404
+
+    subscription = _live_totals.subscribe(current_app._get_current_object(), year.id)
+    if subscription is None:
+        response = jsonify({"error": "Too many live viewers, please refresh the summary instead"})
+        response.headers["Retry-After"] = "30"
+        return response, 503
+    try:
+        initial = {"year": year.year, "event_name": year.event_name, **_meal_totals_snapshot(year.id)}
+    except Exception:
+        _live_totals.unsubscribe(subscription)
+        raise
+
+    def events():
+        try:
+            yield f"event: totals\ndata: {json.dumps(initial)}\n\n"
+            while True:
+                try:
+                    payload = subscription.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = {"year": year.year, "event_name": year.event_name, **payload}
+                yield f"event: totals\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            _live_totals.unsubscribe(subscription)
+
+    return Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # ==========================================================
 # LIST YEARS (ADMIN)
 # ==========================================================
@@ -570,3 +832,45 @@ def delete_year(year_id):
         db.session.rollback()
         print("Error deleting year:", e)
         return jsonify({"error": "Failed to delete year"}), 500
+
+
+# ==========================================================
+# CLI: RECONCILE MEAL TOTALS
+# ==========================================================
+@router.cli.command("reconcile-meal-totals")
+@click.option("--year-id", type=int, default=None, help="Only this year (default: all).")
+def reconcile_meal_totals(year_id):
+    """Recompute janmotsav_meal_totals from janmotsav_attendance."""
+    year_filter = "AND year_id = :year_id" if year_id else ""
+    params = {"year_id": year_id}
+    try:
+        # EXCLUSIVE blocks concurrent delta writers until the recompute commits;
+        # saves that are still in flight apply their delta on top afterwards.
+        db.session.execute(text("LOCK TABLE janmotsav_meal_totals IN EXCLUSIVE MODE"))
+        db.session.execute(
+            text(f"DELETE FROM janmotsav_meal_totals WHERE TRUE {year_filter}"), params
+        )
+        result = db.session.execute(
+            text(f"""
+                INSERT INTO janmotsav_meal_totals (
+                    year_id, day_id,
+                    breakfast_total, lunch_total, evesnacks_total, dinner_total,
+                    updated_at
+                )
+                SELECT year_id, day_id,
+                       coalesce(sum(breakfast_count), 0),
+                       coalesce(sum(lunch_count), 0),
+                       coalesce(sum(evesnacks_count), 0),
+                       coalesce(sum(dinner_count), 0),
+                       now()
+                FROM janmotsav_attendance
+                WHERE is_deleted = FALSE {year_filter}
+                GROUP BY year_id, day_id
+            """),
+            params,
+        )
+        db.session.commit()
+        click.echo(f"Recomputed meal totals for {result.rowcount} day(s).")
+    except Exception:
+        db.session.rollback()
+        raise
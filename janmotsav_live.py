@@ -0,0 +1,153 @@
+"""
+Live Janmotsav meal totals for GET /janmotsav/attendance/summary/stream.
+
+Every attendance save sends NOTIFY janmotsav_meal_totals '<year_id>' inside
+its transaction, so Postgres delivers it on commit to every app process.
+Each process runs one listener thread (started by the first subscriber,
+stopped when the last one leaves) that coalesces bursts of notifications
+into at most one snapshot per year per MIN_INTERVAL seconds and fans that
+snapshot out to the SSE generators through small per-subscriber queues.
+
+N kitchen phones polling M queries become one query per second per process.
+
+Each connected stream holds one gunicorn thread for as long as it stays
+open, so a process serves at most MAX_STREAMS of them (see
+gunicorn_config.py); further clients get a 503 and fall back to polling.
+"""
+
+import logging
+import os
+import queue
+import select
+import threading
+import time
+
+import psycopg2
+
+CHANNEL = "janmotsav_meal_totals"
+
+MIN_INTERVAL = 1.0        # seconds between two snapshots of the same year
+IDLE_POLL = 5.0           # wake-up interval to notice that subscribers left
+RECONNECT_DELAY = 5.0
+
+# Concurrent SSE streams per process; must stay below gunicorn's `threads`
+MAX_STREAMS = int(os.getenv("JANMOTSAV_MAX_STREAMS", "8"))
+
+
+class MealTotalsBroadcaster:
+    """
+    Fan-out of per-year snapshots to in-process subscribers.
+
+    build_snapshot(year_id) is called inside an app context on the listener
+    thread and must return a JSON-serialisable payload.
+    """
+
+    def __init__(self, build_snapshot):
+        self._build_snapshot = build_snapshot
+        self._subscribers: dict[queue.Queue, int] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+        self._pending: set[int] = set()
+        self._last_sent: dict[int, float] = {}
+
+    # ── subscriber side (request threads) ─────────────────────────────────
+
+    def subscribe(self, app, year_id: int):
+        """
+        Register a subscriber for year_id and start the listener if needed.
+        Returns None when MAX_STREAMS subscribers are already connected.
+        """
+        q: queue.Queue = queue.Queue(maxsize=1)
+        with self._lock:
+            if len(self._subscribers) >= MAX_STREAMS:
+                return None
+            self._subscribers[q] = year_id
+            self._app = app
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="janmotsav-live", daemon=True
+                )
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subscribers.pop(q, None)
+
+    # ── listener side ─────────────────────────────────────────────────────
+
+    def _has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._subscribers)
+
+    def _publish(self, year_id: int, payload):
+        with self._lock:
+            targets = [q for q, y in self._subscribers.items() if y == year_id]
+        for q in targets:
+            # Keep only the newest snapshot for slow consumers.
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                pass
+
+    def _run(self):
+        try:
+            while self._has_subscribers():
+                try:
+                    self._listen()
+                except Exception as e:
+                    logging.warning("janmotsav live listener error: %s", e)
+                    time.sleep(RECONNECT_DELAY)
+        finally:
+            with self._lock:
+                self._thread = None
+                # A subscriber may have arrived while we were shutting down.
+                if self._subscribers:
+                    self._thread = threading.Thread(
+                        target=self._run, name="janmotsav-live", daemon=True
+                    )
+                    self._thread.start()
+
+    def _listen(self):
+        from config import Config
+
+        conn = psycopg2.connect(Config.CONNECTION_POOL_URI)
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            while self._has_subscribers():
+                if select.select([conn], [], [], self._wait_timeout())[0]:
+                    conn.poll()
+                    while conn.notifies:
+                        note = conn.notifies.pop(0)
+                        try:
+                            self._pending.add(int(note.payload))
+                        except ValueError:
+                            continue
+                self._flush()
+        finally:
+            conn.close()
+
+    def _wait_timeout(self) -> float:
+        if not self._pending:
+            return IDLE_POLL
+        now = time.monotonic()
+        due = min(self._last_sent.get(y, 0.0) + MIN_INTERVAL for y in self._pending)
+        return max(0.0, due - now)
+
+    def _flush(self):
+        now = time.monotonic()
+        for year_id in list(self._pending):
+            if now - self._last_sent.get(year_id, 0.0) < MIN_INTERVAL:
+                continue
+            self._pending.discard(year_id)
+            self._last_sent[year_id] = now
+            with self._app.app_context():
+                payload = self._build_snapshot(year_id)
+            self._publish(year_id, payload)
@@ -0,0 +1,125 @@
+"""
+Geohash clustering for the Adhik Maas admin map.
+
+MapIndex is built once per data version from the full point list and is
+immutable afterwards, so request threads share it without locking.  At
+build time every point is bucketed by its geohash prefix at each cluster
+precision; a low-zoom request then only walks the (few) buckets of one
+precision instead of every submission.
+"""
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Leaflet / Google zoom -> geohash precision for the cluster cells.
+# At CLUSTER_MAX_ZOOM and above individual points are returned instead.
+_ZOOM_PRECISION = [
+    (3, 1), (5, 2), (8, 3), (10, 4), (13, 5), (15, 6),
+]
+CLUSTER_MAX_ZOOM = 15
+
+# Counted per cluster so the map can colour it by seva mix.
+_MIX_FLAGS = ("has_padyapuja", "has_seva_mahaprasad", "has_shejarti", "is_shortlisted", "is_finalized")
+
+
+def geohash(lat: float, lon: float, precision: int = 9) -> str:
+    """Standard base-32 geohash of (lat, lon)."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    out = []
+    bits = ch = 0
+    even = True
+    while len(out) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                ch = (ch << 1) | 1
+                lon_lo = mid
+            else:
+                ch <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch = (ch << 1) | 1
+                lat_lo = mid
+            else:
+                ch <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(_BASE32[ch])
+            bits = ch = 0
+    return "".join(out)
+
+
+def precision_for_zoom(zoom: int):
+    """Geohash precision for zoom, or None when points should be returned."""
+    for max_zoom, precision in _ZOOM_PRECISION:
+        if zoom < max_zoom:
+            return precision
+    return None
+
+
+def parse_bbox(raw: str):
+    """'west,south,east,north' -> tuple of floats, or None if malformed."""
+    try:
+        west, south, east, north = (float(v) for v in raw.split(","))
+    except (AttributeError, ValueError):
+        return None
+    if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+        return None
+    return west, south, east, north
+
+
+def _in_bbox(lat, lon, bbox) -> bool:
+    if bbox is None:
+        return True
+    west, south, east, north = bbox
+    if not south <= lat <= north:
+        return False
+    if west <= east:
+        return west <= lon <= east
+    return lon >= west or lon <= east            # bbox crosses the antimeridian
+
+
+class MapIndex:
+    """Immutable map points plus per-precision geohash cluster buckets."""
+
+    def __init__(self, points, pending=0, unresolved=0):
+        self.points = points
+        self.pending = pending
+        self.unresolved = unresolved
+        self._hashes = [geohash(p["latitude"], p["longitude"]) for p in points]
+        self._clusters = {}
+        for _, precision in _ZOOM_PRECISION:
+            buckets = {}
+            for point, full_hash in zip(points, self._hashes):
+                cell = full_hash[:precision]
+                b = buckets.get(cell)
+                if b is None:
+                    b = buckets[cell] = {"lat": 0.0, "lon": 0.0, "count": 0, "approximate": 0,
+                                         **{f: 0 for f in _MIX_FLAGS}}
+                b["lat"] += point["latitude"]
+                b["lon"] += point["longitude"]
+                b["count"] += 1
+                b["approximate"] += bool(point.get("approximate"))
+                for f in _MIX_FLAGS:
+                    b[f] += bool(point[f])
+            self._clusters[precision] = [
+                {
+                    "geohash":   cell,
+                    "latitude":  round(b["lat"] / b["count"], 6),
+                    "longitude": round(b["lon"] / b["count"], 6),
+                    "count":     b["count"],
+                    "approximate": b["approximate"],
+                    "seva_mix":  {f: b[f] for f in _MIX_FLAGS},
+                }
+                for cell, b in sorted(buckets.items())
+            ]
+
+    def clusters(self, precision: int, bbox=None) -> list:
+        return [c for c in self._clusters[precision] if _in_bbox(c["latitude"], c["longitude"], bbox)]
+
+    def points_in(self, bbox=None) -> list:
+        return [p for p in self.points if _in_bbox(p["latitude"], p["longitude"], bbox)]
@@ -0,0 +1,237 @@
+"""
+Versioned schema migrations.
+
+Plain SQL files in migrations/ named NNNN_description.sql are applied in
+filename order, each in its own transaction, and recorded in the
+schema_migrations table so every revision runs exactly once.
+
+Commands (registered on the Flask CLI in app.py):
+  flask --app app db upgrade          apply pending migrations
+  flask --app app db status           list applied / pending migrations
+  flask --app app db check-indexes    EXPLAIN every hot query and fail if the
+                                      planner needs a sequential scan
+
+check-indexes is meant to run against a seeded copy of the database (pass
+--dsn for anything other than the configured pool).  It disables
+enable_seqscan for its session, so a Seq Scan in a plan means no usable
+index exists rather than "the table is small".
+"""
+
+import os
+from datetime import date
+
+import click
+import psycopg2
+from flask.cli import AppGroup
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+db_cli = AppGroup("db", help="Schema migrations and index checks.")
+
+
+# ─── Migration runner ─────────────────────────────────────────────────────────
+
+def _migration_files() -> list[tuple[str, str]]:
+    """Return [(version, path)] for every migrations/NNNN_*.sql, in order."""
+    out = []
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if name.endswith(".sql") and name[:4].isdigit():
+            out.append((name[:-4], os.path.join(MIGRATIONS_DIR, name)))
+    return out
+
+
+def _applied_versions(cursor) -> set[str]:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version    VARCHAR(255) PRIMARY KEY,
+            applied_at TIMESTAMP    NOT NULL DEFAULT now()
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _connect(dsn=None):
+    if dsn:
+        return psycopg2.connect(dsn), None
+    from config import get_db_connection, release_db_connection
+    return get_db_connection(), release_db_connection
+
+
+def _close(conn, release):
+    if release:
+        release(conn)
+    else:
+        conn.close()
+
+
+def upgrade(dsn=None) -> list[str]:
+    """Apply every pending migration; return the versions applied."""
+    conn, release = _connect(dsn)
+    cursor = conn.cursor()
+    applied_now = []
+    try:
+        # Serialise concurrent upgrades (e.g. several app servers deploying).
+        cursor.execute("SELECT pg_advisory_lock(hashtext('schema_migrations'))")
+        applied = _applied_versions(cursor)
+        conn.commit()
+
+        for version, path in _migration_files():
+            if version in applied:
+                continue
+            with open(path, encoding="utf-8") as f:
+                sql = f.read()
+            try:
+                cursor.execute(sql)
+                cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+                conn.commit()
+            except psycopg2.DatabaseError:
+                conn.rollback()
+                raise
+            applied_now.append(version)
+        return applied_now
+    finally:
+        cursor.execute("SELECT pg_advisory_unlock(hashtext('schema_migrations'))")
+        conn.commit()
+        cursor.close()
+        _close(conn, release)
+
+
+@db_cli.command("upgrade")
+@click.option("--dsn", default=None, help="Connection string (defaults to the app pool).")
+def upgrade_command(dsn):
+    """Apply pending migrations."""
+    applied = upgrade(dsn)
+    if not applied:
+        click.echo("Database is up to date.")
+    for version in applied:
+        click.echo(f"Applied {version}")
+
+
+@db_cli.command("status")
+@click.option("--dsn", default=None, help="Connection string (defaults to the app pool).")
+def status_command(dsn):
+    """List applied and pending migrations."""
+    conn, release = _connect(dsn)
+    cursor = conn.cursor()
+    try:
+        applied = _applied_versions(cursor)
+        conn.commit()
+        for version, _ in _migration_files():
+            click.echo(f"{'applied' if version in applied else 'pending'}  {version}")
+    finally:
+        cursor.close()
+        _close(conn, release)
+
+
+# ─── Hot-path index check ─────────────────────────────────────────────────────
+
+# (name, sql, params) for every query on a request hot path.  Keep this list
+# in step with the endpoints: a new hot query without an index should fail
+# the check rather than slow down production.
+_TODAY = date.today()
+HOT_QUERIES = [
+    ("bookings by year",
+     "SELECT id FROM bookings WHERE booking_date >= %s AND booking_date < %s",
+     (date(_TODAY.year, 1, 1), date(_TODAY.year + 1, 1, 1))),
+    ("active booking per user per year",
+     "SELECT id FROM bookings WHERE user_id = %s AND booking_date >= %s "
+     "AND booking_date <= %s AND is_active = TRUE",
+     (1, date(_TODAY.year, 1, 1), date(_TODAY.year, 12, 31))),
+    ("active sunday bookings on date",
+     "SELECT count(*) FROM sunday_bookings WHERE booking_date = %s AND is_active = TRUE",
+     (_TODAY,)),
+    ("active sunday booking per user per year",
+     "SELECT id FROM sunday_bookings WHERE user_id = %s AND booking_date >= %s "
+     "AND booking_date <= %s AND is_active = TRUE",
+     (1, date(_TODAY.year, 1, 1), date(_TODAY.year, 12, 31))),
+    ("janmotsav attendance for user/day",
+     "SELECT id FROM janmotsav_attendance WHERE user_id = %s AND year_id = %s "
+     "AND day_id = %s AND is_deleted = FALSE",
+     (1, 1, 1)),
+    ("janmotsav attendance totals for day",
+     "SELECT sum(breakfast_count) FROM janmotsav_attendance WHERE day_id = %s AND is_deleted = FALSE",
+     (1,)),
+    ("janmotsav days for year",
+     "SELECT id FROM janmotsav_days WHERE year_id = %s AND is_deleted = FALSE ORDER BY event_date",
+     (1,)),
+    ("janmotsav day by date",
+     "SELECT id FROM janmotsav_days WHERE year_id = %s AND event_date = %s AND is_deleted = FALSE",
+     (1, _TODAY)),
+    ("seva nidhi for user/year",
+     "SELECT id FROM seva_nidhi_payments WHERE user_id = %s AND year_id = %s",
+     (1, 1)),
+    ("seva nidhi total for year",
+     "SELECT sum(seva_nidhi_amount) FROM seva_nidhi_payments WHERE year_id = %s",
+     (1,)),
+    ("adhik maas submission for user",
+     "SELECT id FROM adhik_maas_submissions WHERE user_id = %s",
+     (1,)),
+    ("adhik maas finalized on route date",
+     "SELECT id FROM adhik_maas_submissions WHERE route_date = %s AND is_finalized = TRUE",
+     (_TODAY,)),
+    ("adhik maas finalized list",
+     "SELECT id FROM adhik_maas_submissions WHERE is_finalized = TRUE ORDER BY route_date, area",
+     ()),
+    ("adhik maas combination page",
+     "SELECT id FROM adhik_maas_submissions WHERE has_padyapuja = TRUE "
+     "AND has_seva_mahaprasad = FALSE AND has_shejarti = FALSE AND seva_time = %s "
+     "AND (area, id) > (%s, %s) ORDER BY area, id LIMIT 51",
+     ("afternoon", "", 0)),
+    ("adhik maas submissions page",
+     "SELECT id FROM adhik_maas_submissions "
+     "WHERE (coalesce(submitted_at, '-infinity'::timestamp), id) < (%s, %s) "
+     "ORDER BY coalesce(submitted_at, '-infinity'::timestamp) DESC, id DESC LIMIT 51",
+     (date(_TODAY.year + 1, 1, 1), 0)),
+    ("adhik maas submissions by route",
+     "SELECT id FROM adhik_maas_submissions WHERE route_number = %s "
+     "ORDER BY coalesce(submitted_at, '-infinity'::timestamp) DESC, id DESC LIMIT 51",
+     ("1",)),
+    ("user name search",
+     "SELECT id FROM users WHERE (coalesce(first_name, '') || ' ' "
+     "|| coalesce(middle_name || ' ', '') || coalesce(last_name, '')) ILIKE %s",
+     ("%sharma%",)),
+    ("user mobile search",
+     "SELECT id FROM users WHERE mobile_number ILIKE %s",
+     ("%98765%",)),
+    ("adhik maas shortlisted list",
+     "SELECT id FROM adhik_maas_submissions WHERE is_shortlisted = TRUE ORDER BY area",
+     ()),
+]
+
+
+def _seq_scans(node) -> list[str]:
+    """Return the relation names of every Seq Scan in an EXPLAIN JSON plan node."""
+    found = []
+    if node.get("Node Type") == "Seq Scan":
+        found.append(node.get("Relation Name", "?"))
+    for child in node.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+@db_cli.command("check-indexes")
+@click.option("--dsn", default=None, help="Connection string of a seeded database.")
+def check_indexes_command(dsn):
+    """EXPLAIN every hot query; exit non-zero if any plan uses a Seq Scan."""
+    conn, release = _connect(dsn)
+    cursor = conn.cursor()
+    failures = []
+    try:
+        cursor.execute("SET enable_seqscan = off")
+        for name, sql, params in HOT_QUERIES:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0][0]["Plan"]
+            scans = _seq_scans(plan)
+            if scans:
+                failures.append(name)
+                click.echo(f"FAIL  {name}: Seq Scan on {', '.join(scans)}")
+            else:
+                click.echo(f"ok    {name}")
+    finally:
+        conn.rollback()
+        cursor.close()
+        _close(conn, release)
+
+    if failures:
+        raise click.ClickException(f"{len(failures)} hot queries fall back to a sequential scan")
@@ -0,0 +1,34 @@
+-- 0001: index-friendly year filtering for /bookings/users/by-year
+--
+-- * btree on bookings(booking_date) so the half-open year range
+--   (booking_date >= 'YYYY-01-01' AND booking_date < 'YYYY+1-01-01')
+--   becomes an index range scan instead of a full scan.
+-- * partial index on active bookings per user, used by the
+--   "one booking per user per year" checks in Booking.py.
+-- * data_versions: one row per cached table, bumped by a statement-level
+--   trigger on every write.  cache.py keys its in-process caches on it.
+
+CREATE INDEX IF NOT EXISTS ix_bookings_booking_date
+    ON bookings (booking_date);
+
+CREATE INDEX IF NOT EXISTS ix_bookings_user_id_booking_date_active
+    ON bookings (user_id, booking_date)
+    WHERE is_active;
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    name    VARCHAR(50) PRIMARY KEY,
+    version BIGINT      NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO data_versions (name, version) VALUES (TG_ARGV[0], 1)
+    ON CONFLICT (name) DO UPDATE SET version = data_versions.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bookings_data_version ON bookings;
+CREATE TRIGGER bookings_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON bookings
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('bookings');
@@ -0,0 +1,45 @@
+-- 0002: secondary indexes for the request hot paths
+--
+-- bookings is covered by 0001.  Partial indexes are used wherever the hot
+-- queries only ever read the active / non-deleted / flagged subset.
+-- `flask --app app db check-indexes` EXPLAINs the matching queries.
+
+-- Sunday bookings: per-date capacity check and one-booking-per-year check
+CREATE INDEX IF NOT EXISTS ix_sunday_bookings_booking_date_active
+    ON sunday_bookings (booking_date)
+    WHERE is_active;
+
+CREATE INDEX IF NOT EXISTS ix_sunday_bookings_user_id_booking_date_active
+    ON sunday_bookings (user_id, booking_date)
+    WHERE is_active;
+
+-- Janmotsav: per-user attendance, per-day totals, days of a year
+CREATE INDEX IF NOT EXISTS ix_janmotsav_attendance_user_year_day
+    ON janmotsav_attendance (user_id, year_id, day_id)
+    WHERE NOT is_deleted;
+
+CREATE INDEX IF NOT EXISTS ix_janmotsav_attendance_day_id
+    ON janmotsav_attendance (day_id)
+    WHERE NOT is_deleted;
+
+CREATE INDEX IF NOT EXISTS ix_janmotsav_days_year_event_date
+    ON janmotsav_days (year_id, event_date)
+    WHERE NOT is_deleted;
+
+CREATE INDEX IF NOT EXISTS ix_seva_nidhi_payments_user_year
+    ON seva_nidhi_payments (user_id, year_id);
+
+CREATE INDEX IF NOT EXISTS ix_seva_nidhi_payments_year_id
+    ON seva_nidhi_payments (year_id);
+
+-- Adhik Maas: own submission, finalized route days, shortlist
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_user_id
+    ON adhik_maas_submissions (user_id);
+
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_finalized_route_date
+    ON adhik_maas_submissions (route_date, area)
+    WHERE is_finalized;
+
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_shortlisted
+    ON adhik_maas_submissions (area)
+    WHERE is_shortlisted;
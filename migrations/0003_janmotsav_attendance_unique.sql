@@ -0,0 +1,20 @@
+-- 0003: one attendance row per (user, day)
+--
+-- Needed by the bulk INSERT ... ON CONFLICT (user_id, day_id) DO UPDATE in
+-- the Janmotsav save paths.  Duplicates created by the old check-then-insert
+-- loop are collapsed first, keeping the live, most recently updated row.
+
+DELETE FROM janmotsav_attendance a
+USING (
+    SELECT id,
+           row_number() OVER (
+               PARTITION BY user_id, day_id
+               ORDER BY is_deleted ASC, updated_at DESC NULLS LAST, id DESC
+           ) AS rn
+    FROM janmotsav_attendance
+) ranked
+WHERE a.id = ranked.id
+  AND ranked.rn > 1;
+
+ALTER TABLE janmotsav_attendance
+    ADD CONSTRAINT uq_janmotsav_attendance_user_day UNIQUE (user_id, day_id);
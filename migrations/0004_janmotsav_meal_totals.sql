@@ -0,0 +1,29 @@
+-- 0004: live per-day meal totals for the Janmotsav kitchens
+--
+-- Maintained by delta in the same transaction as every attendance save
+-- (janmotsav._upsert_attendance); `flask --app app janmotsav
+-- reconcile-meal-totals` recomputes it from janmotsav_attendance.
+
+CREATE TABLE IF NOT EXISTS janmotsav_meal_totals (
+    year_id         INTEGER   NOT NULL REFERENCES janmotsav_years (id),
+    day_id          INTEGER   NOT NULL REFERENCES janmotsav_days (id),
+    breakfast_total INTEGER   NOT NULL DEFAULT 0,
+    lunch_total     INTEGER   NOT NULL DEFAULT 0,
+    evesnacks_total INTEGER   NOT NULL DEFAULT 0,
+    dinner_total    INTEGER   NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (year_id, day_id)
+);
+
+INSERT INTO janmotsav_meal_totals (
+    year_id, day_id, breakfast_total, lunch_total, evesnacks_total, dinner_total
+)
+SELECT year_id, day_id,
+       coalesce(sum(breakfast_count), 0),
+       coalesce(sum(lunch_count), 0),
+       coalesce(sum(evesnacks_count), 0),
+       coalesce(sum(dinner_count), 0)
+FROM janmotsav_attendance
+WHERE is_deleted = FALSE
+GROUP BY year_id, day_id
+ON CONFLICT (year_id, day_id) DO NOTHING;
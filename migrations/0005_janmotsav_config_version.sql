@@ -0,0 +1,15 @@
+-- 0005: version stamp for the cached current Janmotsav config
+--
+-- Any write to janmotsav_years or janmotsav_days invalidates the
+-- pre-serialised /janmotsav/config/current body and the cached
+-- "current year" pointer (janmotsav._current_config).
+
+DROP TRIGGER IF EXISTS janmotsav_years_data_version ON janmotsav_years;
+CREATE TRIGGER janmotsav_years_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON janmotsav_years
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('janmotsav_config');
+
+DROP TRIGGER IF EXISTS janmotsav_days_data_version ON janmotsav_days;
+CREATE TRIGGER janmotsav_days_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON janmotsav_days
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('janmotsav_config');
@@ -0,0 +1,36 @@
+-- 0006: derive the structured seva flags for legacy Adhik Maas rows
+--
+-- Mirrors adhik_maas._parse_seva_flags so the summary can aggregate the
+-- has_padyapuja / has_seva_mahaprasad / seva_time / has_shejarti columns
+-- directly instead of re-parsing seva_preference for every row.  Only rows
+-- whose stored flags disagree with their preference string are touched.
+
+WITH parsed AS (
+    SELECT id,
+           string_to_array(coalesce(seva_preference, ''), '|') AS parts,
+           seva_preference
+    FROM adhik_maas_submissions
+), flags AS (
+    SELECT id,
+           ('padyapuja' = ANY(parts) OR seva_preference = 'padya_puja')           AS has_padyapuja,
+           ('seva'      = ANY(parts) OR seva_preference = 'abhishek_mahaprasad')  AS has_seva_mahaprasad,
+           ('shejarti'  = ANY(parts) OR seva_preference = 'shejarti_kakad_aarti') AS has_shejarti,
+           CASE
+               WHEN 'afternoon' = ANY(parts)                 THEN 'afternoon'
+               WHEN 'evening'   = ANY(parts)                 THEN 'evening'
+               WHEN 'any'       = ANY(parts)                 THEN 'any'
+               WHEN seva_preference = 'abhishek_mahaprasad'  THEN 'any'
+           END AS seva_time
+    FROM parsed
+)
+UPDATE adhik_maas_submissions s
+SET has_padyapuja       = f.has_padyapuja,
+    has_seva_mahaprasad = f.has_seva_mahaprasad,
+    has_shejarti        = f.has_shejarti,
+    seva_time           = f.seva_time
+FROM flags f
+WHERE s.id = f.id
+  AND (s.has_padyapuja       IS DISTINCT FROM f.has_padyapuja
+    OR s.has_seva_mahaprasad IS DISTINCT FROM f.has_seva_mahaprasad
+    OR s.has_shejarti        IS DISTINCT FROM f.has_shejarti
+    OR s.seva_time           IS DISTINCT FROM f.seva_time);
@@ -0,0 +1,6 @@
+-- 0007: keyset index for /adhik-maas/summary/combination
+--
+-- The drill-down filters on the four flag columns and pages on (area, id).
+
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_combination
+    ON adhik_maas_submissions (has_padyapuja, has_seva_mahaprasad, has_shejarti, seva_time, area, id);
@@ -0,0 +1,18 @@
+-- 0008: persistent address -> coordinate cache for the geocoding worker
+--
+-- Keyed by geocoding.normalise_address().  Misses are stored too
+-- (status 'not_found') so an unresolvable address is not re-queried on
+-- every backfill run.
+
+CREATE TABLE IF NOT EXISTS geocode_cache (
+    address_key VARCHAR(500) PRIMARY KEY,
+    latitude    NUMERIC(10, 7),
+    longitude   NUMERIC(10, 7),
+    status      VARCHAR(20)  NOT NULL,
+    attempts    INTEGER      NOT NULL DEFAULT 1,
+    updated_at  TIMESTAMP    NOT NULL DEFAULT now()
+);
+
+-- The worker's queue is "users with a submission and no coordinates".
+CREATE INDEX IF NOT EXISTS ix_users_missing_coordinates
+    ON users (id) WHERE latitude IS NULL OR longitude IS NULL;
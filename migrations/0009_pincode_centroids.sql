@@ -0,0 +1,29 @@
+-- 0009: offline pincode -> centroid table for approximate map positions
+--
+-- Seeded here from the mean position of already-geocoded users; pincodes
+-- of AdhikMaasArea / zone rows with no geocoded user yet are filled in by
+--   flask --app app adhik_maas seed-pincode-centroids
+-- Each process caches the table in memory under the 'pincode_centroids'
+-- version stamp.
+
+CREATE TABLE IF NOT EXISTS pincode_centroids (
+    pincode    VARCHAR(10)   PRIMARY KEY,
+    area_name  VARCHAR(150),
+    latitude   NUMERIC(10, 7) NOT NULL,
+    longitude  NUMERIC(10, 7) NOT NULL,
+    source     VARCHAR(20)   NOT NULL,
+    updated_at TIMESTAMP     NOT NULL DEFAULT now()
+);
+
+DROP TRIGGER IF EXISTS pincode_centroids_data_version ON pincode_centroids;
+CREATE TRIGGER pincode_centroids_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON pincode_centroids
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('pincode_centroids');
+
+INSERT INTO pincode_centroids (pincode, latitude, longitude, source)
+SELECT regexp_replace(pincode, '\D', '', 'g'), avg(latitude), avg(longitude), 'users'
+FROM users
+WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+  AND regexp_replace(pincode, '\D', '', 'g') <> ''
+GROUP BY regexp_replace(pincode, '\D', '', 'g')
+ON CONFLICT (pincode) DO NOTHING;
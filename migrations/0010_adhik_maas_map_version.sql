@@ -0,0 +1,26 @@
+-- 0010: version stamp for the in-memory Adhik Maas map index
+--
+-- adhik_maas._map_cache rebuilds its points and geohash clusters when any
+-- input of a map point changes: the submission itself, the user's name /
+-- address / coordinates, the geocode cache or the pincode centroids.
+
+DROP TRIGGER IF EXISTS adhik_maas_submissions_map_version ON adhik_maas_submissions;
+CREATE TRIGGER adhik_maas_submissions_map_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON adhik_maas_submissions
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('adhik_maas_map');
+
+DROP TRIGGER IF EXISTS users_map_version ON users;
+CREATE TRIGGER users_map_version
+    AFTER INSERT OR DELETE OR UPDATE OF first_name, last_name, full_address, pincode, latitude, longitude
+    ON users
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('adhik_maas_map');
+
+DROP TRIGGER IF EXISTS geocode_cache_map_version ON geocode_cache;
+CREATE TRIGGER geocode_cache_map_version
+    AFTER INSERT OR UPDATE OR DELETE ON geocode_cache
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('adhik_maas_map');
+
+DROP TRIGGER IF EXISTS pincode_centroids_map_version ON pincode_centroids;
+CREATE TRIGGER pincode_centroids_map_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON pincode_centroids
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('adhik_maas_map');
@@ -0,0 +1,39 @@
+-- 0011: background export jobs and the version stamps their cache keys use
+--
+-- An export is reused while its cache_key (type + params + the data
+-- versions of every table it reads) matches and it has not expired.
+
+CREATE TABLE IF NOT EXISTS export_jobs (
+    id           VARCHAR(32)  PRIMARY KEY,
+    export_type  VARCHAR(50)  NOT NULL,
+    params       TEXT         NOT NULL,
+    cache_key    VARCHAR(40)  NOT NULL,
+    status       VARCHAR(20)  NOT NULL DEFAULT 'queued',
+    file_path    VARCHAR(500),
+    filename     VARCHAR(255),
+    mimetype     VARCHAR(100),
+    row_count    INTEGER,
+    error        VARCHAR(500),
+    requested_by INTEGER REFERENCES users (id),
+    created_at   TIMESTAMP    NOT NULL DEFAULT now(),
+    finished_at  TIMESTAMP,
+    expires_at   TIMESTAMP    NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_export_jobs_cache_key
+    ON export_jobs (cache_key, created_at);
+
+DROP TRIGGER IF EXISTS users_data_version ON users;
+CREATE TRIGGER users_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON users
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('users');
+
+DROP TRIGGER IF EXISTS adhik_maas_submissions_data_version ON adhik_maas_submissions;
+CREATE TRIGGER adhik_maas_submissions_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON adhik_maas_submissions
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('adhik_maas_submissions');
+
+DROP TRIGGER IF EXISTS janmotsav_attendance_data_version ON janmotsav_attendance;
+CREATE TRIGGER janmotsav_attendance_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON janmotsav_attendance
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('janmotsav_attendance');
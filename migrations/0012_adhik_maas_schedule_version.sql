@@ -0,0 +1,12 @@
+-- 0012: version stamp for the cached public Adhik Maas day summaries
+--
+-- Only writes that can change a day summary bump it: finalization, route
+-- assignment and the seva flags.  Admin notes, shortlisting etc. do not.
+
+DROP TRIGGER IF EXISTS adhik_maas_submissions_schedule_version ON adhik_maas_submissions;
+CREATE TRIGGER adhik_maas_submissions_schedule_version
+    AFTER INSERT OR DELETE OR TRUNCATE
+       OR UPDATE OF is_finalized, route_date, route_number, route_name,
+                    has_padyapuja, has_seva_mahaprasad, seva_time, has_shejarti
+    ON adhik_maas_submissions
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('adhik_maas_schedule');
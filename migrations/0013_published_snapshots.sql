@@ -0,0 +1,18 @@
+-- 0013: pre-serialised public lists
+--
+-- adhik_maas.publish_finalized_snapshot() rewrites its row whenever the
+-- finalized list or its publication toggle changes; every process serves
+-- the body from memory until the 'published_snapshots' stamp moves.
+
+CREATE TABLE IF NOT EXISTS published_snapshots (
+    name      VARCHAR(100) PRIMARY KEY,
+    published BOOLEAN      NOT NULL DEFAULT FALSE,
+    body      TEXT         NOT NULL,
+    etag      VARCHAR(40)  NOT NULL,
+    built_at  TIMESTAMP    NOT NULL DEFAULT now()
+);
+
+DROP TRIGGER IF EXISTS published_snapshots_data_version ON published_snapshots;
+CREATE TRIGGER published_snapshots_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON published_snapshots
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('published_snapshots');
@@ -0,0 +1,9 @@
+-- 0014: version stamp for the in-memory Adhik Maas area index
+--
+-- adhik_maas._area_index() rebuilds its name / pin / n-gram lookups and
+-- the pre-serialised /adhik-maas/areas body when this stamp moves.
+
+DROP TRIGGER IF EXISTS adhik_maas_areas_data_version ON adhik_maas_areas;
+CREATE TRIGGER adhik_maas_areas_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON adhik_maas_areas
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('adhik_maas_areas');
@@ -0,0 +1,25 @@
+-- 0015: one Adhik Maas submission per user
+--
+-- Needed by INSERT ... ON CONFLICT (user_id) DO NOTHING in
+-- submit_adhik_maas.  Duplicates left by the old check-then-insert path
+-- are collapsed first, keeping the row furthest along the workflow
+-- (finalized, then shortlisted), then the most recent one.  The unique
+-- index replaces the plain user_id index from 0002.
+
+DELETE FROM adhik_maas_submissions s
+USING (
+    SELECT id,
+           row_number() OVER (
+               PARTITION BY user_id
+               ORDER BY is_finalized DESC, is_shortlisted DESC,
+                        submitted_at DESC NULLS LAST, id DESC
+           ) AS rn
+    FROM adhik_maas_submissions
+) ranked
+WHERE s.id = ranked.id
+  AND ranked.rn > 1;
+
+ALTER TABLE adhik_maas_submissions
+    ADD CONSTRAINT uq_adhik_maas_submissions_user_id UNIQUE (user_id);
+
+DROP INDEX IF EXISTS ix_adhik_maas_submissions_user_id;
@@ -0,0 +1,25 @@
+-- 0016: indexes for the filtered, keyset-paged /adhik-maas/submissions
+--
+-- Name search uses the same expression as adhik_maas._FULL_NAME_SQL; it is
+-- built from || and coalesce only, so it is immutable and indexable
+-- (concat_ws is not).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm
+    ON users USING gin ((first_name || ' ' || coalesce(middle_name || ' ', '') || last_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_users_mobile_number_trgm
+    ON users USING gin (mobile_number gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_submitted
+    ON adhik_maas_submissions (submitted_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_route_number
+    ON adhik_maas_submissions (route_number, submitted_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_area
+    ON adhik_maas_submissions (area, submitted_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_route_date
+    ON adhik_maas_submissions (route_date);
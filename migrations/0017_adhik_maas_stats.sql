@@ -0,0 +1,34 @@
+-- 0017: submission counters for the Adhik Maas admin dashboard
+--
+-- One row per (route, area, seva flag combination, shortlist / finalize
+-- status).  Maintained by delta in the same transaction as every write to
+-- adhik_maas_submissions (adhik_maas._apply_stats_deltas); `flask --app app
+-- adhik_maas reconcile-stats` recomputes it from adhik_maas_submissions.
+-- '' stands for NULL in the text key columns.
+
+CREATE TABLE IF NOT EXISTS adhik_maas_stats (
+    route_number        VARCHAR(5)   NOT NULL DEFAULT '',
+    route_name          VARCHAR(200) NOT NULL DEFAULT '',
+    area                VARCHAR(100) NOT NULL DEFAULT '',
+    has_padyapuja       BOOLEAN      NOT NULL,
+    has_seva_mahaprasad BOOLEAN      NOT NULL,
+    seva_time           VARCHAR(20)  NOT NULL DEFAULT '',
+    has_shejarti        BOOLEAN      NOT NULL,
+    is_shortlisted      BOOLEAN      NOT NULL,
+    is_finalized        BOOLEAN      NOT NULL,
+    submission_count    INTEGER      NOT NULL DEFAULT 0,
+    updated_at          TIMESTAMP    NOT NULL DEFAULT now(),
+    PRIMARY KEY (route_number, route_name, area, has_padyapuja, has_seva_mahaprasad,
+                 seva_time, has_shejarti, is_shortlisted, is_finalized)
+);
+
+INSERT INTO adhik_maas_stats (
+    route_number, route_name, area, has_padyapuja, has_seva_mahaprasad,
+    seva_time, has_shejarti, is_shortlisted, is_finalized, submission_count
+)
+SELECT coalesce(route_number, ''), coalesce(route_name, ''), coalesce(area, ''),
+       has_padyapuja, has_seva_mahaprasad, coalesce(seva_time, ''), has_shejarti,
+       is_shortlisted, is_finalized, count(*)
+FROM adhik_maas_submissions
+GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,8 @@
+-- 0018: heartbeat for export jobs
+--
+-- A rendering job touches updated_at as it goes; a queued / running job
+-- whose updated_at is older than Config.EXPORT_STALE_SECONDS belonged to a
+-- worker that restarted and is marked failed instead of being reused.
+
+ALTER TABLE export_jobs
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT now();
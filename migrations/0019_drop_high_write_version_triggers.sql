@@ -0,0 +1,12 @@
+-- 0019: drop the data_versions triggers on users and janmotsav_attendance
+--
+-- A statement-level bump locks one shared data_versions row until the
+-- writing transaction commits, which serialised every attendance save and
+-- profile edit just so admin exports could build a cache key.  Exports now
+-- fingerprint these tables from their own rows (exports._FINGERPRINTS).
+-- The column-scoped users_map_version trigger (0010) stays.
+
+DROP TRIGGER IF EXISTS users_data_version ON users;
+DROP TRIGGER IF EXISTS janmotsav_attendance_data_version ON janmotsav_attendance;
+
+DELETE FROM data_versions WHERE name IN ('users', 'janmotsav_attendance');
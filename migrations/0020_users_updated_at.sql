@@ -0,0 +1,31 @@
+-- 0020: per-row change stamp on users
+--
+-- updated_at is set by a row-level BEFORE UPDATE trigger, so raw psycopg2
+-- writes are covered too and no shared data_versions row is locked.
+-- max(updated_at) is one read of ix_users_updated_at; together with
+-- count(*) it fingerprints the table for export cache keys and the
+-- /bookings/users/by-year cache.
+
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS ix_users_updated_at
+    ON users (updated_at);
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_touch_updated_at ON users;
+CREATE TRIGGER users_touch_updated_at
+    BEFORE UPDATE ON users
+    FOR EACH ROW
+    WHEN (OLD IS DISTINCT FROM NEW)
+    EXECUTE FUNCTION touch_updated_at();
+
+-- Same for the attendance fingerprint: max(updated_at) without a full scan.
+CREATE INDEX IF NOT EXISTS ix_janmotsav_attendance_updated_at
+    ON janmotsav_attendance (updated_at);
@@ -0,0 +1,9 @@
+-- 0021: drop the data_versions trigger on bookings
+--
+-- Every booking write bumped one shared data_versions row and so held its
+-- lock until commit, serialising all bookings writes.  The by-year cache
+-- (app.py) and bookings exports fingerprint the year's rows instead.
+
+DROP TRIGGER IF EXISTS bookings_data_version ON bookings;
+
+DELETE FROM data_versions WHERE name = 'bookings';
@@ -0,0 +1,13 @@
+-- 0022: users the geocoding worker has given up on
+--
+-- A user with no address, or whose address is cached 'not_found', is
+-- recorded here with the address they had; geocoding._pending_users skips
+-- them until users.full_address changes, so they no longer stay in the
+-- queue forever and keep waking the worker.
+
+CREATE TABLE IF NOT EXISTS geocode_unresolved (
+    user_id      INTEGER     PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+    full_address TEXT,
+    reason       VARCHAR(20) NOT NULL,
+    recorded_at  TIMESTAMP   NOT NULL DEFAULT now()
+);
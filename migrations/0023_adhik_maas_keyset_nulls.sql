@@ -0,0 +1,18 @@
+-- 0023: keyset indexes for /adhik-maas/submissions with NULL submitted_at
+--
+-- submitted_at is nullable and NULLs sort first under DESC, so a page could
+-- end on a row with no timestamp to put in the cursor.  The list now orders
+-- on coalesce(submitted_at, '-infinity'), which puts those rows last; the
+-- 0016 indexes are rebuilt on the same expression.
+
+DROP INDEX IF EXISTS ix_adhik_maas_submissions_submitted;
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_submitted
+    ON adhik_maas_submissions (coalesce(submitted_at, '-infinity'::timestamp) DESC, id DESC);
+
+DROP INDEX IF EXISTS ix_adhik_maas_submissions_route_number;
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_route_number
+    ON adhik_maas_submissions (route_number, coalesce(submitted_at, '-infinity'::timestamp) DESC, id DESC);
+
+DROP INDEX IF EXISTS ix_adhik_maas_submissions_area;
+CREATE INDEX IF NOT EXISTS ix_adhik_maas_submissions_area
+    ON adhik_maas_submissions (area, coalesce(submitted_at, '-infinity'::timestamp) DESC, id DESC);
@@ -0,0 +1,10 @@
+-- 0024: rebuild ix_users_full_name_trgm on a NULL-safe name expression
+--
+-- first_name and last_name are nullable, and one NULL part made the whole
+-- 0016 expression NULL, so those users never matched a name search.  The
+-- expression must stay identical to adhik_maas._FULL_NAME_SQL.
+
+DROP INDEX IF EXISTS ix_users_full_name_trgm;
+CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm
+    ON users USING gin ((coalesce(first_name, '') || ' ' || coalesce(middle_name || ' ', '')
+                         || coalesce(last_name, '')) gin_trgm_ops);
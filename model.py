@@ -3,13 +3,17 @@ from datetime import datetime
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     Boolean,
     Date,
     DateTime,
     ForeignKey,
     Numeric,
-    Text
+    Text,
+    Index,
+    UniqueConstraint,
+    text
 )
 from sqlalchemy.orm import relationship
 
@@ -20,6 +24,26 @@ db = SQLAlchemy()
 # ============================================================
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        Index(
+            "ix_users_missing_coordinates", "id",
+            postgresql_where=text("latitude IS NULL OR longitude IS NULL"),
+        ),
+        Index(
+            "ix_users_full_name_trgm",
+            text(
+                "(coalesce(first_name, '') || ' ' || coalesce(middle_name || ' ', '')"
+                " || coalesce(last_name, '')) gin_trgm_ops"
+            ),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_users_mobile_number_trgm", "mobile_number",
+            postgresql_using="gin",
+            postgresql_ops={"mobile_number": "gin_trgm_ops"},
+        ),
+        Index("ix_users_updated_at", "updated_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -60,6 +84,9 @@ class User(db.Model):
     # NULL for pre-existing users (treated as False)
     is_quick_registered = db.Column(db.Boolean, default=None, nullable=True)
 
+    # Set on every UPDATE by the users_touch_updated_at trigger (migration 0020)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
     # Relationships
     bookings = relationship("Booking", back_populates="user")
     sunday_bookings = relationship("SundayBooking", back_populates="user")
@@ -76,6 +103,14 @@ class User(db.Model):
 # ============================================================
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Year-range filtering (/bookings/users/by-year) and per-user active checks
+        Index("ix_bookings_booking_date", "booking_date"),
+        Index(
+            "ix_bookings_user_id_booking_date_active", "user_id", "booking_date",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, ForeignKey('users.id'), nullable=False)
@@ -94,6 +129,16 @@ class Booking(db.Model):
 
 class SundayBooking(db.Model):
     __tablename__ = 'sunday_bookings'
+    __table_args__ = (
+        Index(
+            "ix_sunday_bookings_booking_date_active", "booking_date",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_sunday_bookings_user_id_booking_date_active", "user_id", "booking_date",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -216,6 +261,12 @@ class JanmotsavYear(db.Model):
 # ============================================================
 class JanmotsavDay(db.Model):
     __tablename__ = "janmotsav_days"
+    __table_args__ = (
+        Index(
+            "ix_janmotsav_days_year_event_date", "year_id", "event_date",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     year_id = Column(Integer, ForeignKey("janmotsav_years.id"), nullable=False)
@@ -242,6 +293,10 @@ class JanmotsavDay(db.Model):
 # ============================================================
 class SevaNidhiPayment(db.Model):
     __tablename__ = "seva_nidhi_payments"
+    __table_args__ = (
+        Index("ix_seva_nidhi_payments_user_year", "user_id", "year_id"),
+        Index("ix_seva_nidhi_payments_year_id", "year_id"),
+    )
 
     id = Column(Integer, primary_key=True)
 
@@ -266,6 +321,20 @@ class SevaNidhiPayment(db.Model):
 # ============================================================
 class JanmotsavAttendance(db.Model):
     __tablename__ = "janmotsav_attendance"
+    __table_args__ = (
+        # Target of the bulk upsert in the attendance save paths
+        UniqueConstraint("user_id", "day_id", name="uq_janmotsav_attendance_user_day"),
+        Index(
+            "ix_janmotsav_attendance_user_year_day", "user_id", "year_id", "day_id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        Index(
+            "ix_janmotsav_attendance_day_id", "day_id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # Export cache-key fingerprint (exports._FINGERPRINTS)
+        Index("ix_janmotsav_attendance_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True)
 
@@ -289,6 +358,26 @@ class JanmotsavAttendance(db.Model):
         return f"<Attendance user={self.user_id} day={self.day_id}>"
 
 
+# ============================================================
+# MEAL TOTALS (per day, maintained by delta on every attendance save)
+# ============================================================
+class JanmotsavMealTotal(db.Model):
+    __tablename__ = "janmotsav_meal_totals"
+
+    year_id = Column(Integer, ForeignKey("janmotsav_years.id"), primary_key=True)
+    day_id = Column(Integer, ForeignKey("janmotsav_days.id"), primary_key=True)
+
+    breakfast_total = Column(Integer, default=0, nullable=False)
+    lunch_total = Column(Integer, default=0, nullable=False)
+    evesnacks_total = Column(Integer, default=0, nullable=False)
+    dinner_total = Column(Integer, default=0, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<MealTotal year={self.year_id} day={self.day_id}>"
+
+
 # ============================================================
 # YEAR PAYMENT TRACKING
 # ============================================================
@@ -336,6 +425,34 @@ class AdhikMaasArea(db.Model):
 # ============================================================
 class AdhikMaasSubmission(db.Model):
     __tablename__ = "adhik_maas_submissions"
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_adhik_maas_submissions_user_id"),
+        Index(
+            "ix_adhik_maas_submissions_finalized_route_date", "route_date", "area",
+            postgresql_where=text("is_finalized"),
+        ),
+        Index(
+            "ix_adhik_maas_submissions_shortlisted", "area",
+            postgresql_where=text("is_shortlisted"),
+        ),
+        Index(
+            "ix_adhik_maas_submissions_combination",
+            "has_padyapuja", "has_seva_mahaprasad", "has_shejarti", "seva_time", "area", "id",
+        ),
+        Index(
+            "ix_adhik_maas_submissions_submitted",
+            text("coalesce(submitted_at, '-infinity'::timestamp) DESC"), text("id DESC"),
+        ),
+        Index(
+            "ix_adhik_maas_submissions_route_number",
+            "route_number", text("coalesce(submitted_at, '-infinity'::timestamp) DESC"), text("id DESC"),
+        ),
+        Index(
+            "ix_adhik_maas_submissions_area",
+            "area", text("coalesce(submitted_at, '-infinity'::timestamp) DESC"), text("id DESC"),
+        ),
+        Index("ix_adhik_maas_submissions_route_date", "route_date"),
+    )
 
     id            = Column(Integer, primary_key=True)
     user_id       = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -368,3 +485,134 @@ class AdhikMaasSubmission(db.Model):
 
     def __repr__(self):
         return f"<AdhikMaasSubmission id={self.id} user_id={self.user_id} area={self.area}>"
+
+
+# ============================================================
+# ADHIK MAAS STATS (submission counts, maintained by delta on every write)
+# ============================================================
+class AdhikMaasStat(db.Model):
+    __tablename__ = "adhik_maas_stats"
+
+    # '' stands for NULL in the key columns (primary keys cannot be NULL)
+    route_number        = Column(String(5), primary_key=True, default="")
+    route_name          = Column(String(200), primary_key=True, default="")
+    area                = Column(String(100), primary_key=True, default="")
+    has_padyapuja       = Column(Boolean, primary_key=True)
+    has_seva_mahaprasad = Column(Boolean, primary_key=True)
+    seva_time           = Column(String(20), primary_key=True, default="")
+    has_shejarti        = Column(Boolean, primary_key=True)
+    is_shortlisted      = Column(Boolean, primary_key=True)
+    is_finalized        = Column(Boolean, primary_key=True)
+
+    submission_count    = Column(Integer, default=0, nullable=False)
+    updated_at          = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AdhikMaasStat route={self.route_number} area={self.area} n={self.submission_count}>"
+
+
+# ============================================================
+# GEOCODE CACHE (normalised address -> coordinates)
+# ============================================================
+class GeocodeCache(db.Model):
+    __tablename__ = "geocode_cache"
+
+    address_key = Column(String(500), primary_key=True)   # geocoding.normalise_address()
+    latitude    = Column(Numeric(10, 7))
+    longitude   = Column(Numeric(10, 7))
+    status      = Column(String(20), nullable=False)       # 'ok' | 'not_found'
+    attempts    = Column(Integer, nullable=False, default=1)
+    updated_at  = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<GeocodeCache {self.address_key[:30]} {self.status}>"
+
+
+# ============================================================
+# GEOCODE UNRESOLVED (users the worker has given up on)
+# ============================================================
+class GeocodeUnresolved(db.Model):
+    __tablename__ = "geocode_unresolved"
+
+    user_id      = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    full_address = Column(Text)                             # address at the time; a change re-queues
+    reason       = Column(String(20), nullable=False)       # 'no_address' | 'not_found'
+    recorded_at  = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<GeocodeUnresolved user={self.user_id} {self.reason}>"
+
+
+# ============================================================
+# PINCODE CENTROIDS (offline approximate geocoding tier)
+# ============================================================
+class PincodeCentroid(db.Model):
+    __tablename__ = "pincode_centroids"
+
+    pincode    = Column(String(10), primary_key=True)
+    area_name  = Column(String(150))
+    latitude   = Column(Numeric(10, 7), nullable=False)
+    longitude  = Column(Numeric(10, 7), nullable=False)
+    source     = Column(String(20), nullable=False)        # 'users' | 'geocoder'
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PincodeCentroid {self.pincode} ({self.source})>"
+
+
+# ============================================================
+# EXPORT JOBS (background-rendered admin downloads)
+# ============================================================
+class ExportJob(db.Model):
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        Index("ix_export_jobs_cache_key", "cache_key", "created_at"),
+    )
+
+    id           = Column(String(32), primary_key=True)       # uuid4().hex
+    export_type  = Column(String(50), nullable=False)
+    params       = Column(Text, nullable=False)                # canonical JSON
+    cache_key    = Column(String(40), nullable=False)          # sha1 of type + params + data versions
+    status       = Column(String(20), nullable=False, default="queued")  # queued | running | done | failed
+    file_path    = Column(String(500))
+    filename     = Column(String(255))
+    mimetype     = Column(String(100))
+    row_count    = Column(Integer)
+    error        = Column(String(500))
+    requested_by = Column(Integer, ForeignKey("users.id"))
+    created_at   = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at   = Column(DateTime, default=datetime.utcnow, nullable=False)  # render heartbeat
+    finished_at  = Column(DateTime)
+    expires_at   = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ExportJob {self.id} {self.export_type} {self.status}>"
+
+
+# ============================================================
+# PUBLISHED SNAPSHOTS (pre-serialised public lists)
+# ============================================================
+class PublishedSnapshot(db.Model):
+    __tablename__ = "published_snapshots"
+
+    name      = Column(String(100), primary_key=True)
+    published = Column(Boolean, nullable=False, default=False)
+    body      = Column(Text, nullable=False)
+    etag      = Column(String(40), nullable=False)
+    built_at  = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PublishedSnapshot {self.name} published={self.published}>"
+
+
+# ============================================================
+# DATA VERSIONS (cache invalidation stamps, bumped by triggers)
+# ============================================================
+class DataVersion(db.Model):
+    __tablename__ = "data_versions"
+
+    name    = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DataVersion {self.name}={self.version}>"
@@ -0,0 +1,90 @@
+"""
+Visiting order for one Adhik Maas route day.
+
+plan_order() turns household coordinates into a short open path: a
+haversine distance matrix in numpy, a nearest-neighbour tour as the
+starting point, then 2-opt segment reversals until no reversal shortens
+the path.  Each 2-opt pass evaluates every candidate reversal for a given
+cut point as one vector operation, so a 60-household route plans in a few
+milliseconds.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_2OPT_ROUNDS = 50
+
+
+def distance_matrix(coords) -> np.ndarray:
+    """n x n great-circle distances in km for an n x 2 array of (lat, lon)."""
+    rad = np.radians(np.asarray(coords, dtype=np.float64))
+    lat, lon = rad[:, 0:1], rad[:, 1:2]
+    dlat = lat - lat.T
+    dlon = lon - lon.T
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _nearest_neighbour(d: np.ndarray, start: int) -> np.ndarray:
+    n = len(d)
+    path = np.empty(n, dtype=np.int64)
+    visited = np.zeros(n, dtype=bool)
+    path[0], visited[start] = start, True
+    for k in range(1, n):
+        row = np.where(visited, np.inf, d[path[k - 1]])
+        path[k] = int(np.argmin(row))
+        visited[path[k]] = True
+    return path
+
+
+def _two_opt(path: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """Improve an open path in place; path[0] stays fixed."""
+    n = len(path)
+    for _ in range(MAX_2OPT_ROUNDS):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = path[i - 1], path[i]
+            c = path[i + 1:]                          # candidate segment ends j
+            nxt = np.append(path[i + 2:], -1)         # node after j, -1 at the path end
+            has_next = nxt >= 0
+            nxt_idx = np.where(has_next, nxt, 0)
+            old = d[a, b] + np.where(has_next, d[c, nxt_idx], 0.0)
+            new = d[a, c] + np.where(has_next, d[b, nxt_idx], 0.0)
+            k = int(np.argmin(new - old))
+            if new[k] - old[k] < -1e-9:
+                j = i + 1 + k
+                path[i:j + 1] = path[i:j + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return path
+
+
+def plan_order(coords, start=None):
+    """
+    Return (order, legs_km) for households at coords [(lat, lon), ...].
+
+    With start=(lat, lon) the path begins there (e.g. the mandir); otherwise
+    it begins at the household farthest from the centre, so the route
+    sweeps across the area instead of starting in the middle.  legs_km[k]
+    is the distance walked to reach order[k].
+    """
+    n = len(coords)
+    if n == 0:
+        return [], []
+    points = np.asarray(coords, dtype=np.float64)
+    if start is not None:
+        points = np.vstack([np.asarray(start, dtype=np.float64), points])
+        first = 0
+    else:
+        centre = points.mean(axis=0, keepdims=True)
+        first = int(np.argmax(distance_matrix(np.vstack([centre, points]))[0, 1:]))
+
+    d = distance_matrix(points)
+    path = _two_opt(_nearest_neighbour(d, first), d)
+    legs = np.concatenate([[0.0], d[path[:-1], path[1:]]])
+
+    if start is not None:
+        # Drop the start point itself; the first leg is start -> household.
+        return [int(p) - 1 for p in path[1:]], [float(x) for x in legs[1:]]
+    return [int(p) for p in path], [float(x) for x in legs]
@@ -2,7 +2,6 @@ from datetime import datetime, timedelta
 from flask import jsonify
 from model import db, Booking, User, SundayBooking  # assuming SundayBooking model exists
 import calendar
-from sqlalchemy import func
 
 # ✅ Helper: Get all Saturdays from Dec 1 of current year
 def get_saturdays_for_year():
@@ -64,7 +63,7 @@ def create_sunday_booking(user_id, booking_date, mahaprasad=False):
     total_saturdays = len(saturdays)
     total_saturday_bookings = (
         Booking.query.filter(
-            func.date(Booking.booking_date).in_(saturdays),
+            Booking.booking_date.in_(saturdays),
             Booking.is_active == True
         ).count()
     )
@@ -108,7 +107,7 @@ def create_sunday_booking(user_id, booking_date, mahaprasad=False):
 
     # 5️⃣ Check if the selected Sunday is fully booked (optional capacity check)
     total_bookings_on_sunday = SundayBooking.query.filter(
-        func.date(SundayBooking.booking_date) == booking_date,
+        SundayBooking.booking_date == booking_date,
         SundayBooking.is_active == True
     ).count()
 